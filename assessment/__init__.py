@@ -1,2 +1,24 @@
-from .console import Console
-from .gearbox import Gearbox
+"""
+Gearbox and Console are imported on first use, so that python -m assessment and the
+modules which only need types or helper do not pay for the whole package
+"""
+
+import importlib
+
+__all__ = ["Console", "Gearbox"]
+
+# public name -> module defining it
+_LAZY = {"Console": ".console", "Gearbox": ".gearbox"}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,86 @@
+"""
+Command line entry point of the package
+
+python -m assessment drive
+python -m assessment drive --profile six-speed
+python -m assessment replay session.txt --trace
+python -m assessment simulate --vehicles 10000
+python -m assessment bench -k gearbox
+python -m assessment explore --profile ten-speed
+python -m assessment fuzz --cases 1000000
+
+Every subcommand imports what it runs only once it is selected, so that NumPy and the
+fleet, telemetry and profile modules are never loaded to drive a single vehicle.
+"""
+
+import argparse
+import importlib
+import sys
+from typing import Optional
+
+# subcommand -> (module whose main(argv, prog) runs it, help), None for the ones
+# defined here
+SUBCOMMANDS = {
+    "drive": (None, "drive a vehicle from the interactive console"),
+    "replay": ("assessment.batch", "replay a recorded command script headless"),
+    "simulate": ("assessment.simulation", "Monte Carlo simulation of a fleet"),
+    "bench": ("assessment.bench", "run the benchmark suite"),
+    "explore": ("assessment.explorer", "exhaustively explore the state machine"),
+    "fuzz": ("assessment.fuzz", "fuzz against an independent reference model"),
+}
+
+
+def drive(argv: Optional[list] = None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m assessment drive", description=SUBCOMMANDS["drive"][1]
+    )
+    parser.add_argument(
+        "--profile", help="drive a TransmissionProfile, shipped name or JSON path"
+    )
+    args = parser.parse_args(argv)
+
+    from assessment.engine import Engine
+
+    if args.profile:
+        from assessment.profile import TransmissionProfile
+
+        gearbox = TransmissionProfile.named(args.profile).gearbox()
+    else:
+        from assessment import Gearbox
+
+        gearbox = Gearbox()
+    Engine().run(gearbox=gearbox)
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m assessment",
+        description=__doc__.split("\n")[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="subcommands:\n"
+        + "\n".join(f"  {name:<10}{_[1]}" for name, _ in SUBCOMMANDS.items())
+        + "\n\nsee python -m assessment <subcommand> --help",
+    )
+    parser.add_argument("subcommand", choices=SUBCOMMANDS, metavar="subcommand")
+    parser.add_argument(
+        "args", nargs=argparse.REMAINDER, help="passed on to the subcommand"
+    )
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    :param: argv : subcommand followed by its arguments, sys.argv[1:] by default
+    :return: exit status of the subcommand
+    """
+    args = parser().parse_args(argv)
+    module = SUBCOMMANDS[args.subcommand][0]
+    if module is None:
+        return drive(args.args)
+    prog = f"python -m assessment {args.subcommand}"
+    return importlib.import_module(module).main(args.args, prog=prog) or 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Headless batch runner which replays recorded command scripts
+
+python -m assessment.batch session.txt --trace
+cat session.txt | python -m assessment.batch --quiet
+"""
+
+import argparse
+import sys
+from typing import Iterable, Optional, TextIO
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted, n_print
+
+
+def replay(
+    commands: Iterable[str],
+    engine: Engine,
+    gearbox: Gearbox,
+    trace: Optional[TextIO] = None,
+    rejections: Optional[list] = None,
+) -> int:
+    """
+    Stream commands through the Console.COMMANDS handlers without prompts or screen clearing
+
+    Every command is preceded by an Engine.tick, like an iteration of Engine.run without
+    a vehicle model.
+    A line may hold several commands, see Console.parse. Blank lines and lines starting
+    with # are skipped, replay stops at a successful exit. A line which does not parse
+    counts as a single rejected step and replay carries on with the next one.
+
+    :param: commands : iterable of command lines, e.g. an open file
+    :param: engine : the Engine object
+    :param: gearbox : the Gearbox object
+    :param: trace : optional stream receiving a "step, command, status" line per command
+    :param: rejections : optional list receiving (step, line, message) of every line
+                         which does not parse
+
+    :return: number of commands replayed, repeats counted one by one
+    """
+    steps = 0
+    for line in commands:
+        line = line.strip().lower()
+        if not line or line.startswith("#"):
+            continue
+        parsed, rejection = Console.check_line(line)
+        if parsed is None:
+            steps += 1
+            engine.tick(gearbox)
+            n_print(rejection)
+            if rejections is not None:
+                rejections.append((steps, line, rejection))
+            if trace is not None:
+                trace.write(f"{steps}\t{line}\trejected: {rejection}\n")
+            continue
+        for command in parsed:
+            steps += 1
+            engine.tick(gearbox)
+            received_exit_command = Console.dispatch(
+                command, engine=engine, gearbox=gearbox, interactive=False
+            )
+            if trace is not None:
+                trace.write(f"{steps}\t{command}\t{engine.status(gearbox)}\n")
+            if received_exit_command:
+                return steps
+    return steps
+
+
+def main(
+    argv: Optional[list] = None, prog: str = "python -m assessment.batch"
+) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "script", nargs="?", default="-", help="command script, defaults to stdin"
+    )
+    parser.add_argument(
+        "--trace", action="store_true", help="print the state after every command"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="hide messages printed by the handlers"
+    )
+    args = parser.parse_args(argv)
+
+    engine, gearbox = Engine(), Gearbox()
+    rejections = []
+    out = sys.stdout
+    script = sys.stdin if args.script == "-" else open(args.script)
+    try:
+        if args.quiet:
+            with muted():
+                steps = replay(
+                    script, engine, gearbox, out if args.trace else None, rejections
+                )
+        else:
+            steps = replay(
+                script, engine, gearbox, out if args.trace else None, rejections
+            )
+    finally:
+        if script is not sys.stdin:
+            script.close()
+    out.write(
+        f"{steps} commands replayed, {len(rejections)} lines rejected, "
+        f"{engine.status(gearbox)}\n"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
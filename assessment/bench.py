@@ -0,0 +1,309 @@
+"""
+Benchmarks for the transmission hot paths
+
+Baselines are only meaningful on the machine they were saved on, save one before a
+change and compare against it after:
+
+python -m assessment.bench --save bench_baseline.json
+python -m assessment.bench --baseline bench_baseline.json
+
+Every run also times REFERENCE, plain interpreter work which does not depend on the
+package, and compare scales the baseline by how much faster or slower it ran, so
+that a busier or different machine is not reported as a regression.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from assessment import Console, Gearbox
+from assessment.batch import replay
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.types import Mode, Action, Gear
+
+# state every shift benchmark starts from, chosen so the action is accepted
+SHIFT_FROM = {
+    Action.REVERSE: (Mode.NEUTRAL, Gear.NEUTRAL),
+    Action.NEUTRAL: (Mode.REVERSE, Gear.REVERSE),
+    Action.PARK: (Mode.NEUTRAL, Gear.NEUTRAL),
+    Action.DRIVE: (Mode.PARK, Gear.NEUTRAL),
+    Action.MANUAL: (Mode.DRIVE, Gear.ONE),
+    Action.UP: (Mode.MANUAL, Gear.ONE),
+    Action.DOWN: (Mode.MANUAL, Gear.TWO),
+}
+
+# rpm and the gear auto_shift starts from
+AUTO_SHIFT_AT = {
+    "upshift": (Gearbox.upshift_rpm_threshold, Gear.TWO),
+    "downshift": (Gearbox.downshift_rpm_threshold, Gear.THREE),
+    "between": (
+        (Gearbox.upshift_rpm_threshold + Gearbox.downshift_rpm_threshold) // 2,
+        Gear.THREE,
+    ),
+}
+
+# benchmark timing the machine rather than the package, run along with every pattern
+REFERENCE = "reference"
+
+# a short drive from power-on to parked, repeated to build the end-to-end script
+SESSION = [
+    "start",
+    "drive",
+    "manual",
+    "up",
+    "up",
+    "down",
+    "down",
+    "drive",
+    "neutral",
+    "reverse",
+    "park",
+    "stop",
+]
+
+
+def measure(
+    op: Callable[[], None], batch: int = 100, samples: int = 200, ops: int = 1
+) -> dict:
+    """
+    Time op in batches, the latency of a sample is the mean of its batch
+
+    A mean averages a rare slow call away, so the p99 is only reported with a batch
+    of 1 where every sample is a single call of op. Fast paths keep larger batches
+    to amortize the timer overhead and only get a p50 of their batch means.
+
+    :param: op : the operation to time
+    :param: batch : calls of op per sample, 1 to sample every call
+    :param: samples : number of timed batches
+    :param: ops : operations performed by a single call of op
+
+    :return: ops/sec, p50 and p99 latency per operation in ns, p99 None unless batch is
+             1, and peak traced memory in bytes
+    """
+    tracemalloc.start()
+    for _ in range(batch):
+        op()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(samples):
+        start = clock()
+        for _ in range(batch):
+            op()
+        latencies.append((clock() - start) / (batch * ops))
+    latencies.sort()
+    return {
+        "ops_per_sec": 1e9 * len(latencies) / sum(latencies),
+        "p50_ns": latencies[len(latencies) // 2],
+        "p99_ns": (
+            latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+            if batch == 1
+            else None
+        ),
+        "peak_bytes": peak,
+    }
+
+
+def _reference() -> Callable[[], None]:
+    state = {}
+
+    def op():
+        for _ in range(16):
+            state[_] = state.get(_, 0) + 1
+
+    return op
+
+
+def _shift(action: Action) -> Callable[[], None]:
+    gearbox = Gearbox()
+    mode, gear = SHIFT_FROM[action]
+
+    def op():
+        gearbox.mode = mode
+        gearbox.gear = gear
+        gearbox.shift(True, action)
+
+    return op
+
+
+def _auto_shift(rpm: int, gear: Gear) -> Callable[[], None]:
+    gearbox = Gearbox(mode=Mode.DRIVE)
+
+    def op():
+        gearbox.gear = gear
+        gearbox.auto_shift(rpm)
+
+    return op
+
+
+def _dispatch(command: str) -> Callable[[], None]:
+    engine, gearbox = Engine(), Gearbox()
+
+    def op():
+        engine.running = True
+        gearbox.mode = Mode.MANUAL
+        gearbox.gear = Gear.TWO
+        Console.dispatch(command, engine=engine, gearbox=gearbox, interactive=False)
+
+    return op
+
+
+def _replay(script: list) -> Callable[[], None]:
+    def op():
+        replay(script, Engine(), Gearbox())
+
+    return op
+
+
+def cases(scale: int = 1) -> dict:
+    """
+    :param: scale : multiplies the samples of every case
+    :return: benchmark name -> (op, batch, samples, ops per call)
+    """
+    benchmarks = {REFERENCE: (_reference(), 1000, 50 * scale, 1)}
+    for action in SHIFT_FROM:
+        benchmarks[f"gearbox.shift[{action.name.lower()}]"] = (
+            _shift(action),
+            1000,
+            50 * scale,
+            1,
+        )
+    for name, (rpm, gear) in AUTO_SHIFT_AT.items():
+        benchmarks[f"gearbox.auto_shift[{name}]"] = (
+            _auto_shift(rpm, gear),
+            1000,
+            50 * scale,
+            1,
+        )
+    gearbox = Gearbox(mode=Mode.DRIVE, gear=Gear.THREE)
+    benchmarks["gearbox.friendly_mode"] = (gearbox.friendly_mode, 1000, 50 * scale, 1)
+    # the slower paths sample every call so that their p99 is a tail latency
+    for command in Console.COMMANDS:
+        benchmarks[f"console.dispatch[{command}]"] = (
+            _dispatch(command),
+            1,
+            2000 * scale,
+            1,
+        )
+    # latency of a whole SESSION, from power-on to parked
+    benchmarks["batch.replay"] = (_replay(SESSION), 1, 200 * scale, 1)
+    return benchmarks
+
+
+def run(pattern: str = "", scale: int = 1) -> dict:
+    """
+    Run REFERENCE and every benchmark whose name contains pattern
+
+    :return: benchmark name -> measure results
+    """
+    results = {}
+    with muted():
+        for name, (op, batch, samples, ops) in cases(scale).items():
+            if pattern in name or name == REFERENCE:
+                results[name] = measure(op, batch=batch, samples=samples, ops=ops)
+    return results
+
+
+def speedup(results: dict, baseline: dict) -> float:
+    """
+    :param: results : output of run
+    :param: baseline : an earlier output of run
+    :return: ops/sec of REFERENCE relative to the baseline, 1 unless both have it
+    """
+    if REFERENCE not in results or REFERENCE not in baseline:
+        return 1.0
+    return results[REFERENCE]["ops_per_sec"] / baseline[REFERENCE]["ops_per_sec"]
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    :param: results : output of run
+    :param: baseline : an earlier output of run
+    :param: tolerance : allowed relative drop in ops/sec, once the baseline is scaled by
+                        the speedup of REFERENCE
+
+    :return: names of the benchmarks which regressed beyond tolerance
+    """
+    scale = speedup(results, baseline)
+    return [
+        name
+        for name, result in results.items()
+        if name in baseline
+        and name != REFERENCE
+        and result["ops_per_sec"]
+        < baseline[name]["ops_per_sec"] * scale * (1 - tolerance)
+    ]
+
+
+def report(results: dict, baseline: Optional[dict] = None) -> str:
+    """
+    :return: table of the results, p50 and p99 in ns, p99 is - for the benchmarks timed
+             in batches, and vs base is relative to the baseline scaled by the speedup
+             of REFERENCE
+    """
+    lines = [
+        f"{'benchmark':<32}{'ops/sec':>14}{'p50 ns':>10}{'p99 ns':>10}{'peak KiB':>10}"
+        + (f"{'vs base':>10}" if baseline else "")
+    ]
+    scale = speedup(results, baseline) if baseline else 1.0
+    for name, result in results.items():
+        p99 = result["p99_ns"]
+        line = (
+            f"{name:<32}{result['ops_per_sec']:>14,.0f}{result['p50_ns']:>10.0f}"
+            + (f"{p99:>10.0f}" if p99 is not None else f"{'-':>10}")
+            + f"{result['peak_bytes'] / 1024:>10.1f}"
+        )
+        if baseline and name in baseline:
+            relative = result["ops_per_sec"] / (baseline[name]["ops_per_sec"] * scale)
+            line += f"{relative:>9.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(
+    argv: Optional[list] = None, prog: str = "python -m assessment.bench"
+) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.split("\n")[1])
+    parser.add_argument("-k", default="", help="only run benchmarks containing this")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="multiply the number of samples"
+    )
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument(
+        "--baseline", help="compare against a JSON baseline saved on this machine"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="relative ops/sec drop reported as a regression, after scaling the "
+        f"baseline by the speedup of {REFERENCE}",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.k, args.scale)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(report(results, baseline))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nregressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
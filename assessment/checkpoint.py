@@ -0,0 +1,196 @@
+"""
+Checkpoints of a whole simulation written as one contiguous buffer
+
+    header      HEADER, magic, format version, RNG state size, tick and vehicle count
+    rng state   JSON of numpy.random.Generator.bit_generator.state, padded to 8 bytes,
+                arrays held by MT19937, Philox or SFC64 states are stored as lists
+    states      one packed state per vehicle, see assessment.state, padded to 8 bytes
+    speed       one float64 per vehicle in m/s
+
+Restoring memory maps the arrays in place, nothing is deserialized per vehicle
+
+The progress of a sharded run, e.g. simulate_fleet, is saved separately as JSON by
+save_progress and read back by load_progress
+"""
+
+import json
+import os
+import struct
+from typing import Optional
+
+import numpy as np
+
+from assessment.fleet import Fleet
+from assessment.state import STATE_DTYPE, StateArray
+
+MAGIC = b"GBXCKPT\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+SPEED_DTYPE = np.dtype("<f8")
+
+
+def _padded(size: int) -> int:
+    return -(-size // 8) * 8
+
+
+def _encode_array(value):
+    """json.dumps default hook, the array is rebuilt by _decode_array"""
+    if isinstance(value, np.ndarray):
+        return {"dtype": value.dtype.str, "array": value.tolist()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode_array(value: dict):
+    """json.loads object hook"""
+    if value.keys() == {"dtype", "array"}:
+        return np.asarray(value["array"], dtype=value["dtype"])
+    return value
+
+
+class Checkpoint:
+    """Simulation state loaded from a checkpoint file"""
+
+    def __init__(
+        self,
+        tick: int,
+        states: StateArray,
+        speed: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        """
+        :param: tick : simulation tick the checkpoint was taken at
+        :param: states : packed state of every vehicle
+        :param: speed : speed of every vehicle in m/s
+        :param: rng : random generator positioned where the simulation left it
+        """
+        self.tick = tick
+        self.states = states
+        self.speed = speed
+        self.rng = rng
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def to_fleet(self) -> Fleet:
+        """
+        :return: Fleet holding every vehicle, copied out of the checkpoint
+        """
+        fleet = self.states.to_fleet()
+        fleet.speed[:] = self.speed
+        return fleet
+
+
+def save_checkpoint(
+    path: str,
+    states: StateArray,
+    tick: int = 0,
+    rng: Optional[np.random.Generator] = None,
+    speed: Optional[np.ndarray] = None,
+) -> None:
+    """
+    Write a checkpoint, atomically replacing path so a crash mid-save keeps the last one
+
+    :param: path : checkpoint file
+    :param: states : packed state of every vehicle
+    :param: tick : simulation tick counter
+    :param: rng : random generator of the simulation, its state is saved
+    :param: speed : speed of every vehicle in m/s, standing still by default
+    """
+    rng_state = (
+        json.dumps(rng.bit_generator.state, default=_encode_array).encode()
+        if rng is not None
+        else b""
+    )
+    speed = (
+        np.zeros(len(states), dtype=SPEED_DTYPE)
+        if speed is None
+        else np.ascontiguousarray(speed, dtype=SPEED_DTYPE)
+    )
+    if len(speed) != len(states):
+        raise ValueError("speed needs one entry per vehicle")
+    states = np.ascontiguousarray(states.states, dtype=STATE_DTYPE)
+
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(rng_state), tick, len(states)))
+        f.write(rng_state.ljust(_padded(len(rng_state)), b"\x00"))
+        f.write(memoryview(states).cast("B"))
+        f.write(b"\x00" * (_padded(states.nbytes) - states.nbytes))
+        f.write(memoryview(speed).cast("B"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def save_fleet(
+    path: str, fleet: Fleet, tick: int = 0, rng: Optional[np.random.Generator] = None
+) -> None:
+    """Write a checkpoint of every vehicle in a Fleet, see save_checkpoint"""
+    save_checkpoint(path, StateArray.from_fleet(fleet), tick, rng, fleet.speed)
+
+
+def load_checkpoint(path: str, writable: bool = False) -> Checkpoint:
+    """
+    Memory map a checkpoint
+
+    :param: path : file written by save_checkpoint
+    :param: writable : map the arrays copy-on-write so the restored simulation can
+                       carry on in place, the file itself is never modified
+
+    :return: the Checkpoint
+    """
+    with open(path, "rb") as f:
+        magic, version, rng_size, tick, vehicles = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint")
+        if version != VERSION:
+            raise ValueError(f"unsupported checkpoint version {version}")
+        rng_state = f.read(rng_size)
+
+    rng = None
+    if rng_state:
+        state = json.loads(rng_state, object_hook=_decode_array)
+        bit_generator = getattr(np.random, state["bit_generator"])()
+        bit_generator.state = state
+        rng = np.random.Generator(bit_generator)
+
+    mode = "c" if writable else "r"
+    offset = HEADER.size + _padded(rng_size)
+    states = _map(path, STATE_DTYPE, mode, offset, vehicles)
+    offset += _padded(vehicles * STATE_DTYPE.itemsize)
+    speed = _map(path, SPEED_DTYPE, mode, offset, vehicles)
+    return Checkpoint(tick, StateArray(states=states), speed, rng)
+
+
+def _map(path: str, dtype: np.dtype, mode: str, offset: int, size: int) -> np.ndarray:
+    if not size:
+        # an empty file region can not be mapped
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(size,))
+
+
+def save_progress(path: str, progress: dict) -> None:
+    """
+    Write the progress of a sharded run, atomically replacing path like save_checkpoint
+
+    :param: path : progress file
+    :param: progress : JSON serializable, e.g. the parameters of the run, the shards
+                       done so far and their merged results
+    """
+    partial = f"{path}.partial"
+    with open(partial, "w") as f:
+        json.dump(progress, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def load_progress(path: str) -> Optional[dict]:
+    """
+    :param: path : file written by save_progress
+    :return: the saved progress, None if nothing was saved yet
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
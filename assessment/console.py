@@ -1,10 +1,12 @@
 from collections import OrderedDict
+from time import perf_counter_ns
+from typing import Callable, Optional
 
 from assessment.helper import n_print, print_n, clear
 from assessment.types import Mode, Action
 
 
-def exit_vehicle(engine, parked: bool, **kwargs):
+def exit_vehicle(engine, parked: bool, interactive: bool = True, **kwargs):
     """Exit the vehicle
     :return: True if able to exit else False"""
     warning = ""
@@ -17,7 +19,8 @@ def exit_vehicle(engine, parked: bool, **kwargs):
     if warning:
         n_print(warning)
     else:
-        clear()
+        if interactive:
+            clear()
         print_n("exiting vehicle....")
         return True
     return False
@@ -64,11 +67,33 @@ def reverse(engine, gearbox, **kwargs):
     gearbox.shift(action=Action.REVERSE, engine_running=engine.running)
 
 
+def prefix_index(commands) -> dict:
+    """
+    :param: commands : command names
+    :return: every unambiguous prefix of a command, the full names included -> command name
+    """
+    index = {}
+    ambiguous = set()
+    for command in commands:
+        for end in range(1, len(command) + 1):
+            prefix = command[:end]
+            if index.setdefault(prefix, command) != command:
+                ambiguous.add(prefix)
+    for prefix in ambiguous:
+        del index[prefix]
+    # a full name always wins, even when it prefixes another command
+    index.update({_: _ for _ in commands})
+    return index
+
+
 class Console:
     """Process user input"""
 
     allow_unmanned_idle = True
 
+    # opt-in command latency instrumentation, see Metrics.attach_console
+    metrics = None
+
     COMMANDS = OrderedDict(
         {
             "start": start,
@@ -85,31 +110,150 @@ class Console:
     )
     AVAILABLE_COMMANDS = list(COMMANDS.keys())
     AVAILABLE_COMMANDS_LINE = ", ".join([_.title() for _ in AVAILABLE_COMMANDS])
+    # e.g. "dr" -> "drive", dispatch resolves every command through it
+    PREFIXES = prefix_index(AVAILABLE_COMMANDS)
+
+    # "start; drive; up*3" runs five commands
+    COMMAND_SEPARATOR = ";"
+    REPEAT_SEPARATOR = "*"
+    # a line expands to at most this many runs of a single command
+    MAX_REPEAT = 100
+    INVALID_INPUT = "invalid input"
+    TOO_MANY_REPEATS = f"please repeat a command at most {MAX_REPEAT} times!"
 
     @staticmethod
     def get_input() -> str:  # pragma: no cover
         return input(f"Commands: {Console.AVAILABLE_COMMANDS_LINE}\n").lower()
 
     @staticmethod
-    def user_input(engine, gearbox) -> bool:
+    def user_input(engine, gearbox, tick: Optional[Callable[[], None]] = None) -> bool:
         """
         Check for user actions
 
         :param: engine : the Engine object
         :param: gearbox : the Gearbox object
+        :param: tick : run between two commands of a line, see Console.run_line
+
+        :return: True if exit command issued by user else False
+        """
+        return Console.run_line(
+            Console.get_input(), engine=engine, gearbox=gearbox, tick=tick
+        )
+
+    @staticmethod
+    def parse(line: str) -> Optional[list]:
+        """
+        Split a line into the commands it holds
+
+        :param: line : lower case commands separated by COMMAND_SEPARATOR, each one an
+                       unambiguous prefix optionally followed by REPEAT_SEPARATOR and a
+                       count from 1 to MAX_REPEAT
+
+        :return: full command names with the repeats expanded, None if any is invalid
+        """
+        return Console.check_line(line)[0]
+
+    @staticmethod
+    def check_line(line: str) -> tuple:
+        """
+        :param: line : command line, see Console.parse
+        :return: (commands, None) or (None, message telling why the line is rejected)
+        """
+        commands = []
+        for word in line.split(Console.COMMAND_SEPARATOR):
+            word, repeat, count = word.partition(Console.REPEAT_SEPARATOR)
+            word = word.strip()
+            if not word and not repeat:
+                continue
+            command = Console.PREFIXES.get(word)
+            if command is None:
+                return None, Console.INVALID_INPUT
+            if repeat:
+                count = count.strip()
+                # isdigit alone accepts the likes of superscripts which int rejects
+                if not (count.isascii() and count.isdigit()):
+                    return None, Console.INVALID_INPUT
+                digits = count.lstrip("0")
+                if not digits:
+                    return None, Console.INVALID_INPUT
+                # checked before int, which refuses strings of more than 4300 digits
+                if len(digits) > len(str(Console.MAX_REPEAT)):
+                    return None, Console.TOO_MANY_REPEATS
+                count = int(digits)
+                if count > Console.MAX_REPEAT:
+                    return None, Console.TOO_MANY_REPEATS
+                commands += [command] * count
+            else:
+                commands.append(command)
+        if not commands:
+            return None, Console.INVALID_INPUT
+        return commands, None
+
+    @staticmethod
+    def run_line(
+        line: str,
+        engine,
+        gearbox,
+        tick: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Run every command of a line in order, tick runs between two commands
+
+        A line behaves exactly as if its commands were entered one per line when tick
+        does what the caller does between two lines, e.g. stepping its VehicleModel
+
+        Nothing runs when any command of the line is invalid
+
+        :param: line : lower case command line, see Console.parse
+        :param: engine : the Engine object
+        :param: gearbox : the Gearbox object
+        :param: tick : called without arguments, a plain engine.tick(gearbox) by default
+        :param: kwargs : extra options passed through to the handlers
+
+        :return: True if exit command issued by user else False
+        """
+        commands, rejection = Console.check_line(line)
+        if commands is None:
+            n_print(rejection)
+            return False
+        for position, command in enumerate(commands):
+            if position:
+                if tick is None:
+                    engine.tick(gearbox)
+                else:
+                    tick()
+            if Console.dispatch(command, engine=engine, gearbox=gearbox, **kwargs):
+                return True
+        return False
+
+    @staticmethod
+    def dispatch(command: str, engine, gearbox, **kwargs) -> bool:
+        """
+        Run a single command through its Console.COMMANDS handler
+
+        :param: command : lower case command name or an unambiguous prefix of one
+        :param: engine : the Engine object
+        :param: gearbox : the Gearbox object
+        :param: kwargs : extra options passed through to the handler
 
         :return: True if exit command issued by user else False
         """
-        user_input = Console.get_input()
         parked = gearbox.mode == Mode.PARK
 
-        if user_input in Console.AVAILABLE_COMMANDS:
-            received_exit_command = Console.COMMANDS[user_input](
-                engine=engine, gearbox=gearbox, parked=parked
+        command = Console.PREFIXES.get(command)
+        if command is not None:
+            # read once, a handler attaching or detaching metrics must not unbalance it
+            metrics = Console.metrics
+            started = perf_counter_ns() if metrics is not None else 0
+            received_exit_command = Console.COMMANDS[command](
+                engine=engine, gearbox=gearbox, parked=parked, **kwargs
             )
+            if metrics is not None:
+                metrics.command(command, perf_counter_ns() - started)
             if received_exit_command:
                 return True
         else:
-            n_print("invalid input")
+            n_print(Console.INVALID_INPUT)
 
         return False
@@ -1,49 +1,113 @@
-from .helper import print_n, clear
+from typing import Optional
 
 from assessment import Console, Gearbox
-from assessment.types import Mode
+from assessment.events import Observable
+from assessment.physics import CRUISE_THROTTLE, VehicleModel
+from assessment.renderer import Renderer
+from assessment.types import Mode, Event
 
 
-class Engine:
-    """Engine class which simulates a running car engine"""
+class Engine(Observable):
+    """Engine class which simulates a running car engine, one instance per simulated vehicle"""
 
-    running = False
-    rpm = 0
+    __slots__ = ("running", "rpm", "listeners")
 
-    @staticmethod
-    def start() -> None:
+    def __init__(self, running: bool = False, rpm: int = 0):
+        """
+        :param: running : is the engine initially running
+        :param: rpm : initial engine rpm
+        """
+        self.running = running
+        self.rpm = rpm
+        # Event -> listeners, None while nobody subscribed, see Observable.subscribe
+        self.listeners = None
+
+    def start(self) -> None:
         """Start the car engine"""
-        Engine.running = True
+        was_running, self.running = self.running, True
         # set rpm to midrange for simulating a running engine ready to be manually shifted
-        Engine.rpm = 1500
+        self.rpm = 1500
+        if self.listeners is not None and not was_running:
+            self.emit(Event.ENGINE_STARTED)
 
-    @staticmethod
-    def stop() -> None:
+    def stop(self) -> None:
         """Stop the car engine"""
-        Engine.running = False
-        Engine.rpm = 0
+        was_running, self.running = self.running, False
+        self.rpm = 0
+        if self.listeners is not None and was_running:
+            self.emit(Event.ENGINE_STOPPED)
+
+    def tick(
+        self,
+        gearbox: Gearbox,
+        throttle: Optional[float] = None,
+        speed: Optional[float] = None,
+    ) -> None:
+        """
+        Let the gearbox react to the engine, auto shifting while running in Drive
+
+        :param: gearbox : the Gearbox driven by this engine
+        :param: throttle : pedal position from 0 to 1, used by a gearbox shift map
+        :param: speed : vehicle speed in m/s, used by a gearbox shift map
+        """
+        if self.running and gearbox.mode == Mode.DRIVE:
+            gearbox.auto_shift(rpm=self.rpm, throttle=throttle, speed=speed)
+
+    def status(self, gearbox: Gearbox) -> str:
+        """
+        :param: gearbox : the Gearbox driven by this engine
+        :return: one line summary of the engine and gearbox state
+        """
+        if self.running:
+            return f"engine running: gear [{gearbox.friendly_mode()}]"
+        return "engine at rest"
+
+    def run(
+        self,
+        gearbox: Gearbox,
+        renderer: Optional[Renderer] = None,
+        model: Optional[VehicleModel] = None,
+        throttle: float = CRUISE_THROTTLE,
+        dt: float = 0.1,
+    ) -> None:  # pragma: no cover
+        """
+        Simulate a running engine which pings the Gearbox and Console for shifting and input respectively
+
+        The vehicle model advances one timestep per command and sets the rpm the gearbox
+        auto shifts on, like assessment.simulation does every tick
+
+        :param: gearbox : the Gearbox driven by this engine
+        :param: renderer : draws the status line, a fresh Renderer on stdout by default
+        :param: model : the VehicleModel of the vehicle, a fresh one at standstill by default
+        :param: throttle : pedal position from 0 to 1 held throughout
+        :param: dt : timestep in s
+        """
+        renderer = renderer or Renderer()
+        model = model or VehicleModel()
+        # redraw when an event reports a change rather than polling the state
+        renderer.watch(self, gearbox)
+
+        def advance():
+            # what happens between two lines, and between two commands of a line
+            model.step(self, gearbox, throttle, dt)
+            self.tick(gearbox, throttle, model.speed)
 
-    @staticmethod
-    def run() -> None:  # pragma: no cover
-        """Simulate a running engine which pings the Gearbox and Console for shifting and input respectively"""
         try:
+            self.tick(gearbox, throttle, model.speed)
             while True:
-                clear()
-                if Engine.running:
-                    if Gearbox.mode == Mode.DRIVE:
-                        Gearbox.auto_shift(rpm=Engine.rpm)
-                    print_n(f"engine running: gear [{Gearbox.friendly_mode()}]")
-                else:
-                    print_n("engine at rest")
+                renderer.render(self, gearbox)
 
                 received_exit_command = Console.user_input(
-                    engine=Engine, gearbox=Gearbox
+                    engine=self, gearbox=gearbox, tick=advance
                 )
 
                 if received_exit_command:
                     return
+                advance()
         except Exception as e:
             print(
                 f"encountered exception: {str(e)}"
             )  # TODO :: log exception to proper db or filesystem
             raise e
+        finally:
+            renderer.unwatch(self, gearbox)
@@ -0,0 +1,52 @@
+"""Synchronous state change notifications of Gearbox and Engine"""
+
+from typing import Callable
+
+from assessment.types import Event
+
+
+class Observable:
+    """
+    Mixin keeping listeners per Event in the listeners slot of the class using it
+
+    listeners stays None until the first subscription and returns to None once the
+    last listener is gone, so the sources only pay a None check on their hot paths
+    """
+
+    __slots__ = ()
+
+    def subscribe(self, event: Event, listener: Callable) -> Callable:
+        """
+        :param: event : Event to listen to
+        :param: listener : called with the arguments documented on the Event
+        :return: listener, so that subscribe can be used as a decorator
+        """
+        if self.listeners is None:
+            self.listeners = {}
+        # tuples are replaced rather than mutated, emit never has to copy them
+        self.listeners[event] = self.listeners.get(event, ()) + (listener,)
+        return listener
+
+    def unsubscribe(self, event: Event, listener: Callable) -> None:
+        """
+        :param: event : Event the listener was subscribed to
+        :param: listener : removed once, ValueError if it was not subscribed
+        """
+        listeners = list((self.listeners or {}).get(event, ()))
+        listeners.remove(listener)
+        if listeners:
+            self.listeners[event] = tuple(listeners)
+        else:
+            del self.listeners[event]
+            if not self.listeners:
+                self.listeners = None
+
+    def emit(self, event: Event, *args) -> None:
+        """
+        Call every listener of event in the order they subscribed
+
+        :param: args : passed on after self, see Event
+        """
+        if self.listeners is not None:
+            for listener in self.listeners.get(event, ()):
+                listener(self, *args)
@@ -0,0 +1,349 @@
+"""
+Exhaustive explorer of the transmission state machine
+
+python -m assessment.explorer
+python -m assessment.explorer --max-gear 12 --unreachable
+python -m assessment.explorer --profile ten-speed
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.transitions import (
+    MODE_VALUES,
+    PAWL_UNCHANGED,
+    NO_MESSAGE,
+    compile_transitions,
+    transition_index,
+)
+from assessment.types import Mode, Action, Gear
+
+# shift requests the Console handlers make, followed by the automated ones of Engine.tick
+SHIFT_EVENTS = [(_.name.lower(), _.value, False) for _ in Action] + [
+    ("auto up", Action.UP.value, True),
+    ("auto down", Action.DOWN.value, True),
+]
+# the other Console commands, run through their handlers rather than the table
+ENGINE_COMMANDS = [
+    _ for _ in Console.AVAILABLE_COMMANDS if _.upper() not in Action.__members__
+]
+
+# checked on every reachable (running, mode, gear, pawl) state, all values are plain ints
+INVARIANTS = (
+    (
+        "pawl engaged outside Park",
+        lambda running, mode, gear, pawl: pawl and mode != Mode.PARK.value,
+    ),
+    (
+        "engine stopped outside Park",
+        lambda running, mode, gear, pawl: not running and mode != Mode.PARK.value,
+    ),
+    (
+        "gear selected in Park or Neutral",
+        lambda running, mode, gear, pawl: mode in (Mode.PARK.value, Mode.NEUTRAL.value)
+        and gear != Gear.NEUTRAL.value,
+    ),
+    (
+        "reverse gear and Reverse mode out of step",
+        lambda running, mode, gear, pawl: (mode == Mode.REVERSE.value)
+        != (gear == Gear.REVERSE.value),
+    ),
+    (
+        "no forward gear in Drive or Manual",
+        lambda running, mode, gear, pawl: mode in (Mode.DRIVE.value, Mode.MANUAL.value)
+        and gear < Gear.ONE.value,
+    ),
+)
+
+
+def gear_name(gear: int) -> str:
+    """
+    :param: gear : plain gear value, may be above the highest Gear member
+    :return: name of the gear
+    """
+    if gear in Gear._value2member_map_:
+        return Gear(gear).name
+    return str(gear)
+
+
+class StateSpace:
+    """
+    Every (engine running, mode, gear, parking pawl) state of a transmission packed
+    into consecutive ints, with the moves between them read off a compiled table
+    """
+
+    def __init__(
+        self,
+        max_gear: int = Gearbox.max_gear.value,
+        allow_unmanned_idle: Optional[bool] = None,
+        table: Optional[list] = None,
+    ):
+        """
+        :param: max_gear : value of the highest forward gear, not limited to the Gear enum
+        :param: allow_unmanned_idle : exit rule, Console.allow_unmanned_idle by default
+        :param: table : transitions to explore, compile_transitions(max_gear) by default
+        """
+        self.max_gear = max_gear
+        self.allow_unmanned_idle = (
+            Console.allow_unmanned_idle
+            if allow_unmanned_idle is None
+            else allow_unmanned_idle
+        )
+        self.table = table if table is not None else compile_transitions(max_gear)
+        self.modes = len(MODE_VALUES)
+        self.size = (max_gear - Gear.REVERSE.value + 1) * 2 * self.modes * 2
+
+    def encode(self, running: bool, mode: int, gear: int, pawl: bool) -> int:
+        """
+        :return: state number from 0 to size - 1
+        """
+        return (
+            ((gear - Gear.REVERSE.value) * 2 + running) * self.modes
+            + mode
+            - MODE_VALUES[0]
+        ) * 2 + pawl
+
+    def decode(self, state: int) -> tuple:
+        """
+        :return: (running, mode, gear, pawl) plain values of a state number
+        """
+        state, pawl = divmod(state, 2)
+        state, mode = divmod(state, self.modes)
+        gear, running = divmod(state, 2)
+        return (
+            bool(running),
+            mode + MODE_VALUES[0],
+            gear + Gear.REVERSE.value,
+            bool(pawl),
+        )
+
+    def describe(self, state: int) -> str:
+        running, mode, gear, pawl = self.decode(state)
+        return (
+            f"engine {'running' if running else 'off'}, {Mode(mode).name}, "
+            f"gear {gear_name(gear)}, pawl {'engaged' if pawl else 'released'}"
+        )
+
+    def successors(self, state: int) -> list:
+        """
+        :return: (event, next state) of every command and automated shift from state
+        """
+        running, mode, gear, pawl = self.decode(state)
+        table = self.table
+        moves = []
+        for event, action, auto_shift in SHIFT_EVENTS:
+            if auto_shift and not (running and mode == Mode.DRIVE.value):
+                # Engine.tick only auto shifts a running engine in Drive
+                continue
+            new_mode, new_gear, new_pawl, message = table[
+                transition_index(running, mode, gear, action, auto_shift)
+            ]
+            if message == NO_MESSAGE:
+                if new_pawl == PAWL_UNCHANGED:
+                    new_pawl = pawl
+                moves.append(
+                    (event, self.encode(running, new_mode, new_gear, new_pawl))
+                )
+        for command in ENGINE_COMMANDS:
+            if command == "exit":
+                continue
+            _, after = self.run_command(command, state)
+            if after != state:
+                moves.append((command, after))
+        return moves
+
+    def can_exit(self, state: int) -> bool:
+        """
+        :return: True if the exit command leaves the vehicle in this state
+        """
+        exited, _ = self.run_command("exit", state)
+        return exited
+
+    def run_command(self, command: str, state: int) -> tuple:
+        """
+        Dispatch a Console command on a scratch Engine and Gearbox put in state,
+        under this space's exit rule and with every message muted
+
+        :param: command : one of ENGINE_COMMANDS, the shift commands would need a
+                          gear within the Gear enum
+        :return: (True if the command exits the vehicle, state afterwards)
+        """
+        running, mode, gear, pawl = self.decode(state)
+        engine = Engine(running=running)
+        gearbox = Gearbox(Mode(mode), parking_pawl_engaged=pawl)
+        # a plain int, max_gear is not limited to the Gear enum
+        gearbox.gear = gear
+        allow_unmanned_idle = Console.allow_unmanned_idle
+        Console.allow_unmanned_idle = self.allow_unmanned_idle
+        try:
+            with muted():
+                exited = Console.dispatch(
+                    command, engine=engine, gearbox=gearbox, interactive=False
+                )
+        finally:
+            Console.allow_unmanned_idle = allow_unmanned_idle
+        return exited, self.encode(
+            engine.running,
+            gearbox.mode.value,
+            gearbox.gear,
+            gearbox.parking_pawl_engaged,
+        )
+
+
+class Exploration:
+    """Result of walking a StateSpace from a start state"""
+
+    def __init__(self, space: StateSpace, start: int):
+        self.space = space
+        self.start = start
+        self.visited = bytearray((space.size + 7) // 8)  # bitset of reachable states
+        self.transitions = 0
+        self.unreachable = []
+        self.dead_ends = []  # reachable states from which exit can never be reached
+        self.violations = {name: [] for name, _ in INVARIANTS}
+
+    def reachable(self, state: int) -> bool:
+        return bool(self.visited[state >> 3] >> (state & 7) & 1)
+
+    @property
+    def reachable_count(self) -> int:
+        return sum(bin(_).count("1") for _ in self.visited)
+
+    @property
+    def ok(self) -> bool:
+        """True when no dead end and no invariant violation was found"""
+        return not self.dead_ends and not any(self.violations.values())
+
+    def report(self, unreachable: bool = False) -> str:
+        """
+        :param: unreachable : list every unreachable state rather than counting them
+        :return: human readable summary
+        """
+        describe = self.space.describe
+        lines = [
+            f"max gear {gear_name(self.space.max_gear)}: "
+            f"{self.reachable_count} of {self.space.size} states reachable "
+            f"over {self.transitions} transitions from {describe(self.start)}",
+            f"unreachable states: {len(self.unreachable)}",
+        ]
+        if unreachable:
+            lines += [f"  {describe(_)}" for _ in self.unreachable]
+        lines.append(f"dead ends: {len(self.dead_ends)}")
+        lines += [f"  {describe(_)}" for _ in self.dead_ends]
+        for name, states in self.violations.items():
+            lines.append(f"{name}: {len(states)}")
+            lines += [f"  {describe(_)}" for _ in states]
+        return "\n".join(lines)
+
+
+def explore(
+    max_gear: int = Gearbox.max_gear.value,
+    allow_unmanned_idle: Optional[bool] = None,
+    table: Optional[list] = None,
+    start: Optional[tuple] = None,
+) -> Exploration:
+    """
+    Enumerate every state reachable through the Console commands and Engine.tick
+
+    :param: max_gear : value of the highest forward gear, not limited to the Gear enum
+    :param: allow_unmanned_idle : exit rule, Console.allow_unmanned_idle by default
+    :param: table : transitions to explore, compile_transitions(max_gear) by default
+    :param: start : (running, mode, gear, pawl) power-on state, a fresh Engine and
+                    Gearbox by default
+
+    :return: reachable, unreachable and dead end states plus invariant violations
+    """
+    space = StateSpace(max_gear, allow_unmanned_idle, table)
+    if start is None:
+        gearbox = Gearbox()
+        start = (
+            False,
+            gearbox.mode.value,
+            gearbox.gear.value,
+            gearbox.parking_pawl_engaged,
+        )
+    result = Exploration(space, space.encode(*start))
+    visited = result.visited
+
+    # depth first walk, recording every edge backwards for the dead end search
+    predecessors = {}
+    stack = [result.start]
+    visited[result.start >> 3] |= 1 << (result.start & 7)
+    while stack:
+        state = stack.pop()
+        for _, successor in space.successors(state):
+            result.transitions += 1
+            predecessors.setdefault(successor, []).append(state)
+            if not visited[successor >> 3] >> (successor & 7) & 1:
+                visited[successor >> 3] |= 1 << (successor & 7)
+                stack.append(successor)
+
+    # walk back from every state the vehicle can be left in
+    exits = bytearray((space.size + 7) // 8)
+    stack = [_ for _ in range(space.size) if result.reachable(_) and space.can_exit(_)]
+    for state in stack:
+        exits[state >> 3] |= 1 << (state & 7)
+    while stack:
+        for predecessor in predecessors.get(stack.pop(), ()):
+            if not exits[predecessor >> 3] >> (predecessor & 7) & 1:
+                exits[predecessor >> 3] |= 1 << (predecessor & 7)
+                stack.append(predecessor)
+
+    for state in range(space.size):
+        if not result.reachable(state):
+            result.unreachable.append(state)
+            continue
+        if not exits[state >> 3] >> (state & 7) & 1:
+            result.dead_ends.append(state)
+        decoded = space.decode(state)
+        for name, invariant in INVARIANTS:
+            if invariant(*decoded):
+                result.violations[name].append(state)
+    return result
+
+
+def main(
+    argv: Optional[list] = None, prog: str = "python -m assessment.explorer"
+) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--max-gear",
+        type=int,
+        default=Gearbox.max_gear.value,
+        help="highest forward gear",
+    )
+    parser.add_argument(
+        "--profile", help="explore a TransmissionProfile, shipped name or JSON path"
+    )
+    parser.add_argument(
+        "--no-unmanned-idle",
+        action="store_true",
+        help="only allow exiting with the engine stopped",
+    )
+    parser.add_argument(
+        "--unreachable", action="store_true", help="list every unreachable state"
+    )
+    args = parser.parse_args(argv)
+
+    max_gear, table = args.max_gear, None
+    if args.profile:
+        # compiled profiles are cached through NumPy, only load it when asked for one
+        from assessment.profile import TransmissionProfile
+
+        profile = TransmissionProfile.named(args.profile)
+        max_gear, table = profile.gears, profile.compile()["transitions"]
+    result = explore(
+        max_gear,
+        allow_unmanned_idle=False if args.no_unmanned_idle else None,
+        table=table,
+    )
+    print(result.report(args.unreachable))
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Vectorized fleet of vehicles backed by NumPy arrays"""
+
+import numpy as np
+
+from assessment import physics
+from assessment.engine import Engine
+from assessment.gearbox import Gearbox
+from assessment.types import Mode, Gear
+
+# gear ratios indexed by gear value - Gear.REVERSE.value
+GEAR_RATIOS = np.array(
+    [
+        physics.GEAR_RATIOS[Gear(_)]
+        for _ in range(Gear.REVERSE.value, Gearbox.max_gear.value + 1)
+    ]
+)
+
+
+class Fleet:
+    """Vectorized counterpart of Gearbox and Engine holding the state of N vehicles"""
+
+    downshift_rpm_threshold = Gearbox.downshift_rpm_threshold
+    upshift_rpm_threshold = Gearbox.upshift_rpm_threshold
+
+    max_gear = Gearbox.max_gear
+    max_skip = Gearbox.max_skip
+
+    upshift_bands = np.array(Gearbox.upshift_bands)
+    downshift_bands = np.array(Gearbox.downshift_bands)
+
+    def __init__(self, size: int, shift_map=None):
+        """
+        :param: size : number of vehicles, all start parked with the engine at rest
+        :param: shift_map : optional ShiftMap used by auto_shift instead of the rpm thresholds
+        """
+        self.shift_map = shift_map
+        self.mode = np.full(size, Mode.PARK.value, dtype=np.int8)
+        self.gear = np.full(size, Gear.NEUTRAL.value, dtype=np.int8)
+        self.parking_pawl_engaged = np.zeros(size, dtype=bool)
+        self.running = np.zeros(size, dtype=bool)
+        self.rpm = np.zeros(size)
+        self.speed = np.zeros(size)  # m/s, see assessment.physics
+
+    def __len__(self) -> int:
+        return len(self.mode)
+
+    @classmethod
+    def from_vehicles(cls, engines: list, gearboxes: list) -> "Fleet":
+        """
+        Build a fleet from existing Engine and Gearbox instances
+
+        :param: engines : one Engine per vehicle
+        :param: gearboxes : one Gearbox per vehicle, in the same order as engines
+        """
+        fleet = cls(len(gearboxes))
+        fleet.mode[:] = [_.mode.value for _ in gearboxes]
+        fleet.gear[:] = [_.gear.value for _ in gearboxes]
+        fleet.parking_pawl_engaged[:] = [_.parking_pawl_engaged for _ in gearboxes]
+        fleet.running[:] = [_.running for _ in engines]
+        fleet.rpm[:] = [_.rpm for _ in engines]
+        return fleet
+
+    def vehicle(self, index: int) -> tuple:
+        """
+        Copy a single vehicle out of the fleet
+
+        :param: index : position of the vehicle in the fleet
+        :return: (Engine, Gearbox) holding the vehicle's current state
+        """
+        engine = Engine(
+            running=bool(self.running[index]), rpm=round(float(self.rpm[index]))
+        )
+        gearbox = Gearbox(
+            mode=Mode(int(self.mode[index])),
+            gear=Gear(int(self.gear[index])),
+            parking_pawl_engaged=bool(self.parking_pawl_engaged[index]),
+        )
+        return engine, gearbox
+
+    def auto_shift(self, rpm: np.ndarray, throttle=None) -> np.ndarray:
+        """
+        Auto shift every running vehicle in Drive mode which hit an rpm threshold
+
+        Applies the same rules as Gearbox.auto_shift, jumping at most max_skip gears,
+        to the whole fleet with masked array updates
+
+        :param: rpm : current Engine rpm of every vehicle
+        :param: throttle : pedal positions, with a shift map it picks the gear from them and speed
+        :return: boolean mask of the vehicles which changed gear
+        """
+        gear = self.gear
+        driving = (self.mode == Mode.DRIVE.value) & self.running
+        upshift = rpm >= self.upshift_rpm_threshold
+        downshift = ~upshift & (rpm <= self.downshift_rpm_threshold)
+
+        if self.shift_map is not None and throttle is not None:
+            target = self.shift_map.target_gears(gear, throttle, self.speed)
+        else:
+            forward = gear >= Gear.ONE.value
+            ratio = np.where(forward, GEAR_RATIOS[gear - Gear.REVERSE.value], 1.0)
+            wheel_rpm = rpm / ratio
+            target = np.where(
+                upshift,
+                np.minimum(
+                    np.searchsorted(self.upshift_bands, wheel_rpm, side="right") + 1,
+                    self.max_gear.value,
+                ),
+                np.where(
+                    downshift,
+                    np.maximum(
+                        np.searchsorted(self.downshift_bands, wheel_rpm, side="left"),
+                        Gear.ONE.value,
+                    ),
+                    gear,
+                ),
+            )
+        target = np.clip(target, gear - self.max_skip, gear + self.max_skip)
+
+        # neutral and reverse have no rpm band, they step once
+        stepped = gear + upshift - (downshift & (gear > Gear.REVERSE.value))
+        target = np.where(gear < Gear.ONE.value, stepped, target)
+
+        shifted = driving & (target != gear)
+        self.gear = np.where(shifted, target, gear).astype(np.int8)
+        return shifted
+
+    def step(self, throttle, dt: float, brake=0.0) -> None:
+        """
+        Advance every vehicle by one fixed timestep, the batched VehicleModel.step
+
+        :param: throttle : pedal position from 0 to 1, scalar or one per vehicle
+        :param: dt : timestep in s
+        :param: brake : brake pedal position from 0 to 1, scalar or one per vehicle
+        """
+        parked = self.mode == Mode.PARK.value
+        self.speed[parked] = 0.0
+        ratio = GEAR_RATIOS[self.gear - Gear.REVERSE.value]
+        coupled = ~parked & (ratio != 0.0) & self.running
+
+        wheel_rpm = np.abs(
+            self.speed * ratio * physics.FINAL_DRIVE * physics.RPM_PER_SPEED
+        )
+        force = np.where(
+            coupled & (wheel_rpm < physics.REDLINE_RPM),
+            throttle
+            * physics.MAX_TORQUE
+            * ratio
+            * physics.FINAL_DRIVE
+            / physics.WHEEL_RADIUS,
+            0.0,
+        )
+
+        speed = self.speed + force / physics.MASS * dt
+        resistance = (
+            physics.ROLLING_RESISTANCE
+            + physics.AERO_DRAG * speed * speed
+            + brake * physics.MAX_BRAKE_FORCE
+        )
+        slowed = np.maximum(np.abs(speed) - resistance / physics.MASS * dt, 0.0)
+        self.speed = np.copysign(slowed, speed)
+
+        wheel_rpm = np.abs(
+            self.speed * ratio * physics.FINAL_DRIVE * physics.RPM_PER_SPEED
+        )
+        converter_rpm = physics.IDLE_RPM + throttle * (
+            physics.STALL_RPM - physics.IDLE_RPM
+        )
+        free_rpm = physics.IDLE_RPM + throttle * (
+            physics.REDLINE_RPM - physics.IDLE_RPM
+        )
+        rpm = np.where(
+            coupled,
+            np.minimum(np.maximum(wheel_rpm, converter_rpm), physics.REDLINE_RPM),
+            free_rpm,
+        )
+        self.rpm = np.where(self.running, np.rint(rpm), 0.0)
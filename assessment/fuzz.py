@@ -0,0 +1,492 @@
+"""
+Differential fuzzing of Console, Engine and Gearbox against a reference model
+
+python -m assessment.fuzz --cases 1000000
+python -m assessment.fuzz --cases 100000 --profile ten-speed --no-unmanned-idle
+
+Every case is a random sequence of steps, each one a Console command or an int the
+engine rpm is set to. Both sides tick like Engine.run before every step and their full
+state is compared after it. Divergences are shrunk to a minimal failing sequence.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import RingSink, output_to
+from assessment.profile import TransmissionProfile
+from assessment.types import Mode, Gear
+
+# the probability a step sets the rpm rather than issuing a command
+RPM_STEP_RATE = 0.25
+MAX_RPM = 7000
+# in order of the values ReferenceVehicle.snapshot returns
+SNAPSHOT_FIELDS = ("running", "rpm", "mode", "gear", "pawl", "messages", "exited")
+
+_REVERSE, _NEUTRAL, _PARK, _DRIVE, _MANUAL = (
+    Mode.REVERSE.value,
+    Mode.NEUTRAL.value,
+    Mode.PARK.value,
+    Mode.DRIVE.value,
+    Mode.MANUAL.value,
+)
+_FIRST = Gear.ONE.value
+
+
+class ReferenceVehicle:
+    """
+    The documented behaviour of a vehicle written out as plainly as possible, sharing
+    no logic with the transition table, Console handlers or Engine it checks
+
+    Modes and gears are plain ints, messages are collected as text
+    """
+
+    def __init__(self, profile: TransmissionProfile, allow_unmanned_idle: bool):
+        """
+        :param: profile : transmission to model
+        :param: allow_unmanned_idle : exit rule, see Console.allow_unmanned_idle
+        """
+        self.profile = profile
+        self.allow_unmanned_idle = allow_unmanned_idle
+        self.ratios = {gear: _ for gear, _ in enumerate(profile.ratios, _FIRST)}
+        self.running = False
+        self.rpm = 0
+        self.mode = _PARK
+        self.gear = Gear.NEUTRAL.value
+        self.pawl = False
+        self.exited = False
+        self.messages = []
+
+    def snapshot(self) -> tuple:
+        """
+        :return: values of SNAPSHOT_FIELDS, the messages since the last snapshot
+        """
+        messages, self.messages = tuple(self.messages), []
+        return (
+            self.running,
+            self.rpm,
+            self.mode,
+            self.gear,
+            self.pawl,
+            messages,
+            self.exited,
+        )
+
+    def step(self, step) -> None:
+        """
+        :param: step : command name or rpm, ticking first like Engine.run
+        """
+        if self.running and self.mode == _DRIVE:
+            self.auto_shift()
+        if isinstance(step, int):
+            self.rpm = step
+        else:
+            getattr(self, f"command_{step}")()
+
+    def auto_shift(self) -> None:
+        profile, rpm, gear = self.profile, self.rpm, self.gear
+        if gear < _FIRST:
+            if rpm >= profile.upshift_rpm:
+                if gear < profile.gears:
+                    self.gear += 1
+            elif rpm <= profile.downshift_rpm and gear != Gear.REVERSE.value:
+                self.gear -= 1
+            return
+
+        # linear search for the gear whose rpm at the current speed is in range
+        wheel_rpm = rpm / self.ratios[gear]
+        if rpm >= profile.upshift_rpm:
+            target = profile.gears
+            for candidate in range(_FIRST, profile.gears + 1):
+                if profile.upshift_rpm / self.ratios[candidate] > wheel_rpm:
+                    target = candidate
+                    break
+        elif rpm <= profile.downshift_rpm:
+            target = _FIRST
+            for candidate in range(profile.gears, _FIRST - 1, -1):
+                if profile.downshift_rpm / self.ratios[candidate] < wheel_rpm:
+                    target = candidate
+                    break
+        else:
+            return
+        self.gear = max(gear - profile.max_skip, min(target, gear + profile.max_skip))
+
+    def command_start(self) -> None:
+        if not self.running:
+            self.running = True
+            self.rpm = 1500
+
+    def command_stop(self) -> None:
+        if self.mode != _PARK:
+            self.messages.append(
+                "please put the car into park before shutting down the engine!"
+            )
+        elif self.running:
+            self.running = False
+            self.rpm = 0
+
+    def command_exit(self) -> None:
+        if self.allow_unmanned_idle and self.mode != _PARK:
+            self.messages.append("please Park the car before exiting!")
+        elif not self.allow_unmanned_idle and self.running:
+            self.messages.append("please Park and Stop the engine before exiting!")
+        else:
+            self.messages.append("exiting vehicle....")
+            self.exited = True
+
+    def _shift_allowed(self) -> bool:
+        if not self.running:
+            self.messages.append("please start the car first!")
+        return self.running
+
+    def command_reverse(self) -> None:
+        if self._shift_allowed() and self.gear in self.profile.reverse_from:
+            self.mode, self.gear, self.pawl = _REVERSE, Gear.REVERSE.value, False
+
+    def command_neutral(self) -> None:
+        if not self._shift_allowed():
+            return
+        if self.mode == _PARK or self.gear in self.profile.neutral_from:
+            self.mode, self.gear, self.pawl = _NEUTRAL, Gear.NEUTRAL.value, False
+        else:
+            self.messages.append(
+                "please put the car into first gear or reverse before switching to "
+                "neutral!"
+            )
+
+    def command_park(self) -> None:
+        if not self._shift_allowed() or self.mode == _PARK:
+            return
+        if self.gear in self.profile.park_from:
+            self.mode, self.gear, self.pawl = _PARK, Gear.NEUTRAL.value, True
+        else:
+            self.messages.append(
+                "please put the car into neutral, first gear or reverse before parking!"
+            )
+
+    def command_drive(self) -> None:
+        if not self._shift_allowed() or self.mode == _DRIVE:
+            return
+        if self.mode != _MANUAL:
+            self.gear = _FIRST
+        self.mode, self.pawl = _DRIVE, False
+
+    def command_manual(self) -> None:
+        if not self._shift_allowed() or self.mode == _MANUAL:
+            return
+        if self.mode == _DRIVE:
+            self.mode = _MANUAL
+        else:
+            self.messages.append("please put the car into drive first!")
+
+    def command_up(self) -> None:
+        if not self._shift_allowed():
+            return
+        if self.mode != _MANUAL:
+            self.messages.append("please put the car into manual first!")
+        elif self.gear < self.profile.gears:
+            self.gear += 1
+
+    def command_down(self) -> None:
+        if not self._shift_allowed():
+            return
+        if self.mode != _MANUAL:
+            self.messages.append("please put the car into manual first!")
+        elif self.gear not in (_FIRST, Gear.REVERSE.value):
+            self.gear -= 1
+
+
+def random_sequence(seed: int, case: int, length: int) -> list:
+    """
+    Steps of one case, drawn from its own stream spawned off seed so a case is the
+    same no matter which shard or worker process runs it
+
+    :param: seed : seed of the whole fuzzing run
+    :param: case : number of the case
+    :param: length : number of steps
+
+    :return: command names and rpm ints
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(case,)))
+    commands = rng.integers(len(Console.AVAILABLE_COMMANDS), size=length).tolist()
+    rpms = rng.integers(MAX_RPM + 1, size=length).tolist()
+    return [
+        rpm if is_rpm else Console.AVAILABLE_COMMANDS[command]
+        for command, rpm, is_rpm in zip(
+            commands, rpms, (rng.random(length) < RPM_STEP_RATE).tolist()
+        )
+    ]
+
+
+def first_divergence(
+    sequence: list,
+    profile: Optional[TransmissionProfile] = None,
+    allow_unmanned_idle: Optional[bool] = None,
+) -> Optional[tuple]:
+    """
+    Run a sequence through a fresh Engine and Gearbox and a ReferenceVehicle
+
+    A successful exit ends the sequence early, like it ends Engine.run
+
+    :param: sequence : command names and rpm ints, see random_sequence
+    :param: profile : transmission under test, the built-in Gearbox by default
+    :param: allow_unmanned_idle : exit rule, Console.allow_unmanned_idle by default
+
+    :return: (step, expected snapshot, actual snapshot) of the first step after which
+             the two differ, None if they never do
+    """
+    if allow_unmanned_idle is None:
+        allow_unmanned_idle = Console.allow_unmanned_idle
+    gearbox = profile.gearbox() if profile is not None else Gearbox()
+    engine = Engine()
+    reference = ReferenceVehicle(
+        profile or TransmissionProfile.default(), allow_unmanned_idle
+    )
+    dispatch = Console.dispatch
+    previous, Console.allow_unmanned_idle = (
+        Console.allow_unmanned_idle,
+        allow_unmanned_idle,
+    )
+    try:
+        with output_to(RingSink()) as output:
+            for position, step in enumerate(sequence):
+                engine.tick(gearbox)
+                exited = False
+                if isinstance(step, int):
+                    engine.rpm = step
+                else:
+                    exited = dispatch(
+                        step, engine=engine, gearbox=gearbox, interactive=False
+                    )
+                actual = (
+                    engine.running,
+                    engine.rpm,
+                    gearbox.mode.value,
+                    gearbox.gear.value,
+                    gearbox.parking_pawl_engaged,
+                    tuple(output.messages()),
+                    bool(exited),
+                )
+                output.clear()
+                reference.step(step)
+                expected = reference.snapshot()
+                if actual != expected:
+                    return position, expected, actual
+                if exited:
+                    return None
+    finally:
+        Console.allow_unmanned_idle = previous
+    return None
+
+
+def shrink(sequence: list, fails) -> list:
+    """
+    Remove steps for as long as the sequence keeps failing, halving the number of steps
+    removed at once down to single ones
+
+    :param: sequence : failing sequence
+    :param: fails : True if a sequence still fails
+
+    :return: a failing sequence from which no single step can be removed
+    """
+    chunk = len(sequence) // 2
+    while chunk:
+        start = 0
+        while start < len(sequence):
+            candidate = sequence[:start] + sequence[start + chunk :]
+            if candidate and fails(candidate):
+                sequence = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    return sequence
+
+
+class Divergence:
+    """A case on which the implementation and the reference model disagree"""
+
+    def __init__(self, case: int, sequence: list, shrunk: list, found: tuple):
+        """
+        :param: case : number of the case
+        :param: sequence : steps as generated
+        :param: shrunk : minimal failing steps
+        :param: found : first_divergence of shrunk
+        """
+        self.case = case
+        self.sequence = sequence
+        self.shrunk = shrunk
+        self.step, self.expected, self.actual = found
+
+    def report(self) -> str:
+        lines = [
+            f"case {self.case}, {len(self.sequence)} steps shrunk to "
+            f"{len(self.shrunk)}: {self.shrunk}",
+            f"  after step {self.step} ({self.shrunk[self.step]!r}):",
+        ]
+        for name, expected, actual in zip(SNAPSHOT_FIELDS, self.expected, self.actual):
+            mark = "  " if expected == actual else "!="
+            lines.append(f"  {mark} {name:<9} expected {expected!r}, got {actual!r}")
+        return "\n".join(lines)
+
+
+class FuzzResult:
+    """Outcome of one or more shards which can be merged"""
+
+    def __init__(self):
+        self.cases = 0
+        self.steps = 0
+        self.divergences = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.divergences
+
+    def merge(self, other: "FuzzResult") -> "FuzzResult":
+        self.cases += other.cases
+        self.steps += other.steps
+        self.divergences += other.divergences
+        return self
+
+    def report(self) -> str:
+        lines = [
+            f"{self.cases:,} cases, {self.steps:,} steps, "
+            f"{len(self.divergences)} divergences"
+        ]
+        lines += [_.report() for _ in self.divergences]
+        return "\n".join(lines)
+
+
+def _fuzz_shard(
+    seed: int,
+    start: int,
+    stop: int,
+    length: int,
+    profile: Optional[TransmissionProfile],
+    allow_unmanned_idle: Optional[bool],
+    max_divergences: int,
+) -> FuzzResult:
+    """Run cases start to stop, stopping once max_divergences were found and shrunk"""
+    result = FuzzResult()
+
+    def fails(sequence: list) -> bool:
+        return first_divergence(sequence, profile, allow_unmanned_idle) is not None
+
+    for case in range(start, stop):
+        sequence = random_sequence(seed, case, length)
+        found = first_divergence(sequence, profile, allow_unmanned_idle)
+        result.cases += 1
+        result.steps += length
+        if found is not None:
+            # nothing after the diverging step matters
+            shrunk = shrink(sequence[: found[0] + 1], fails)
+            result.divergences.append(
+                Divergence(
+                    case,
+                    sequence,
+                    shrunk,
+                    first_divergence(shrunk, profile, allow_unmanned_idle),
+                )
+            )
+            if len(result.divergences) >= max_divergences:
+                break
+    return result
+
+
+def fuzz(
+    cases: int,
+    length: int = 32,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    profile: Optional[TransmissionProfile] = None,
+    allow_unmanned_idle: Optional[bool] = None,
+    shard_size: Optional[int] = None,
+    max_divergences: int = 10,
+) -> FuzzResult:
+    """
+    Compare the implementation against ReferenceVehicle on random sequences across a
+    pool of worker processes
+
+    :param: cases : number of random sequences
+    :param: length : steps per sequence
+    :param: seed : seed of the random sequences
+    :param: workers : worker processes, one per CPU by default, 1 runs in this process
+    :param: profile : transmission under test, the built-in Gearbox by default
+    :param: allow_unmanned_idle : exit rule, Console.allow_unmanned_idle by default
+    :param: shard_size : cases run per task, by default four tasks per worker
+    :param: max_divergences : most divergences shrunk and reported, every shard stops
+                              once it found this many
+
+    :return: cases and steps run, every divergence found
+    """
+    if allow_unmanned_idle is None:
+        # resolved here, worker processes may not share the setting of this one
+        allow_unmanned_idle = Console.allow_unmanned_idle
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, -(-cases // (workers * 4)))
+    shards = [
+        (
+            seed,
+            start,
+            min(start + shard_size, cases),
+            length,
+            profile,
+            allow_unmanned_idle,
+            max_divergences,
+        )
+        for start in range(0, cases, shard_size)
+    ]
+
+    result = FuzzResult()
+    if workers == 1:
+        for shard in shards:
+            result.merge(_fuzz_shard(*shard))
+            if len(result.divergences) >= max_divergences:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_result in pool.map(_fuzz_shard, *zip(*shards)):
+                result.merge(shard_result)
+    del result.divergences[max_divergences:]
+    return result
+
+
+def main(
+    argv: Optional[list] = None, prog: str = "python -m assessment.fuzz"
+) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.split("\n")[1])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--length", type=int, default=32, help="steps per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, help="worker processes, one per CPU by default"
+    )
+    parser.add_argument(
+        "--profile", help="fuzz a TransmissionProfile, shipped name or JSON path"
+    )
+    parser.add_argument(
+        "--no-unmanned-idle",
+        action="store_true",
+        help="only allow exiting with the engine stopped",
+    )
+    args = parser.parse_args(argv)
+
+    result = fuzz(
+        args.cases,
+        length=args.length,
+        seed=args.seed,
+        workers=args.workers,
+        profile=TransmissionProfile.named(args.profile) if args.profile else None,
+        allow_unmanned_idle=False if args.no_unmanned_idle else None,
+    )
+    print(result.report())
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
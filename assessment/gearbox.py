@@ -1,133 +1,214 @@
-from assessment.helper import n_print
-from assessment.types import Mode, Action, Gear
-
-
-class Gearbox:
-    """Main transmission class"""
-
-    parking_pawl_engaged = False
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+from assessment import physics
+from assessment.events import Observable
+from assessment.helper import n_print_code
+from assessment.transitions import (
+    ACTION_STRIDE,
+    GEAR_STRIDE,
+    INDEX_OFFSET,
+    MODE_STRIDE,
+    RUNNING_STRIDE,
+    compile_transitions,
+    resolve_transitions,
+)
+from assessment.types import Mode, Action, Gear, Event
+
+# plain int copies of enum values read on the auto_shift hot path
+_FIRST_GEAR = Gear.ONE.value
+_UP = Action.UP
+_DOWN = Action.DOWN
+
+
+class Gearbox(Observable):
+    """Main transmission class, one instance per simulated vehicle"""
+
+    __slots__ = (
+        "mode",
+        "gear",
+        "parking_pawl_engaged",
+        "shift_map",
+        "telemetry",
+        "metrics",
+        "listeners",
+    )
 
     downshift_rpm_threshold = 1200
     upshift_rpm_threshold = 3000
 
-    mode = Mode.PARK  # current state gearbox is in
-    gear = Gear.NEUTRAL  # current gear gearbox is in
-    max_gear = Gear(max([_.value for _ in Gear]))
-
-    @staticmethod
-    def auto_shift(rpm: int) -> None:
+    # five-speed unless built from a TransmissionProfile, see assessment.profile
+    profile = None
+    max_gear = Gear.FIVE
+    # most gears auto_shift may jump in a single shift
+    max_skip = 2
+
+    gear_ratios = physics.GEAR_RATIOS
+    # the same ratios keyed by plain gear value, ints hash faster than enum members
+    _ratios = {gear.value: ratio for gear, ratio in gear_ratios.items()}
+    _top_gear = max_gear.value
+    _gears = {gear.value: gear for gear in Gear}
+    # auto_shift bisects these to find the gear which brings the rpm back between thresholds
+    upshift_bands = physics.rpm_bands(upshift_rpm_threshold, max_gear, gear_ratios)
+    downshift_bands = physics.rpm_bands(downshift_rpm_threshold, max_gear, gear_ratios)
+    # every legal shift resolved once for max_gear, see assessment.transitions
+    transitions = resolve_transitions(compile_transitions(max_gear.value))
+
+    def __init__(
+        self,
+        mode: Mode = Mode.PARK,
+        gear: Gear = Gear.NEUTRAL,
+        parking_pawl_engaged: bool = False,
+        shift_map=None,
+    ):
+        """
+        :param: mode : initial state the gearbox is in
+        :param: gear : initial gear the gearbox is in
+        :param: parking_pawl_engaged : initial parking pawl position
+        :param: shift_map : optional ShiftMap used by auto_shift instead of the rpm thresholds
+        """
+        self.mode = mode  # current state gearbox is in
+        self.gear = gear  # current gear gearbox is in
+        self.parking_pawl_engaged = parking_pawl_engaged
+        self.shift_map = shift_map
+        # called with (gearbox, action, new mode, new gear, auto_shift) before every
+        # state change, see TelemetryRecorder.attach
+        self.telemetry = None
+        # opt-in instrumentation, see Metrics.attach
+        self.metrics = None
+        # Event -> listeners, None while nobody subscribed, see Observable.subscribe
+        self.listeners = None
+
+    def auto_shift(
+        self, rpm: int, throttle: Optional[float] = None, speed: Optional[float] = None
+    ) -> None:
         """
         Auto shift when hitting rpm thresholds in Drive mode
 
+        Jumps straight to the gear which brings the rpm back between the thresholds,
+        at most max_skip gears away. With a shift map and both the current throttle and
+        speed the map picks the gear instead.
+
         :param: rpm : current Engine rpm
+        :param: throttle : pedal position from 0 to 1
+        :param: speed : vehicle speed in m/s
         """
-        if rpm >= Gearbox.upshift_rpm_threshold:
-            # if the user attempts to shift up or down at max or min gear, do nothing
-            if Gearbox.gear != Gearbox.max_gear:
-                Gearbox.shift(engine_running=True, action=Action.UP, auto_shift=True)
-        elif rpm <= Gearbox.downshift_rpm_threshold:
-            if Gearbox.gear != Gear.ONE:
-                Gearbox.shift(engine_running=True, action=Action.DOWN, auto_shift=True)
-
-    @staticmethod
-    def friendly_mode() -> str:
+        gear = self.gear._value_
+        if gear < _FIRST_GEAR:
+            # neutral and reverse have no rpm band, step once like before
+            if rpm >= self.upshift_rpm_threshold:
+                self.shift(engine_running=True, action=Action.UP, auto_shift=True)
+            elif rpm <= self.downshift_rpm_threshold:
+                self.shift(engine_running=True, action=Action.DOWN, auto_shift=True)
+            return
+
+        if self.shift_map is not None and throttle is not None and speed is not None:
+            target = self.shift_map.target_gear(gear, throttle, speed)
+        elif rpm >= self.upshift_rpm_threshold:
+            # lowest gear whose rpm would fall below the upshift threshold
+            wheel_rpm = rpm / self._ratios[gear]
+            target = min(
+                bisect_right(self.upshift_bands, wheel_rpm) + 1, self._top_gear
+            )
+        elif rpm <= self.downshift_rpm_threshold:
+            # highest gear whose rpm would rise above the downshift threshold
+            wheel_rpm = rpm / self._ratios[gear]
+            target = max(bisect_left(self.downshift_bands, wheel_rpm), _FIRST_GEAR)
+        else:
+            return
+
+        if target > gear + self.max_skip:
+            target = gear + self.max_skip
+        elif target < gear - self.max_skip:
+            target = gear - self.max_skip
+        if target != gear:
+            self._auto_shift_to(self._gears[target])
+
+    def _auto_shift_to(self, gear: Gear) -> None:
+        """
+        Move between forward gears in a single transition, automated up and down
+        shifts are accepted in every mode so there is nothing to look up
+
+        :param: gear : forward gear to jump to
+        """
+        action = _UP if gear._value_ > self.gear._value_ else _DOWN
+        if self.metrics is not None:
+            self.metrics.shift(self, action, self.mode, gear, None)
+        if self.telemetry is not None:
+            self.telemetry(self, action, self.mode, gear, True)
+        if self.listeners is not None:
+            self._observed_shift(self.mode, gear, None)
+            return
+        self.gear = gear
+
+    def friendly_mode(self) -> str:
         """Returns a string repr of the current gearbox mode which is nice to look at"""
-        friendly_mode_name = str(Gearbox.mode).split(".")[1][0]
-        if Gearbox.mode in [
+        friendly_mode_name = str(self.mode).split(".")[1][0]
+        if self.mode in [
             Mode.DRIVE,
             Mode.MANUAL,
         ]:
             # display the current gear when in Drive or Manual mode
-            friendly_mode_name += str(Gearbox.gear.value)
+            friendly_mode_name += str(self.gear.value)
         return friendly_mode_name
 
-    @staticmethod
-    def shift(engine_running: bool, action: Action, auto_shift: bool = False) -> None:
+    def shift(
+        self, engine_running: bool, action: Action, auto_shift: bool = False
+    ) -> None:
         """
         Process actions from the user or the auto shifter to change modes or shift gears
 
+        Every outcome is looked up in the precomputed transition table
+
         :param: engine_running : is the engine running
         :param: action : a Gearbox.Action which either the user or automated system can issue
         :auto_shift: is this a command issued by the automated system
         """
-        if not engine_running:
-            n_print("please start the car first!")
+        # same arithmetic as transitions.transition_index, inlined for the hot path
+        mode, gear, pawl, message, code, refused = self.transitions[
+            self.gear._value_ * GEAR_STRIDE
+            + engine_running * RUNNING_STRIDE
+            + self.mode._value_ * MODE_STRIDE
+            + action._value_ * ACTION_STRIDE
+            + auto_shift
+            + INDEX_OFFSET
+        ]
+        if self.metrics is not None:
+            self.metrics.shift(self, action, mode, gear, message)
+        if message is not None:
+            n_print_code(code)
+            if self.listeners is not None:
+                self.emit(Event.SHIFT_REJECTED, action, message)
             return
-
-        # reverse
-        if action == Action.REVERSE:
-            if Gearbox.gear not in [
-                Gear.NEUTRAL,
-                Gear.ONE,
-            ]:
-                return
-            Gearbox.mode = Mode.REVERSE
-            Gearbox.gear = Gear.REVERSE
-            Gearbox.parking_pawl_engaged = False
-
-        # neutral
-        elif action == Action.NEUTRAL:
-            if Gearbox.mode != Mode.PARK and Gearbox.gear not in [
-                Gear.REVERSE,
-                Gear.ONE,
-            ]:
-                n_print(
-                    "please put the car into first gear or reverse before switching to neutral!"
-                )
-                return
-            Gearbox.mode = Mode.NEUTRAL
-            Gearbox.gear = Gear.NEUTRAL
-            Gearbox.parking_pawl_engaged = False
-
-        # park
-        elif action == Action.PARK:
-            if Gearbox.mode == Mode.PARK:
-                return
-            if Gearbox.gear not in [
-                Gear.REVERSE,
-                Gear.NEUTRAL,
-                Gear.ONE,
-            ]:
-                n_print(
-                    "please put the car into neutral, first gear or reverse before parking!"
-                )
-                return
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            Gearbox.parking_pawl_engaged = True
-
-        # drive
-        elif action == Action.DRIVE:
-            if Gearbox.mode == Mode.DRIVE:
-                return
-            if Gearbox.mode != Mode.MANUAL:
-                Gearbox.gear = Gear.ONE
-            Gearbox.mode = Mode.DRIVE
-            Gearbox.parking_pawl_engaged = False
-
-        # manual
-        elif action == Action.MANUAL:
-            if Gearbox.mode == Mode.MANUAL:
+        if self.telemetry is not None and (
+            mode is not self.mode or gear is not self.gear
+        ):
+            self.telemetry(self, action, mode, gear, auto_shift)
+        if self.listeners is not None:
+            if refused:
+                self.emit(Event.SHIFT_REJECTED, action, None)
                 return
-            if Gearbox.mode != Mode.DRIVE:
-                n_print("please put the car into drive first!")
-                return
-            Gearbox.mode = Mode.MANUAL
+            self._observed_shift(mode, gear, pawl)
+            return
+        self.mode = mode
+        self.gear = gear
+        if pawl is not None:
+            self.parking_pawl_engaged = pawl
 
-        # up
-        elif action == Action.UP:
-            if not auto_shift and Gearbox.mode != Mode.MANUAL:
-                n_print("please put the car into manual first!")
-                return
-            if Gearbox.gear == Gear.FIVE:
-                return
-            Gearbox.gear = Gear(Gearbox.gear.value + 1)
+    def _observed_shift(self, mode: Mode, gear: Gear, pawl: Optional[bool]) -> None:
+        """
+        Apply an accepted shift and notify the listeners of what changed, kept apart
+        so that shifting costs a single check while nobody is subscribed
 
-        # down
-        elif action == Action.DOWN:
-            if not auto_shift and Gearbox.mode != Mode.MANUAL:
-                n_print("please put the car into manual first!")
-                return
-            if Gearbox.gear == Gear.ONE:
-                return
-            Gearbox.gear = Gear(Gearbox.gear.value - 1)
+        :param: pawl : new parking pawl position, None to leave it
+        """
+        previous_mode, previous_gear = self.mode, self.gear
+        self.mode = mode
+        self.gear = gear
+        if pawl is not None:
+            self.parking_pawl_engaged = pawl
+        # after the change, listeners see the gearbox in its new state
+        if mode is not previous_mode:
+            self.emit(Event.MODE_CHANGED, previous_mode, mode)
+        if gear is not previous_gear:
+            self.emit(Event.GEAR_CHANGED, previous_gear, gear)
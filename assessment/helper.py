@@ -1,17 +1,159 @@
 """Helper functions"""
 
-from os import system as cmd
+import sys
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, TextIO
+
+# move the cursor home and erase the screen, understood by any ANSI/VT100 terminal
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+# how a message is padded when rendered
+N_PRINT = 0  # preceded by a blank line
+PRINT_N = 1  # followed by a blank line
+
+# every distinct message text gets a small int code, sinks store codes until they render
+MESSAGE_CODES = {}
+MESSAGE_TEXTS = []
+
+
+def intern_message(text: str) -> int:
+    """
+    :param: text : message text
+    :return: code of the message, the same text always maps to the same code
+    """
+    code = MESSAGE_CODES.get(text)
+    if code is None:
+        code = MESSAGE_CODES[text] = len(MESSAGE_TEXTS)
+        MESSAGE_TEXTS.append(text)
+    return code
+
+
+def render(code: int, layout: int) -> str:
+    """
+    :param: code : interned message code
+    :param: layout : N_PRINT or PRINT_N
+    :return: the message as written to a terminal, newlines included
+    """
+    if layout == N_PRINT:
+        return "\n" + MESSAGE_TEXTS[code] + "\n"
+    return MESSAGE_TEXTS[code] + "\n\n"
+
+
+class StdoutSink:
+    """Writes every message straight away, to whatever sys.stdout currently is"""
+
+    def emit(self, code: int, layout: int) -> None:
+        sys.stdout.write(render(code, layout))
+
+
+class NullSink:
+    """Drops every message"""
+
+    def emit(self, code: int, layout: int) -> None:
+        pass
+
+
+class BufferedSink:
+    """Collects messages and writes them in a single call once capacity is reached"""
+
+    def __init__(self, stream: Optional[TextIO] = None, capacity: int = 4096):
+        """
+        :param: stream : written to on flush, sys.stdout at the time of the flush by default
+        :param: capacity : number of messages buffered between flushes
+        """
+        self.stream = stream
+        self.capacity = capacity
+        self._pending = []
+
+    def emit(self, code: int, layout: int) -> None:
+        self._pending.append((code, layout))
+        if len(self._pending) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("".join([render(*_) for _ in self._pending]))
+            self._pending.clear()
+
+
+class RingSink:
+    """Keeps the most recent messages in memory, e.g. for a status display or a test"""
+
+    def __init__(self, capacity: Optional[int] = 1024):
+        """
+        :param: capacity : number of messages kept, older ones are dropped, None keeps
+                           every message
+        """
+        self._codes = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def emit(self, code: int, layout: int) -> None:
+        if len(self._codes) == self._codes.maxlen:
+            self.dropped += 1
+        self._codes.append(code)
+
+    def messages(self) -> list:
+        """
+        :return: text of every kept message, oldest first, without the padding
+        """
+        return [MESSAGE_TEXTS[_] for _ in self._codes]
+
+    def clear(self) -> None:
+        self._codes.clear()
+
+
+_sink = StdoutSink()
+
+
+def set_sink(sink) -> object:
+    """
+    Send every message printed from now on to sink
+
+    :param: sink : any object with an emit(code, layout) method
+    :return: the sink used until now
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+@contextmanager
+def output_to(sink):
+    """Send every message printed while the context is active to sink, flushing it at the end"""
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+        if hasattr(sink, "flush"):
+            sink.flush()
 
 
 def n_print(s: str):
-    print("\n" + s)
+    _sink.emit(intern_message(s), N_PRINT)
+
+
+def n_print_code(code: int):
+    """n_print a message by the code intern_message gave it, skipping the lookup"""
+    _sink.emit(code, N_PRINT)
 
 
 def print_n(s: str):
-    print(s + "\n")
+    _sink.emit(intern_message(s), PRINT_N)
 
 
 def clear():
-    cmd("cls")
-    cmd("clear")
+    print(CLEAR_SCREEN, end="")
     print("")
+
+
+@contextmanager
+def muted():
+    """Silence every message printed while the context is active"""
+    with output_to(NullSink()):
+        yield
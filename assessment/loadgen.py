@@ -0,0 +1,140 @@
+"""
+Load generator for the gearbox socket server
+
+python -m assessment.loadgen --sessions 64
+python -m assessment.loadgen --sessions 256 --port 8765
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from assessment.bench import SESSION
+from assessment.server import STATUS_PREFIX, GearboxServer
+
+
+async def _connect(host: str, port: int, path: Optional[str]) -> tuple:
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def drive_session(
+    host: str, port: int, path: Optional[str], script: list, latencies: list
+) -> None:
+    """
+    Send every line of script over a fresh connection, waiting for each response
+
+    :param: latencies : receives the round trip time of every line in ns
+    """
+    reader, writer = await _connect(host, port, path)
+    clock = time.perf_counter_ns
+    try:
+        for line in script:
+            start = clock()
+            writer.write(f"{line}\n".encode())
+            while True:
+                response = (await reader.readline()).decode()
+                if not response:
+                    raise ConnectionError("server closed the connection")
+                if response.startswith(STATUS_PREFIX):
+                    break
+            latencies.append(clock() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(ordered: list, percent: float) -> float:
+    """
+    :param: ordered : sorted samples
+    :param: percent : from 0 to 100
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def load_test(
+    sessions: int,
+    rounds: int = 10,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    path: Optional[str] = None,
+    script: Optional[list] = None,
+) -> dict:
+    """
+    Drive concurrent sessions and measure throughput and round trip latency
+
+    Without a port or path a server is started in this process for the duration
+
+    :param: sessions : concurrent connections, each drives its own vehicle
+    :param: rounds : times every session repeats script before it exits
+    :param: host : server host
+    :param: port : server TCP port
+    :param: path : server Unix socket path
+    :param: script : command lines of a round, a park to park drive by default
+
+    :return: commands, seconds, commands_per_sec and p50/p90/p99/max latency in ns
+    """
+    script = (script or SESSION) * rounds + ["exit"]
+    server = None
+    if not port and path is None:
+        server = await GearboxServer().start(host)
+        host, port = server.address[:2]
+    latencies = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *[
+                drive_session(host, port, path, script, latencies)
+                for _ in range(sessions)
+            ]
+        )
+    finally:
+        if server is not None:
+            await server.close()
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "commands": len(latencies),
+        "seconds": seconds,
+        "commands_per_sec": len(latencies) / seconds if seconds else 0.0,
+        "p50_ns": percentile(latencies, 50),
+        "p90_ns": percentile(latencies, 90),
+        "p99_ns": percentile(latencies, 99),
+        "max_ns": latencies[-1] if latencies else 0,
+    }
+
+
+def main(argv: Optional[list] = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m assessment.loadgen", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument(
+        "--rounds", type=int, default=10, help="script repeats per session"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=0, help="server port, in-process server if unset"
+    )
+    parser.add_argument("--unix", help="server Unix socket path")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(
+        load_test(args.sessions, args.rounds, args.host, args.port, args.unix)
+    )
+    print(
+        f"{result['sessions']} sessions, {result['commands']:,} commands in "
+        f"{result['seconds']:.2f}s, {result['commands_per_sec']:,.0f} commands/sec\n"
+        f"latency p50 {result['p50_ns'] / 1e3:.0f}us, p90 {result['p90_ns'] / 1e3:.0f}us"
+        f", p99 {result['p99_ns'] / 1e3:.0f}us, max {result['max_ns'] / 1e3:.0f}us"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,121 @@
+"""Opt-in instrumentation of the Gearbox and Console hot paths"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Callable
+
+from assessment.console import Console
+from assessment.types import Action, Gear, Mode
+
+# latency histograms use power of two buckets, bucket n counts latencies below 2**n ns
+LATENCY_BUCKETS = 48
+
+
+class Metrics:
+    """
+    In-process counters fed by Gearbox.shift and Console.dispatch once attached
+
+    Nothing is recorded and nothing but a None check is paid while detached
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        :param: clock : time source in seconds for the time-in-gear accumulators
+        """
+        self.clock = clock
+        self.actions = Counter()  # Action -> shift requests
+        self.rejections = Counter()  # rejection message -> count
+        self.time_in_gear = defaultdict(float)  # Gear -> seconds
+        self.command_latency = {}  # command -> histogram of LATENCY_BUCKETS counts
+        self._in_gear_since = {}  # Gearbox -> (Gear, clock reading)
+
+    def attach(self, *gearboxes) -> None:
+        """Start recording shifts of every given Gearbox"""
+        now = self.clock()
+        for gearbox in gearboxes:
+            gearbox.metrics = self
+            self._in_gear_since[gearbox] = (gearbox.gear, now)
+
+    def detach(self, *gearboxes) -> None:
+        """Stop recording shifts of every given Gearbox"""
+        now = self.clock()
+        for gearbox in gearboxes:
+            gearbox.metrics = None
+            gear, since = self._in_gear_since.pop(gearbox)
+            self.time_in_gear[gear] += now - since
+
+    def attach_console(self) -> None:
+        """Start recording the latency of every Console command"""
+        Console.metrics = self
+
+    def detach_console(self) -> None:
+        Console.metrics = None
+
+    def shift(
+        self, gearbox, action: Action, mode: Mode, gear: Gear, message: str
+    ) -> None:
+        """Called by Gearbox.shift with the outcome of every request"""
+        self.actions[action] += 1
+        if message is not None:
+            self.rejections[message] += 1
+        elif gear is not gearbox.gear:
+            now = self.clock()
+            old_gear, since = self._in_gear_since.get(gearbox, (gearbox.gear, now))
+            self.time_in_gear[old_gear] += now - since
+            self._in_gear_since[gearbox] = (gear, now)
+
+    def command(self, command: str, elapsed_ns: int) -> None:
+        """Called by Console.dispatch with the time spent handling a command"""
+        histogram = self.command_latency.get(command)
+        if histogram is None:
+            histogram = self.command_latency[command] = [0] * LATENCY_BUCKETS
+        histogram[min(elapsed_ns.bit_length(), LATENCY_BUCKETS - 1)] += 1
+
+    def latency_percentile(self, command: str, percentile: float) -> int:
+        """
+        :param: command : a Console command
+        :param: percentile : from 0 to 100
+        :return: upper bound in ns of the histogram bucket holding the percentile
+        """
+        histogram = self.command_latency.get(command, [])
+        rank = sum(histogram) * percentile / 100
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if count and seen >= rank:
+                return 2**bucket
+        return 0
+
+    def snapshot(self) -> dict:
+        """
+        :return: JSON serializable copy of every metric, time in gear includes the
+                 still running intervals of the attached gearboxes
+        """
+        now = self.clock()
+        time_in_gear = Counter(self.time_in_gear)
+        for gear, since in self._in_gear_since.values():
+            time_in_gear[gear] += now - since
+        return {
+            "actions": {_.name: count for _, count in self.actions.items()},
+            "rejections": dict(self.rejections),
+            "time_in_gear": {_.name: seconds for _, seconds in time_in_gear.items()},
+            "command_latency_ns": {
+                command: {
+                    "count": sum(histogram),
+                    "p50": self.latency_percentile(command, 50),
+                    "p99": self.latency_percentile(command, 99),
+                    "histogram": {
+                        2**bucket: count
+                        for bucket, count in enumerate(histogram)
+                        if count
+                    },
+                }
+                for command, histogram in self.command_latency.items()
+            },
+        }
+
+    def dump(self, path: str) -> None:
+        """Write a snapshot to path as JSON"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
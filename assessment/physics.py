@@ -0,0 +1,129 @@
+"""Fixed-timestep longitudinal vehicle model driving Engine.rpm"""
+
+import math
+
+from assessment.types import Mode, Gear
+
+# rpm of an engine per m/s of vehicle speed with a 1:1 gear ratio
+# e.g. wheel revolutions per minute for the wheel radius below
+WHEEL_RADIUS = 0.31  # m
+RPM_PER_SPEED = 60 / (2 * math.pi * WHEEL_RADIUS)
+
+GEAR_RATIOS = {
+    Gear.REVERSE: -3.2,
+    Gear.NEUTRAL: 0.0,
+    Gear.ONE: 3.5,
+    Gear.TWO: 2.1,
+    Gear.THREE: 1.4,
+    Gear.FOUR: 1.0,
+    Gear.FIVE: 0.8,
+}
+FINAL_DRIVE = 3.7
+
+MASS = 1500.0  # kg
+MAX_TORQUE = 250.0  # Nm, assumed flat across the rev range
+ROLLING_RESISTANCE = 0.015 * MASS * 9.81  # N
+AERO_DRAG = 0.4  # N per (m/s)^2, 1/2 * air density * drag coefficient * frontal area
+MAX_BRAKE_FORCE = 12000.0  # N
+
+# pedal position of the interactive loops, the console has no throttle command
+CRUISE_THROTTLE = 0.3
+
+IDLE_RPM = 800.0
+STALL_RPM = 2500.0  # rpm the torque converter lets the engine reach at standstill
+REDLINE_RPM = 6500.0
+
+
+def rpm_bands(rpm: float, max_gear: Gear, ratios: dict = GEAR_RATIOS) -> list:
+    """
+    Wheel side rpm, i.e. engine rpm divided by the gear ratio, at which every forward
+    gear reaches rpm, ascending from first gear so it can be bisected
+
+    :param: rpm : engine rpm, e.g. a shift threshold
+    :param: max_gear : top forward gear
+    :param: ratios : gear ratios
+    """
+    return [rpm / ratios[Gear(_)] for _ in range(Gear.ONE.value, max_gear.value + 1)]
+
+
+def engine_rpm(speed: float, ratio: float, throttle: float, coupled: bool) -> float:
+    """
+    Engine rpm for a vehicle speed, the torque converter keeps it above idle at low speed
+
+    :param: speed : vehicle speed in m/s
+    :param: ratio : ratio of the selected gear, 0 in Neutral
+    :param: throttle : pedal position from 0 to 1
+    :param: coupled : is the engine connected to the wheels i.e. not in Park or Neutral
+
+    :return: engine rpm
+    """
+    if not coupled:
+        # free revving
+        return IDLE_RPM + throttle * (REDLINE_RPM - IDLE_RPM)
+    wheel_rpm = abs(speed * ratio * FINAL_DRIVE * RPM_PER_SPEED)
+    converter_rpm = IDLE_RPM + throttle * (STALL_RPM - IDLE_RPM)
+    return min(max(wheel_rpm, converter_rpm), REDLINE_RPM)
+
+
+def accelerate(speed: float, tractive_force: float, brake: float, dt: float) -> float:
+    """
+    Integrate one timestep of vehicle speed
+
+    Resistances only ever slow the vehicle down towards standstill, never past it
+
+    :param: speed : vehicle speed in m/s
+    :param: tractive_force : force at the wheels from the engine in N
+    :param: brake : brake pedal position from 0 to 1
+    :param: dt : timestep in s
+
+    :return: vehicle speed after the timestep
+    """
+    speed += tractive_force / MASS * dt
+    resistance = (
+        ROLLING_RESISTANCE + AERO_DRAG * speed * speed + brake * MAX_BRAKE_FORCE
+    )
+    slowed = abs(speed) - resistance / MASS * dt
+    if slowed <= 0:
+        return 0.0
+    return math.copysign(slowed, speed)
+
+
+class VehicleModel:
+    """Longitudinal model of one vehicle which sets Engine.rpm every tick"""
+
+    __slots__ = ("speed",)
+
+    def __init__(self, speed: float = 0.0):
+        """
+        :param: speed : initial vehicle speed in m/s, negative when reversing
+        """
+        self.speed = speed
+
+    def step(
+        self, engine, gearbox, throttle: float, dt: float, brake: float = 0.0
+    ) -> None:
+        """
+        Advance the vehicle by one fixed timestep and update the engine rpm
+
+        :param: engine : the Engine object, a stopped engine provides no power
+        :param: gearbox : the Gearbox object, Park locks the wheels and its gear_ratios apply
+        :param: throttle : pedal position from 0 to 1
+        :param: dt : timestep in s
+        :param: brake : brake pedal position from 0 to 1
+        """
+        if gearbox.mode == Mode.PARK:
+            self.speed = 0.0
+        ratio = gearbox.gear_ratios[gearbox.gear]
+        coupled = gearbox.mode != Mode.PARK and ratio != 0.0
+
+        if not engine.running:
+            engine.rpm = 0
+            self.speed = accelerate(self.speed, 0.0, brake, dt)
+            return
+
+        force = 0.0
+        if coupled and engine_rpm(self.speed, ratio, throttle, True) < REDLINE_RPM:
+            # below the rev limiter
+            force = throttle * MAX_TORQUE * ratio * FINAL_DRIVE / WHEEL_RADIUS
+        self.speed = accelerate(self.speed, force, brake, dt)
+        engine.rpm = round(engine_rpm(self.speed, ratio, throttle, coupled))
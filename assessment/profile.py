@@ -0,0 +1,288 @@
+"""
+Transmission profiles loaded from JSON and compiled into cached lookup tables
+
+    {
+        "name": "six-speed",
+        "ratios": [3.5, 2.1, 1.4, 1.0, 0.8, 0.65],
+        "reverse_ratio": -3.2,
+        "downshift_rpm": 1200,
+        "upshift_rpm": 3000,
+        "reverse_from": [0, 1],
+        "neutral_from": [-1, 1],
+        "park_from": [-1, 0, 1],
+        "max_skip": 2
+    }
+
+ratios lists the forward gears from first, the *_from lists hold the plain gear values
+Reverse, Neutral and Park may be selected from. Every key but ratios is optional and
+defaults to the built-in five-speed Gearbox.
+
+Compiled profiles are cached in $ASSESSMENT_CACHE, ~/.cache/assessment by default.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from assessment import physics
+from assessment.gearbox import Gearbox
+from assessment.transitions import (
+    NEUTRAL_FROM,
+    PARK_FROM,
+    REVERSE_FROM,
+    compile_transitions,
+    resolve_transitions,
+)
+from assessment.types import Gear
+
+# profiles shipped with the package, see TransmissionProfile.named
+PROFILE_DIRECTORY = os.path.join(os.path.dirname(__file__), "profiles")
+# cache used when $ASSESSMENT_CACHE is not set, see cache_directory
+CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "assessment")
+# default of the cache arguments, resolved by cache_directory on every call
+_DEFAULT_CACHE = object()
+# part of every cache key, bump it whenever compile_transitions changes its output
+TABLE_VERSION = 2
+
+_gearbox_classes = {}  # digest -> Gearbox subclass
+
+
+def cache_directory() -> str:
+    """
+    :return: directory of compiled profiles, $ASSESSMENT_CACHE as set at the time of
+             the call or CACHE_DIRECTORY
+    """
+    return os.environ.get("ASSESSMENT_CACHE") or CACHE_DIRECTORY
+
+
+class TransmissionProfile:
+    """Gear count, ratios, shift thresholds and selector rules of a transmission"""
+
+    def __init__(
+        self,
+        ratios: list,
+        reverse_ratio: float = physics.GEAR_RATIOS[Gear.REVERSE],
+        downshift_rpm: float = Gearbox.downshift_rpm_threshold,
+        upshift_rpm: float = Gearbox.upshift_rpm_threshold,
+        reverse_from: tuple = REVERSE_FROM,
+        neutral_from: tuple = NEUTRAL_FROM,
+        park_from: tuple = PARK_FROM,
+        max_skip: int = Gearbox.max_skip,
+        name: str = "",
+    ):
+        """
+        :param: ratios : ratio of every forward gear from first, strictly decreasing
+        :param: reverse_ratio : ratio of the reverse gear, negative
+        :param: downshift_rpm : auto_shift downshift threshold
+        :param: upshift_rpm : auto_shift upshift threshold
+        :param: reverse_from : gear values Reverse may be selected from
+        :param: neutral_from : gear values Neutral may be selected from outside Park
+        :param: park_from : gear values Park may be selected from
+        :param: max_skip : most gears auto_shift may jump in a single shift
+        :param: name : label of the profile, not part of its digest
+        """
+        top = max(_.value for _ in Gear)
+        if not 1 <= len(ratios) <= top:
+            raise ValueError(f"a transmission needs 1 to {top} forward gears")
+        if any(_ <= 0 for _ in ratios) or any(
+            low <= high for low, high in zip(ratios, ratios[1:])
+        ):
+            raise ValueError("forward ratios must be positive and strictly decreasing")
+        if reverse_ratio >= 0:
+            raise ValueError("the reverse ratio must be negative")
+        if not 0 < downshift_rpm < upshift_rpm:
+            raise ValueError("the downshift threshold must be below the upshift one")
+        if max_skip < 1:
+            raise ValueError("max_skip must be at least 1")
+        gears = range(Gear.REVERSE.value, len(ratios) + 1)
+        for selector in (reverse_from, neutral_from, park_from):
+            if any(_ not in gears for _ in selector):
+                raise ValueError(f"unknown gear in {list(selector)}")
+
+        self.name = name
+        self.ratios = [float(_) for _ in ratios]
+        self.reverse_ratio = float(reverse_ratio)
+        self.downshift_rpm = downshift_rpm
+        self.upshift_rpm = upshift_rpm
+        self.reverse_from = tuple(sorted(set(reverse_from)))
+        self.neutral_from = tuple(sorted(set(neutral_from)))
+        self.park_from = tuple(sorted(set(park_from)))
+        self.max_skip = max_skip
+
+    def __repr__(self) -> str:
+        return (
+            f"TransmissionProfile({self.name or self.digest[:12]}, {self.gears} gears)"
+        )
+
+    @classmethod
+    def default(cls) -> "TransmissionProfile":
+        """
+        :return: the built-in five-speed transmission of Gearbox
+        """
+        return cls(
+            [
+                physics.GEAR_RATIOS[Gear(_)]
+                for _ in range(Gear.ONE.value, Gearbox.max_gear.value + 1)
+            ],
+            name="default",
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TransmissionProfile":
+        """
+        :param: data : profile as loaded from JSON, see the module docstring
+        """
+        unknown = set(data) - set(cls.default().to_dict())
+        if unknown:
+            raise ValueError(f"unknown profile keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: str) -> "TransmissionProfile":
+        """
+        :param: path : JSON profile, named after the file unless it has a name
+        """
+        with open(path) as f:
+            data = json.load(f)
+        data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        return cls.from_dict(data)
+
+    @classmethod
+    def named(cls, name: str) -> "TransmissionProfile":
+        """
+        :param: name : a profile shipped in PROFILE_DIRECTORY, or the path of one
+        """
+        path = os.path.join(PROFILE_DIRECTORY, f"{name}.json")
+        return cls.load(path if os.path.exists(path) else name)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "ratios": self.ratios,
+            "reverse_ratio": self.reverse_ratio,
+            "downshift_rpm": self.downshift_rpm,
+            "upshift_rpm": self.upshift_rpm,
+            "reverse_from": list(self.reverse_from),
+            "neutral_from": list(self.neutral_from),
+            "park_from": list(self.park_from),
+            "max_skip": self.max_skip,
+        }
+
+    @property
+    def gears(self) -> int:
+        """Number of forward gears"""
+        return len(self.ratios)
+
+    @property
+    def max_gear(self) -> Gear:
+        return Gear(self.gears)
+
+    @property
+    def gear_ratios(self) -> dict:
+        """
+        :return: Gear -> ratio, in the form of physics.GEAR_RATIOS
+        """
+        ratios = {Gear.REVERSE: self.reverse_ratio, Gear.NEUTRAL: 0.0}
+        ratios.update({Gear(gear): _ for gear, _ in enumerate(self.ratios, 1)})
+        return ratios
+
+    @property
+    def digest(self) -> str:
+        """Hash of everything the compiled tables depend on, the cache key"""
+        data = self.to_dict()
+        del data["name"]
+        data["table_version"] = TABLE_VERSION
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def compile(self, cache: Optional[str] = _DEFAULT_CACHE) -> dict:
+        """
+        Compile the transition table and auto_shift bands, or load them from cache
+
+        :param: cache : directory of compiled profiles, None to always compile,
+                        cache_directory() by default
+
+        :return: transitions as compile_transitions returns them plus upshift_bands and
+                 downshift_bands as physics.rpm_bands returns them
+        """
+        if cache is _DEFAULT_CACHE:
+            cache = cache_directory()
+        path = None
+        if cache is not None:
+            path = os.path.join(cache, f"{self.digest}.npz")
+            try:
+                with np.load(path) as tables:
+                    return {
+                        "transitions": [
+                            tuple(_) for _ in tables["transitions"].tolist()
+                        ],
+                        "upshift_bands": tables["upshift_bands"].tolist(),
+                        "downshift_bands": tables["downshift_bands"].tolist(),
+                    }
+            except (OSError, KeyError, ValueError):
+                # missing or unreadable, compile it again
+                pass
+
+        tables = {
+            "transitions": compile_transitions(
+                self.gears, self.reverse_from, self.neutral_from, self.park_from
+            ),
+            "upshift_bands": physics.rpm_bands(
+                self.upshift_rpm, self.max_gear, self.gear_ratios
+            ),
+            "downshift_bands": physics.rpm_bands(
+                self.downshift_rpm, self.max_gear, self.gear_ratios
+            ),
+        }
+        if path is not None:
+            os.makedirs(cache, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.partial"
+            with open(partial, "wb") as f:
+                np.savez(
+                    f,
+                    transitions=np.array(tables["transitions"], dtype=np.int8),
+                    upshift_bands=np.array(tables["upshift_bands"]),
+                    downshift_bands=np.array(tables["downshift_bands"]),
+                )
+            os.replace(partial, path)
+        return tables
+
+    def gearbox_class(self, cache: Optional[str] = _DEFAULT_CACHE) -> type:
+        """
+        Gearbox subclass running this transmission, built once per process and profile
+
+        :param: cache : directory of compiled profiles, see compile
+        """
+        digest = self.digest
+        gearbox_class = _gearbox_classes.get(digest)
+        if gearbox_class is None:
+            tables = self.compile(cache)
+            gear_ratios = self.gear_ratios
+            gearbox_class = _gearbox_classes[digest] = type(
+                f"Gearbox[{self.name or digest[:12]}]",
+                (Gearbox,),
+                {
+                    "__slots__": (),
+                    "profile": self,
+                    "downshift_rpm_threshold": self.downshift_rpm,
+                    "upshift_rpm_threshold": self.upshift_rpm,
+                    "max_gear": self.max_gear,
+                    "max_skip": self.max_skip,
+                    "gear_ratios": gear_ratios,
+                    "_ratios": {gear.value: _ for gear, _ in gear_ratios.items()},
+                    "_top_gear": self.gears,
+                    "upshift_bands": tables["upshift_bands"],
+                    "downshift_bands": tables["downshift_bands"],
+                    "transitions": resolve_transitions(tables["transitions"]),
+                },
+            )
+        return gearbox_class
+
+    def gearbox(self, **kwargs) -> Gearbox:
+        """
+        :param: kwargs : passed on to Gearbox
+        :return: a new Gearbox running this transmission
+        """
+        return self.gearbox_class()(**kwargs)
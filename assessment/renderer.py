@@ -0,0 +1,80 @@
+"""Terminal renderer which redraws the status line only when the vehicle state changes"""
+
+import sys
+from typing import Optional, TextIO
+
+from assessment.helper import CLEAR_SCREEN
+from assessment.types import Event
+
+# what the status line depends on, Gearbox events first then Engine ones
+GEARBOX_EVENTS = (Event.MODE_CHANGED, Event.GEAR_CHANGED)
+ENGINE_EVENTS = (Event.ENGINE_STARTED, Event.ENGINE_STOPPED)
+
+
+class Renderer:
+    """Draws the engine status with ANSI escape sequences"""
+
+    def __init__(self, stream: Optional[TextIO] = None, footer: str = ""):
+        """
+        :param: stream : where to draw, defaults to stdout
+        :param: footer : text drawn below the status line
+        """
+        self.stream = stream
+        self.footer = footer
+        self._state = None
+        self._status_lines = {}  # status line cache keyed on vehicle state
+        self._watching = False
+        self._changed = True  # an event arrived since the last render
+
+    def invalidate(self, *_) -> None:
+        """Force a redraw on the next render, also the listener of watch"""
+        self._state = None
+        self._changed = True
+
+    def watch(self, engine, gearbox) -> None:
+        """
+        Subscribe to the state change events of a vehicle, render then returns straight
+        away until one of them fires instead of comparing the state every time
+
+        State set directly rather than through Engine and Gearbox methods is missed
+        """
+        for event in GEARBOX_EVENTS:
+            gearbox.subscribe(event, self.invalidate)
+        for event in ENGINE_EVENTS:
+            engine.subscribe(event, self.invalidate)
+        self._watching = True
+        self.invalidate()
+
+    def unwatch(self, engine, gearbox) -> None:
+        """Undo watch, render compares the state again"""
+        for event in GEARBOX_EVENTS:
+            gearbox.unsubscribe(event, self.invalidate)
+        for event in ENGINE_EVENTS:
+            engine.unsubscribe(event, self.invalidate)
+        self._watching = False
+
+    def render(self, engine, gearbox) -> bool:
+        """
+        Redraw the screen if the engine or gearbox changed since the last render
+
+        :param: engine : the Engine object
+        :param: gearbox : the Gearbox object
+
+        :return: True if the screen was redrawn else False
+        """
+        if self._watching and not self._changed:
+            return False
+        self._changed = False
+        state = (engine.running, gearbox.mode, gearbox.gear)
+        if state == self._state:
+            return False
+        self._state = state
+
+        status_line = self._status_lines.get(state)
+        if status_line is None:
+            status_line = self._status_lines[state] = engine.status(gearbox)
+
+        stream = self.stream or sys.stdout
+        stream.write(f"{CLEAR_SCREEN}\n{status_line}\n\n{self.footer}")
+        stream.flush()
+        return True
@@ -0,0 +1,182 @@
+"""
+Asyncio engine loop which ticks at a fixed rate independently of user input
+
+python -m assessment.scheduler --rate 50
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Callable, Optional
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.physics import CRUISE_THROTTLE, VehicleModel
+from assessment.renderer import Renderer
+
+
+class TickScheduler:
+    """Fixed-rate tick scheduler which measures how late every tick fires"""
+
+    def __init__(self, rate: float):
+        """
+        :param: rate : ticks per second
+        """
+        self.period = 1.0 / rate
+        self.ticks = 0
+        self.max_jitter = 0.0
+        self._jitter_sum = 0.0
+
+    def jitter(self) -> dict:
+        """
+        :return: tick count plus mean and max lateness of the ticks in seconds
+        """
+        return {
+            "ticks": self.ticks,
+            "mean": self._jitter_sum / self.ticks if self.ticks else 0.0,
+            "max": self.max_jitter,
+        }
+
+    async def run(self, callback: Callable[[], None], ticks: Optional[int] = None):
+        """
+        Call callback once per period until cancelled or ticks have elapsed
+
+        Deadlines are fixed multiples of the period from the start so a late tick
+        never shifts the ones after it, a tick running behind catches up back-to-back.
+
+        :param: callback : work done every tick, must not block
+        :param: ticks : stop after this many ticks, run forever by default
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while ticks is None or self.ticks < ticks:
+            deadline = start + (self.ticks + 1) * self.period
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)  # let queued commands through while catching up
+
+            lateness = max(loop.time() - deadline, 0.0)
+            self._jitter_sum += lateness
+            if lateness > self.max_jitter:
+                self.max_jitter = lateness
+
+            callback()
+            self.ticks += 1
+
+
+async def read_stdin(commands: asyncio.Queue) -> None:  # pragma: no cover
+    """
+    Feed stdin lines into the command queue without blocking the event loop, None marks EOF
+
+    :param: commands : queue consumed by run_async
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+    except ValueError:
+        # a regular file redirected to stdin cannot be polled but never blocks either
+        for line in sys.stdin:
+            await commands.put(line)
+        await commands.put(None)
+        return
+
+    while line := await reader.readline():
+        await commands.put(line.decode())
+    await commands.put(None)
+
+
+async def run_async(
+    engine: Engine,
+    gearbox: Gearbox,
+    commands: asyncio.Queue,
+    rate: float = 50.0,
+    renderer: Optional[Renderer] = None,
+    model: Optional[VehicleModel] = None,
+    throttle: float = CRUISE_THROTTLE,
+) -> TickScheduler:
+    """
+    Tick the engine at a fixed rate while commands are dispatched as they arrive
+
+    With a vehicle model every tick advances it by one period, which sets the rpm the
+    gearbox auto shifts on, like assessment.simulation does
+
+    :param: engine : the Engine object
+    :param: gearbox : the Gearbox object
+    :param: commands : queue of command lines, None or a successful exit stops the loop
+    :param: rate : engine ticks per second
+    :param: renderer : optionally redraw the status on the tick after it changes
+    :param: model : optionally the VehicleModel of the vehicle, the rpm is left to the
+                    engine otherwise
+    :param: throttle : pedal position from 0 to 1 held throughout, used with a model
+
+    :return: the scheduler which ran the ticks, holding its jitter measurements
+    """
+    scheduler = TickScheduler(rate)
+
+    def tick():
+        if model is None:
+            engine.tick(gearbox)
+        else:
+            engine.tick(gearbox, throttle, model.speed)
+            model.step(engine, gearbox, throttle, scheduler.period)
+        if renderer is not None:
+            renderer.render(engine, gearbox)
+
+    if renderer is not None:
+        renderer.watch(engine, gearbox)
+    ticker = asyncio.create_task(scheduler.run(tick))
+    try:
+        while (command := await commands.get()) is not None:
+            # one tick between two commands of a line, as if typed a tick apart
+            received_exit_command = Console.run_line(
+                command.strip().lower(),
+                engine=engine,
+                gearbox=gearbox,
+                tick=tick,
+                interactive=renderer is not None,
+            )
+            if received_exit_command:
+                break
+    finally:
+        ticker.cancel()
+        try:
+            await ticker
+        except asyncio.CancelledError:
+            pass
+        if renderer is not None:
+            renderer.unwatch(engine, gearbox)
+    return scheduler
+
+
+async def _main(rate: float) -> None:  # pragma: no cover
+    commands = asyncio.Queue()
+    reader = asyncio.create_task(read_stdin(commands))
+    renderer = Renderer(footer=f"Commands: {Console.AVAILABLE_COMMANDS_LINE}\n")
+    scheduler = await run_async(
+        Engine(),
+        Gearbox(),
+        commands,
+        rate=rate,
+        renderer=renderer,
+        model=VehicleModel(),
+    )
+    reader.cancel()
+    print(scheduler.jitter())
+
+
+def main(argv: Optional[list] = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m assessment.scheduler", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("--rate", type=float, default=50.0, help="ticks per second")
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args.rate))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,165 @@
+"""
+Line based socket server where every connection drives its own vehicle
+
+python -m assessment.server --port 8765
+python -m assessment.server --unix /tmp/gearbox.sock
+
+Every command line sent gets a response of the messages the handlers printed, each
+prefixed with MESSAGE_PREFIX, closed by the vehicle status prefixed with STATUS_PREFIX.
+A successful exit adds GOODBYE right before the status and closes the connection.
+A line which fails gets an ERROR message instead of its handler messages, a line longer
+than MAX_LINE bytes is answered with one and closes the connection.
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import RingSink, output_to
+
+MESSAGE_PREFIX = "! "
+STATUS_PREFIX = "= "
+GOODBYE = "bye"
+ERROR = "error"
+# command lines are short, this bounds the commands a single line can expand to
+MAX_LINE = 1024
+
+
+def execute(line: str, engine: Engine, gearbox: Gearbox) -> tuple:
+    """
+    Run a command line against a vehicle like an iteration of Engine.run
+
+    :param: line : command line, see Console.parse
+    :param: engine : the Engine object
+    :param: gearbox : the Gearbox object
+
+    :return: (True if the vehicle was exited, response lines)
+    """
+    engine.tick(gearbox)
+    # handlers run to completion without yielding so no other session prints meanwhile,
+    # the sink keeps every message, MAX_LINE bounds how many a line can print
+    with output_to(RingSink(capacity=None)) as output:
+        try:
+            received_exit_command = Console.run_line(
+                line.strip().lower(), engine=engine, gearbox=gearbox, interactive=False
+            )
+            response = [MESSAGE_PREFIX + _ for _ in output.messages()]
+        except Exception as e:
+            received_exit_command = False
+            response = [f"{MESSAGE_PREFIX}{ERROR}: {type(e).__name__}"]
+    if received_exit_command:
+        response.append(GOODBYE)
+    response.append(STATUS_PREFIX + engine.status(gearbox))
+    return received_exit_command, response
+
+
+class GearboxServer:
+    """Hosts one Engine and Gearbox per connection"""
+
+    def __init__(self):
+        self.sessions = 0  # currently connected
+        self.commands = 0  # lines handled since start
+        self._server = None
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None
+    ) -> "GearboxServer":
+        """
+        :param: host : TCP interface to listen on
+        :param: port : TCP port, 0 picks a free one, see address
+        :param: path : Unix socket path to listen on instead of TCP
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self.handle, path, limit=MAX_LINE
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle, host, port, limit=MAX_LINE
+            )
+        return self
+
+    @property
+    def address(self):
+        """(host, port) or the Unix socket path the server listens on"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:  # pragma: no cover
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "GearboxServer":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve a single connection until it exits the vehicle or hangs up"""
+        engine, gearbox = Engine(), Gearbox()
+        self.sessions += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # over MAX_LINE, what is left of the line cannot be told apart
+                    # from the next one
+                    response = [
+                        f"{MESSAGE_PREFIX}{ERROR}: line longer than {MAX_LINE} bytes",
+                        STATUS_PREFIX + engine.status(gearbox),
+                    ]
+                    writer.write(("\n".join(response) + "\n").encode())
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                self.commands += 1
+                exited, response = execute(
+                    line.decode(errors="replace"), engine, gearbox
+                )
+                writer.write(("\n".join(response) + "\n").encode())
+                await writer.drain()
+                if exited:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def _main(host: str, port: int, path: Optional[str]) -> None:  # pragma: no cover
+    server = await GearboxServer().start(host, port, path)
+    print(f"listening on {server.address}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[list] = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog="python -m assessment.server", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,149 @@
+"""Two-dimensional shift maps indexed by throttle and vehicle speed"""
+
+import numpy as np
+
+from assessment import physics
+from assessment.gearbox import Gearbox
+from assessment.types import Gear
+
+# (throttle, engine rpm) breakpoints, light throttle shifts early and a floored pedal
+# holds gears to high rpm and kicks down early, half throttle matches the Gearbox thresholds
+UPSHIFT_RPM = ((0.0, 1800.0), (0.5, Gearbox.upshift_rpm_threshold), (1.0, 5500.0))
+DOWNSHIFT_RPM = ((0.0, 1000.0), (0.5, Gearbox.downshift_rpm_threshold), (1.0, 2500.0))
+
+
+class ShiftMap:
+    """
+    Per-gear shift schedules precomputed into dense (throttle, speed) lookup grids
+
+    Every cell holds the lowest and the highest forward gear allowed at that throttle
+    and speed, a shift is just clamping the current gear into that range
+    """
+
+    def __init__(
+        self,
+        upshift: list,
+        downshift: list,
+        max_speed: float = 80.0,
+        throttle_steps: int = 101,
+        speed_steps: int = 801,
+    ):
+        """
+        :param: upshift : for every forward gear but the top one, the (throttle, speed)
+                          breakpoints of the line above which it shifts up
+        :param: downshift : for every forward gear but the top one, the (throttle, speed)
+                            breakpoints of the line below which the next gear shifts down into it
+        :param: max_speed : speed in m/s covered by the grids, faster is clamped to it
+        :param: throttle_steps : grid resolution along throttle, from 0 to 1
+        :param: speed_steps : grid resolution along speed, from 0 to max_speed
+        """
+        if len(upshift) != len(downshift):
+            raise ValueError("upshift and downshift need one schedule per gear")
+        self.max_gear = len(upshift) + 1
+        self.max_speed = max_speed
+        self.throttle = np.linspace(0.0, 1.0, throttle_steps)
+        self.speed = np.linspace(0.0, max_speed, speed_steps)
+
+        up = self._interpolate(upshift)
+        down = self._interpolate(downshift)
+        if (down >= up).any():
+            raise ValueError("downshift lines must stay below the upshift lines")
+
+        speed = self.speed[None, None, :]
+        # lowest gear allowed, one more for every upshift line crossed
+        self.min_gear = (1 + (speed >= up[:, :, None]).sum(axis=0)).astype(np.int8)
+        # highest gear allowed, one more for every downshift line crossed
+        self.top_gear = (1 + (speed > down[:, :, None]).sum(axis=0)).astype(np.int8)
+
+        # plain lists index faster than NumPy arrays from scalar code
+        self._min_gear = self.min_gear.tolist()
+        self._top_gear = self.top_gear.tolist()
+        self._throttle_scale = throttle_steps - 1
+        self._speed_scale = (speed_steps - 1) / max_speed
+        self._speed_limit = speed_steps - 1
+
+    def _interpolate(self, schedules: list) -> np.ndarray:
+        """
+        :return: (gears, throttle_steps) speeds of every schedule along the throttle axis
+        """
+        return np.array(
+            [
+                np.interp(self.throttle, *zip(*sorted(breakpoints)))
+                for breakpoints in schedules
+            ]
+        )
+
+    @classmethod
+    def from_rpm(
+        cls,
+        upshift_rpm=UPSHIFT_RPM,
+        downshift_rpm=DOWNSHIFT_RPM,
+        ratios: dict = physics.GEAR_RATIOS,
+        max_gear: Gear = Gearbox.max_gear,
+        **kwargs,
+    ) -> "ShiftMap":
+        """
+        Derive the speed schedules of every gear from throttle dependent rpm thresholds
+
+        :param: upshift_rpm : (throttle, rpm) breakpoints at which to shift up
+        :param: downshift_rpm : (throttle, rpm) breakpoints at which to shift down
+        :param: ratios : gear ratios, see assessment.physics
+        :param: max_gear : top forward gear
+        :param: kwargs : grid options passed on to ShiftMap
+        """
+        speed_per_rpm = {
+            gear: 1 / (ratio * physics.FINAL_DRIVE * physics.RPM_PER_SPEED)
+            for gear, ratio in ratios.items()
+            if gear.value >= Gear.ONE.value
+        }
+        gears = [Gear(_) for _ in range(Gear.ONE.value, max_gear.value)]
+        upshift = [
+            [(t, rpm * speed_per_rpm[gear]) for t, rpm in upshift_rpm] for gear in gears
+        ]
+        downshift = [
+            [(t, rpm * speed_per_rpm[Gear(gear.value + 1)]) for t, rpm in downshift_rpm]
+            for gear in gears
+        ]
+        return cls(upshift, downshift, **kwargs)
+
+    def cell(self, throttle: float, speed: float) -> tuple:
+        """
+        :return: (throttle index, speed index) of the grid cell nearest to throttle and
+                 speed, throttle is clipped to [0, 1]
+        """
+        throttle = 0.0 if throttle < 0.0 else 1.0 if throttle > 1.0 else throttle
+        speed_index = round(abs(speed) * self._speed_scale)
+        return round(throttle * self._throttle_scale), min(
+            speed_index, self._speed_limit
+        )
+
+    def target_gear(self, gear: int, throttle: float, speed: float) -> int:
+        """
+        :param: gear : current forward gear value
+        :param: throttle : pedal position from 0 to 1
+        :param: speed : vehicle speed in m/s
+        :return: forward gear value the schedule wants to be in
+        """
+        t, s = self.cell(throttle, speed)
+        low = self._min_gear[t][s]
+        if gear < low:
+            return low
+        high = self._top_gear[t][s]
+        if gear > high:
+            return high
+        return gear
+
+    def target_gears(self, gear: np.ndarray, throttle, speed: np.ndarray) -> np.ndarray:
+        """
+        Vectorized target_gear for a whole fleet
+
+        :param: gear : current forward gear values
+        :param: throttle : pedal positions, scalar or one per vehicle, clipped to [0, 1]
+        :param: speed : vehicle speeds in m/s
+        """
+        t = np.rint(np.clip(throttle, 0.0, 1.0) * self._throttle_scale).astype(np.intp)
+        s = np.minimum(
+            np.rint(np.abs(speed) * self._speed_scale).astype(np.intp),
+            self._speed_limit,
+        )
+        return np.clip(gear, self.min_gear[t, s], self.top_gear[t, s]).astype(np.int8)
@@ -0,0 +1,420 @@
+"""
+Monte Carlo simulation of randomly driven vehicles sharded across worker processes
+
+python -m assessment.simulation --vehicles 10000 --seed 42
+python -m assessment.simulation --vehicles 100 --steps 5000 --workers 1
+python -m assessment.simulation --vehicles 100 --trace runs/trace
+python -m assessment.simulation --vehicles 100000 --checkpoint runs/fleet.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+import numpy as np
+
+from assessment import Console, Gearbox
+from assessment.checkpoint import load_progress, save_progress
+from assessment.engine import Engine
+from assessment.helper import MESSAGE_TEXTS, N_PRINT, output_to
+from assessment.physics import VehicleModel
+from assessment.trace import TRACE_FORMATS, TraceWriter
+from assessment.types import Mode, Action, Gear
+
+# every command a simulated driver may issue, exit would end the session early
+DRIVER_COMMANDS = [_ for _ in Console.AVAILABLE_COMMANDS if _ != "exit"]
+# no command is issued on a tick with this code
+NO_COMMAND = -1
+
+
+class SimulationStats:
+    """
+    Statistics of one or more simulated vehicles which can be merged across shards
+
+    Time is counted in whole ticks so merging is exact and independent of the order
+
+    It is also an output sink, see helper.set_sink, every warning printed while it is
+    active is a refusal of the gearbox or of a Console handler and counts as a rejection
+    """
+
+    def __init__(self, dt: float = 0.1):
+        """
+        :param: dt : timestep in s of the simulation the ticks were counted in
+        """
+        self.dt = dt
+        self.vehicles = 0
+        self.ticks = 0
+        self.commands = 0
+        self.shifts = Counter()  # Action -> accepted shifts which changed the state
+        self.rejections = Counter()  # rejection message -> count, see emit
+        self.state_ticks = Counter()  # (Mode, Gear) -> ticks spent in it
+
+    def shift(
+        self, gearbox, action: Action, mode: Mode, gear: Gear, message: str
+    ) -> None:
+        """
+        Called by Gearbox.shift with the outcome of every request, see Gearbox.metrics
+
+        A rejection is counted by emit once the gearbox prints its message
+        """
+        if message is None and (mode is not gearbox.mode or gear is not gearbox.gear):
+            self.shifts[action] += 1
+
+    def emit(self, code: int, layout: int) -> None:
+        """Output sink method, counts every warning as a rejection"""
+        if layout == N_PRINT:
+            self.rejections[MESSAGE_TEXTS[code]] += 1
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        """Add the statistics of other into this one"""
+        self.vehicles += other.vehicles
+        self.ticks += other.ticks
+        self.commands += other.commands
+        self.shifts.update(other.shifts)
+        self.rejections.update(other.rejections)
+        self.state_ticks.update(other.state_ticks)
+        return self
+
+    def to_state(self) -> dict:
+        """
+        :return: JSON serializable state, from_state turns it back into equal statistics
+        """
+        return {
+            "dt": self.dt,
+            "vehicles": self.vehicles,
+            "ticks": self.ticks,
+            "commands": self.commands,
+            "shifts": {_.name: count for _, count in self.shifts.items()},
+            "rejections": dict(self.rejections),
+            "state_ticks": [
+                [mode.name, gear.name, count]
+                for (mode, gear), count in self.state_ticks.items()
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SimulationStats":
+        """
+        :param: state : returned by to_state
+        :return: the statistics
+        """
+        stats = cls(state["dt"])
+        stats.vehicles = state["vehicles"]
+        stats.ticks = state["ticks"]
+        stats.commands = state["commands"]
+        stats.shifts.update({Action[_]: count for _, count in state["shifts"].items()})
+        stats.rejections.update(state["rejections"])
+        stats.state_ticks.update(
+            {
+                (Mode[mode], Gear[gear]): count
+                for mode, gear, count in state["state_ticks"]
+            }
+        )
+        return stats
+
+    def time_in_mode(self) -> dict:
+        """
+        :return: Mode -> seconds spent in it by all vehicles
+        """
+        ticks = Counter()
+        for (mode, _), count in self.state_ticks.items():
+            ticks[mode] += count
+        return {mode: count * self.dt for mode, count in ticks.items()}
+
+    def time_in_gear(self) -> dict:
+        """
+        :return: Gear -> seconds spent in it by all vehicles
+        """
+        ticks = Counter()
+        for (_, gear), count in self.state_ticks.items():
+            ticks[gear] += count
+        return {gear: count * self.dt for gear, count in ticks.items()}
+
+    def to_dict(self) -> dict:
+        """
+        :return: JSON serializable summary, enum members are replaced by their names
+        """
+        return {
+            "vehicles": self.vehicles,
+            "ticks": self.ticks,
+            "commands": self.commands,
+            "shifts": {
+                _.name: count for _, count in sorted(self.shifts.items(), key=_by_value)
+            },
+            "rejections": dict(sorted(self.rejections.items())),
+            "time_in_mode": {
+                _.name: seconds
+                for _, seconds in sorted(self.time_in_mode().items(), key=_by_value)
+            },
+            "time_in_gear": {
+                _.name: seconds
+                for _, seconds in sorted(self.time_in_gear().items(), key=_by_value)
+            },
+        }
+
+
+def _by_value(item: tuple):
+    return item[0].value
+
+
+def driver_profile(
+    seed: int, vehicle_id: int, steps: int, command_rate: float = 0.05
+) -> tuple:
+    """
+    Random command sequence and pedal profile of one vehicle
+
+    Every vehicle draws from its own stream spawned off seed, so a vehicle drives the
+    same way no matter which shard or worker process simulates it
+
+    :param: seed : seed of the whole simulation
+    :param: vehicle_id : position of the vehicle in the fleet
+    :param: steps : number of ticks
+    :param: command_rate : probability of a command on every tick
+
+    :return: (commands, throttle, brake) lists with one entry per tick, commands hold
+             positions in DRIVER_COMMANDS or NO_COMMAND
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(vehicle_id,)))
+    commands = np.where(
+        rng.random(steps) < command_rate,
+        rng.integers(len(DRIVER_COMMANDS), size=steps),
+        NO_COMMAND,
+    )
+    # the pedal is held at a random position and moved now and then
+    moved = rng.random(steps) < 0.02
+    throttle = rng.random(int(moved.sum()) + 1)[np.cumsum(moved)]
+    # lifting off the throttle brakes
+    brake = np.where(throttle < 0.1, 0.5, 0.0)
+    return commands.tolist(), throttle.tolist(), brake.tolist()
+
+
+def simulate_vehicle(
+    seed: int,
+    vehicle_id: int,
+    steps: int,
+    dt: float = 0.1,
+    command_rate: float = 0.05,
+    stats: Optional[SimulationStats] = None,
+    trace: Optional[TraceWriter] = None,
+) -> SimulationStats:
+    """
+    Drive one vehicle from parked with the engine at rest through a random profile
+
+    Every tick auto shifts like Engine.run, dispatches the driver's command if any and
+    advances the VehicleModel which sets the rpm for the next tick. Messages go to stats
+    rather than being printed, so refusals of the Console handlers are counted too.
+
+    :param: seed : seed of the whole simulation
+    :param: vehicle_id : position of the vehicle in the fleet
+    :param: steps : number of ticks
+    :param: dt : timestep in s
+    :param: command_rate : probability of a command on every tick
+    :param: stats : statistics to add to, fresh ones by default
+    :param: trace : receives the state of the vehicle at the end of every tick
+
+    :return: stats
+    """
+    stats = stats if stats is not None else SimulationStats(dt)
+    commands, throttle, brake = driver_profile(seed, vehicle_id, steps, command_rate)
+    engine, gearbox, model = Engine(), Gearbox(), VehicleModel()
+    gearbox.metrics = stats
+    state_ticks = stats.state_ticks
+    dispatch = Console.dispatch
+
+    with output_to(stats):
+        for tick in range(steps):
+            engine.tick(gearbox, throttle[tick], model.speed)
+            command = commands[tick]
+            if command != NO_COMMAND:
+                dispatch(
+                    DRIVER_COMMANDS[command],
+                    engine=engine,
+                    gearbox=gearbox,
+                    interactive=False,
+                )
+            model.step(engine, gearbox, throttle[tick], dt, brake[tick])
+            state_ticks[gearbox.mode, gearbox.gear] += 1
+            if trace is not None:
+                trace.record_vehicle(tick, vehicle_id, engine, gearbox)
+
+    stats.vehicles += 1
+    stats.ticks += steps
+    stats.commands += steps - commands.count(NO_COMMAND)
+    return stats
+
+
+def _simulate_shard(
+    seed: int,
+    start: int,
+    stop: int,
+    steps: int,
+    dt: float,
+    command_rate: float,
+    trace: Optional[str] = None,
+    trace_format: str = "npz",
+) -> SimulationStats:
+    """
+    Simulate vehicles start to stop in a worker process, messages are only counted
+
+    Every shard writes its own part of the trace, numbered after its first vehicle
+    """
+    stats = SimulationStats(dt)
+    writer = None
+    if trace is not None:
+        writer = TraceWriter(trace, format=trace_format, part=start)
+    try:
+        for vehicle_id in range(start, stop):
+            simulate_vehicle(seed, vehicle_id, steps, dt, command_rate, stats, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    return stats
+
+
+def simulate_fleet(
+    vehicles: int,
+    steps: int = 1000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    dt: float = 0.1,
+    command_rate: float = 0.05,
+    shard_size: Optional[int] = None,
+    trace: Optional[str] = None,
+    trace_format: str = "npz",
+    checkpoint: Optional[str] = None,
+) -> SimulationStats:
+    """
+    Simulate independent randomly driven vehicles across a pool of worker processes
+
+    Results depend on seed only, not on the number of workers or the shard size
+
+    With a checkpoint the shards done so far and their merged statistics are saved
+    after every shard. Run again with the same arguments to resume, the shards found
+    in it are skipped. Every vehicle's SeedSequence stream is spawned off seed and its
+    id, so the seed saved with the run is all it takes to replay the remaining ones.
+
+    :param: vehicles : number of vehicles, each gets its own Engine and Gearbox
+    :param: steps : ticks simulated per vehicle
+    :param: seed : seed of the random driver profiles
+    :param: workers : worker processes, one per CPU by default, 1 runs in this process
+    :param: dt : timestep in s
+    :param: command_rate : probability of a driver command on every tick
+    :param: shard_size : vehicles simulated per task, by default four tasks per worker
+    :param: trace : directory to stream the state of every vehicle at every tick to,
+                    see assessment.trace
+    :param: trace_format : one of TRACE_FORMATS
+    :param: checkpoint : progress file to resume from and save to, see save_progress,
+                         ValueError if it was saved by a run with other arguments
+
+    :return: statistics merged over every vehicle
+    """
+    workers = workers or os.cpu_count() or 1
+    progress = load_progress(checkpoint) if checkpoint is not None else None
+    if progress is not None and shard_size is None:
+        # the default depends on the number of workers, which may differ on resume
+        shard_size = progress["run"]["shard_size"]
+    shard_size = shard_size or max(1, -(-vehicles // (workers * 4)))
+    run = {
+        "vehicles": vehicles,
+        "steps": steps,
+        "seed": seed,
+        "dt": dt,
+        "command_rate": command_rate,
+        "shard_size": shard_size,
+    }
+    stats = SimulationStats(dt)
+    done = set()  # first vehicle of every shard done
+    if progress is not None:
+        if progress["run"] != run:
+            raise ValueError(f"{checkpoint} was saved by a run with other arguments")
+        stats = SimulationStats.from_state(progress["stats"])
+        done.update(progress["done"])
+
+    shards = [
+        (
+            seed,
+            start,
+            min(start + shard_size, vehicles),
+            steps,
+            dt,
+            command_rate,
+            trace,
+            trace_format,
+        )
+        for start in range(0, vehicles, shard_size)
+        if start not in done
+    ]
+
+    if workers == 1:
+        for shard in shards:
+            stats.merge(_simulate_shard(*shard))
+            if checkpoint is not None:
+                done.add(shard[1])
+                _save_run(checkpoint, run, done, stats)
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # shards are saved as they finish, merging does not depend on the order
+        futures = {pool.submit(_simulate_shard, *shard): shard[1] for shard in shards}
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if checkpoint is not None:
+                done.add(futures[future])
+                _save_run(checkpoint, run, done, stats)
+    return stats
+
+
+def _save_run(path: str, run: dict, done: set, stats: SimulationStats) -> None:
+    save_progress(path, {"run": run, "done": sorted(done), "stats": stats.to_state()})
+
+
+def main(
+    argv: Optional[list] = None, prog: str = "python -m assessment.simulation"
+) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.split("\n")[1])
+    parser.add_argument("--vehicles", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=1000, help="ticks per vehicle")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, help="worker processes, one per CPU by default"
+    )
+    parser.add_argument("--dt", type=float, default=0.1, help="timestep in s")
+    parser.add_argument(
+        "--command-rate",
+        type=float,
+        default=0.05,
+        help="probability of a driver command on every tick",
+    )
+    parser.add_argument("--trace", help="directory to write per-tick state traces to")
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="npz",
+        help="trace chunk format",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="file to save progress to after every shard and to resume from",
+    )
+    args = parser.parse_args(argv)
+
+    stats = simulate_fleet(
+        args.vehicles,
+        steps=args.steps,
+        seed=args.seed,
+        workers=args.workers,
+        dt=args.dt,
+        command_rate=args.command_rate,
+        trace=args.trace,
+        trace_format=args.trace_format,
+        checkpoint=args.checkpoint,
+    )
+    json.dump(stats.to_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
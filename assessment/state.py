@@ -0,0 +1,226 @@
+"""
+Vehicle state packed into a single 32 bit integer
+
+    bit  28     engine running
+    bit  27     parking pawl engaged
+    bits 24-26  mode value + 1
+    bits 16-23  gear value + 1
+    bits 0-15   engine rpm
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.gearbox import Gearbox
+from assessment.types import Mode, Gear
+
+RPM_BITS = 16
+GEAR_BITS = 8
+MODE_BITS = 3
+
+GEAR_SHIFT = RPM_BITS
+MODE_SHIFT = GEAR_SHIFT + GEAR_BITS
+PAWL_SHIFT = MODE_SHIFT + MODE_BITS
+RUNNING_SHIFT = PAWL_SHIFT + 1
+
+RPM_MASK = (1 << RPM_BITS) - 1
+GEAR_MASK = (1 << GEAR_BITS) - 1
+MODE_MASK = (1 << MODE_BITS) - 1
+
+# enum values start at -1, stored shifted up so every field is unsigned
+MODE_OFFSET = -min(_.value for _ in Mode)
+GEAR_OFFSET = -Gear.REVERSE.value
+
+# enum members indexed by their stored field
+MODES = tuple(
+    Mode._value2member_map_.get(_ - MODE_OFFSET) for _ in range(MODE_MASK + 1)
+)
+GEARS = tuple(
+    Gear._value2member_map_.get(_ - GEAR_OFFSET) for _ in range(GEAR_MASK + 1)
+)
+
+STATE_DTYPE = np.dtype("<u4")
+
+
+def pack(running: bool, mode: int, gear: int, pawl: bool, rpm: int) -> int:
+    """
+    :param: running : is the engine running
+    :param: mode : plain Mode value
+    :param: gear : plain gear value, up to 254 forward gears fit
+    :param: pawl : is the parking pawl engaged
+    :param: rpm : engine rpm, clamped to 0 - 65535
+
+    :return: packed state
+    """
+    return (
+        running << RUNNING_SHIFT
+        | pawl << PAWL_SHIFT
+        | (mode + MODE_OFFSET) << MODE_SHIFT
+        | (gear + GEAR_OFFSET) << GEAR_SHIFT
+        | min(max(int(rpm), 0), RPM_MASK)
+    )
+
+
+def unpack(state: int) -> tuple:
+    """
+    :param: state : packed state
+    :return: (running, mode, gear, pawl, rpm) with plain mode and gear values
+    """
+    return (
+        bool(state >> RUNNING_SHIFT & 1),
+        (state >> MODE_SHIFT & MODE_MASK) - MODE_OFFSET,
+        (state >> GEAR_SHIFT & GEAR_MASK) - GEAR_OFFSET,
+        bool(state >> PAWL_SHIFT & 1),
+        state & RPM_MASK,
+    )
+
+
+def pack_vehicle(engine: Engine, gearbox: Gearbox) -> int:
+    """
+    :return: packed state of a vehicle
+    """
+    return (
+        engine.running << RUNNING_SHIFT
+        | gearbox.parking_pawl_engaged << PAWL_SHIFT
+        | (gearbox.mode._value_ + MODE_OFFSET) << MODE_SHIFT
+        | (gearbox.gear._value_ + GEAR_OFFSET) << GEAR_SHIFT
+        | min(max(int(engine.rpm), 0), RPM_MASK)
+    )
+
+
+def unpack_vehicle(
+    state: int, engine: Optional[Engine] = None, gearbox: Optional[Gearbox] = None
+) -> tuple:
+    """
+    Load a packed state into the Enum view
+
+    :param: state : packed state
+    :param: engine : Engine to overwrite, a new one by default
+    :param: gearbox : Gearbox to overwrite, a new one by default
+
+    :return: (Engine, Gearbox)
+    """
+    engine = engine if engine is not None else Engine()
+    gearbox = gearbox if gearbox is not None else Gearbox()
+    engine.running = bool(state >> RUNNING_SHIFT & 1)
+    engine.rpm = state & RPM_MASK
+    gearbox.mode = MODES[state >> MODE_SHIFT & MODE_MASK]
+    gearbox.gear = GEARS[state >> GEAR_SHIFT & GEAR_MASK]
+    gearbox.parking_pawl_engaged = bool(state >> PAWL_SHIFT & 1)
+    return engine, gearbox
+
+
+# a fresh Engine and Gearbox
+PARKED = pack_vehicle(Engine(), Gearbox())
+
+
+class StateArray:
+    """Packed states of many vehicles in a single NumPy array, 4 bytes per vehicle"""
+
+    def __init__(self, size: int = 0, states: Optional[np.ndarray] = None):
+        """
+        :param: size : number of vehicles, all parked with the engine at rest
+        :param: states : existing array of STATE_DTYPE to wrap without copying instead
+        """
+        self.states = (
+            states if states is not None else np.full(size, PARKED, dtype=STATE_DTYPE)
+        )
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __getitem__(self, index: int) -> int:
+        return int(self.states[index])
+
+    def __setitem__(self, index: int, state: int) -> None:
+        self.states[index] = state
+
+    @property
+    def nbytes(self) -> int:
+        return self.states.nbytes
+
+    @classmethod
+    def from_vehicles(cls, engines: list, gearboxes: list) -> "StateArray":
+        """
+        :param: engines : one Engine per vehicle
+        :param: gearboxes : one Gearbox per vehicle, in the same order as engines
+        """
+        return cls(
+            states=np.fromiter(
+                map(pack_vehicle, engines, gearboxes),
+                dtype=STATE_DTYPE,
+                count=len(gearboxes),
+            )
+        )
+
+    @classmethod
+    def from_fields(cls, running, mode, gear, pawl, rpm) -> "StateArray":
+        """
+        Vectorized pack, every field is an array of plain values with one per vehicle
+        """
+        return cls(
+            states=(
+                np.asarray(running, dtype=STATE_DTYPE) << RUNNING_SHIFT
+                | np.asarray(pawl, dtype=STATE_DTYPE) << PAWL_SHIFT
+                | (np.asarray(mode) + MODE_OFFSET).astype(STATE_DTYPE) << MODE_SHIFT
+                | (np.asarray(gear) + GEAR_OFFSET).astype(STATE_DTYPE) << GEAR_SHIFT
+                | np.clip(np.rint(rpm), 0, RPM_MASK).astype(STATE_DTYPE)
+            )
+        )
+
+    @classmethod
+    def from_fleet(cls, fleet: Fleet) -> "StateArray":
+        """
+        :param: fleet : a Fleet, its vehicle speeds are not part of the state
+        """
+        return cls.from_fields(
+            fleet.running, fleet.mode, fleet.gear, fleet.parking_pawl_engaged, fleet.rpm
+        )
+
+    @property
+    def running(self) -> np.ndarray:
+        return (self.states >> RUNNING_SHIFT & 1).astype(bool)
+
+    @property
+    def parking_pawl_engaged(self) -> np.ndarray:
+        return (self.states >> PAWL_SHIFT & 1).astype(bool)
+
+    @property
+    def mode(self) -> np.ndarray:
+        """Plain Mode values"""
+        return (self.states >> MODE_SHIFT & MODE_MASK).astype(np.int8) - MODE_OFFSET
+
+    @property
+    def gear(self) -> np.ndarray:
+        """Plain gear values"""
+        return (self.states >> GEAR_SHIFT & GEAR_MASK).astype(np.int16) - GEAR_OFFSET
+
+    @property
+    def rpm(self) -> np.ndarray:
+        return (self.states & RPM_MASK).astype(np.uint16)
+
+    def vehicle(self, index: int) -> tuple:
+        """
+        :param: index : position of the vehicle
+        :return: (Engine, Gearbox) holding the vehicle's state
+        """
+        return unpack_vehicle(int(self.states[index]))
+
+    def store(self, index: int, engine: Engine, gearbox: Gearbox) -> None:
+        """Pack a vehicle's state into position index"""
+        self.states[index] = pack_vehicle(engine, gearbox)
+
+    def to_fleet(self) -> Fleet:
+        """
+        :return: Fleet holding every vehicle, all standing still
+        """
+        fleet = Fleet(len(self))
+        fleet.running[:] = self.running
+        fleet.mode[:] = self.mode
+        fleet.gear[:] = self.gear
+        fleet.parking_pawl_engaged[:] = self.parking_pawl_engaged
+        fleet.rpm[:] = self.rpm
+        return fleet
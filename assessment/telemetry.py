@@ -0,0 +1,388 @@
+"""Append-only binary telemetry of every gearbox state change and engine start or stop"""
+
+import os
+import struct
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.types import Action, Event, Gear, Mode
+
+# one fixed-width little-endian record per shift, kept in sync with RECORD_FORMAT,
+# running is the engine state after the record
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i8"),
+        ("vehicle_id", "<u4"),
+        ("rpm", "<f4"),
+        ("action", "i1"),
+        ("old_mode", "i1"),
+        ("new_mode", "i1"),
+        ("old_gear", "i1"),
+        ("new_gear", "i1"),
+        ("auto_shift", "u1"),
+        ("running", "?"),
+    ]
+)
+RECORD_FORMAT = struct.Struct("<qIfbbbbbB?")
+# action of the records written when the engine starts or stops, mode and gear are
+# left as they are, outside of the Action values
+ENGINE_ACTION = 127
+
+
+class TelemetryRecorder:
+    """Collects shift records in a preallocated ring buffer which is flushed to disk in bulk"""
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 65536,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
+        """
+        :param: path : log file, records are appended to it
+        :param: capacity : number of records buffered between flushes
+        :param: clock : timestamp source, e.g. a simulation tick counter
+        """
+        self.path = path
+        self.capacity = capacity
+        self.clock = clock
+        self.count = 0  # records currently buffered
+        self.written = 0  # records flushed to disk
+        self._buffer = bytearray(capacity * RECORD_DTYPE.itemsize)
+        self._records = np.frombuffer(self._buffer, dtype=RECORD_DTYPE)
+        self._file = open(path, "ab")
+
+    def __enter__(self) -> "TelemetryRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(
+        self,
+        vehicle_id: int,
+        action: Action,
+        old_mode: Mode,
+        new_mode: Mode,
+        old_gear: Gear,
+        new_gear: Gear,
+        rpm: float,
+        auto_shift: bool,
+        running: bool = True,
+    ) -> None:
+        """Buffer a single shift event, timestamped by the recorder clock"""
+        if self.count == self.capacity:
+            self.flush()
+        RECORD_FORMAT.pack_into(
+            self._buffer,
+            self.count * RECORD_FORMAT.size,
+            self.clock(),
+            vehicle_id,
+            rpm,
+            action._value_,
+            old_mode._value_,
+            new_mode._value_,
+            old_gear._value_,
+            new_gear._value_,
+            auto_shift,
+            running,
+        )
+        self.count += 1
+
+    def record_engine(
+        self, vehicle_id: int, mode: Mode, gear: Gear, rpm: float, running: bool
+    ) -> None:
+        """Buffer an engine start or stop as a record with ENGINE_ACTION"""
+        if self.count == self.capacity:
+            self.flush()
+        RECORD_FORMAT.pack_into(
+            self._buffer,
+            self.count * RECORD_FORMAT.size,
+            self.clock(),
+            vehicle_id,
+            rpm,
+            ENGINE_ACTION,
+            mode._value_,
+            mode._value_,
+            gear._value_,
+            gear._value_,
+            False,
+            running,
+        )
+        self.count += 1
+
+    def record_many(
+        self,
+        vehicle_id: np.ndarray,
+        action,
+        old_mode,
+        new_mode,
+        old_gear,
+        new_gear,
+        rpm,
+        auto_shift,
+        timestamp=None,
+        running=True,
+    ) -> None:
+        """
+        Buffer a batch of shift events, e.g. every vehicle a Fleet.auto_shift moved
+
+        Every field takes one plain enum value per event or a single value for all of them
+
+        :param: vehicle_id : ids of the vehicles which shifted
+        :param: timestamp : defaults to a single reading of the recorder clock
+        """
+        size = len(vehicle_id)
+        if timestamp is None:
+            timestamp = self.clock()
+        start = 0
+        while start < size:
+            if self.count == self.capacity:
+                self.flush()
+            stop = min(size, start + self.capacity - self.count)
+            chunk = self._records[self.count : self.count + stop - start]
+            for name, value in (
+                ("timestamp", timestamp),
+                ("vehicle_id", vehicle_id),
+                ("rpm", rpm),
+                ("action", action),
+                ("old_mode", old_mode),
+                ("new_mode", new_mode),
+                ("old_gear", old_gear),
+                ("new_gear", new_gear),
+                ("auto_shift", auto_shift),
+                ("running", running),
+            ):
+                chunk[name] = value[start:stop] if np.ndim(value) else value
+            self.count += stop - start
+            start = stop
+
+    def flush(self) -> None:
+        """Write every buffered record to disk in a single call"""
+        if self.count:
+            self._file.write(
+                memoryview(self._buffer)[: self.count * RECORD_DTYPE.itemsize]
+            )
+            self.written += self.count
+            self.count = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def attach(self, vehicle_id: int, engine, gearbox) -> None:
+        """
+        Record every state change of a gearbox and every start and stop of its engine
+        from now on
+
+        :param: vehicle_id : id stored in the records of this vehicle
+        :param: engine : the Engine object, its rpm is stored with every record
+        :param: gearbox : the Gearbox object
+        """
+        probe = ShiftProbe(self, vehicle_id, engine, gearbox)
+        gearbox.telemetry = probe
+        engine.subscribe(Event.ENGINE_STARTED, probe.engine_changed)
+        engine.subscribe(Event.ENGINE_STOPPED, probe.engine_changed)
+
+
+class ShiftProbe:
+    """Forwards the state changes of one Gearbox and its Engine to a TelemetryRecorder"""
+
+    __slots__ = ("recorder", "vehicle_id", "engine", "gearbox")
+
+    def __init__(self, recorder: TelemetryRecorder, vehicle_id: int, engine, gearbox):
+        self.recorder = recorder
+        self.vehicle_id = vehicle_id
+        self.engine = engine
+        self.gearbox = gearbox
+
+    def __call__(
+        self, gearbox, action: Action, mode: Mode, gear: Gear, auto_shift: bool
+    ) -> None:
+        """Called by Gearbox.shift right before it moves to the new mode and gear"""
+        self.recorder.record(
+            self.vehicle_id,
+            action,
+            gearbox.mode,
+            mode,
+            gearbox.gear,
+            gear,
+            self.engine.rpm,
+            auto_shift,
+            self.engine.running,
+        )
+
+    def engine_changed(self, engine) -> None:
+        """Listener of Event.ENGINE_STARTED and Event.ENGINE_STOPPED"""
+        self.recorder.record_engine(
+            self.vehicle_id,
+            self.gearbox.mode,
+            self.gearbox.gear,
+            engine.rpm,
+            engine.running,
+        )
+
+
+def read_records(path: str, count: Optional[int] = None) -> np.ndarray:
+    """
+    Load a telemetry log into memory
+
+    :param: path : log written by a TelemetryRecorder
+    :param: count : number of records to read, all by default
+    :return: structured array of RECORD_DTYPE
+    """
+    return np.fromfile(path, dtype=RECORD_DTYPE, count=-1 if count is None else count)
+
+
+# state of every vehicle at a TelemetryReader index point
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("mode", "i1"),
+        ("gear", "i1"),
+        ("parking_pawl_engaged", "?"),
+        ("rpm", "<f4"),
+        ("running", "?"),
+    ]
+)
+
+
+class TelemetryReader:
+    """Memory-mapped telemetry log with a sparse time index and periodic state snapshots"""
+
+    def __init__(self, path: str, stride: int = 65536):
+        """
+        Records must be in timestamp order, as written by a single TelemetryRecorder
+
+        :param: path : log written by a TelemetryRecorder
+        :param: stride : number of records between two index points and snapshots
+        """
+        size = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        # zero-copy view, a trailing partially written record is ignored
+        self.records = (
+            np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(size,))
+            if size
+            else np.empty(0, dtype=RECORD_DTYPE)
+        )
+        self.stride = stride
+        self.index = np.array(self.records["timestamp"][::stride])
+        # snapshots up to the latest index point queried, see _snapshot
+        self._snapshots = []
+        # vehicle id -> positions of its records, see _vehicle_positions
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _snapshot(self, point: int) -> np.ndarray:
+        """
+        Snapshots are built on first use, each one from the snapshot before it
+
+        :param: point : index point
+        :return: array of SNAPSHOT_DTYPE holding the state of every vehicle right before
+                 the index point
+        """
+        if not self._snapshots:
+            vehicles = int(self.records["vehicle_id"].max()) + 1
+            self._snapshots.append(self._initial_state(vehicles))
+        while len(self._snapshots) <= point:
+            built = len(self._snapshots)
+            state = self._snapshots[-1].copy()
+            self._apply(state, (built - 1) * self.stride, built * self.stride)
+            self._snapshots.append(state)
+        return self._snapshots[point]
+
+    def _vehicle_positions(self, vehicle_id: int) -> np.ndarray:
+        """
+        :param: vehicle_id : id the vehicle was recorded with
+        :return: positions of every record of the vehicle, in order
+        """
+        positions = self._positions.get(vehicle_id)
+        if positions is None:
+            positions = np.flatnonzero(self.records["vehicle_id"] == vehicle_id)
+            self._positions[vehicle_id] = positions
+        return positions
+
+    @staticmethod
+    def _initial_state(vehicles: int) -> np.ndarray:
+        """
+        :return: state of vehicles which have no record yet, i.e. a fresh Engine and
+                 Gearbox, as the simulation, explorer and fuzzer start from
+        """
+        engine, gearbox = Engine(), Gearbox()
+        state = np.empty(vehicles, dtype=SNAPSHOT_DTYPE)
+        state["mode"] = gearbox.mode.value
+        state["gear"] = gearbox.gear.value
+        state["parking_pawl_engaged"] = gearbox.parking_pawl_engaged
+        state["rpm"] = engine.rpm
+        state["running"] = engine.running
+        return state
+
+    def _apply(self, state: np.ndarray, start: int, stop: int) -> None:
+        """Replay records[start:stop] onto state, the last record of a vehicle wins"""
+        records = self.records[start:stop]
+        self._write(state, records, records["vehicle_id"])
+
+    @staticmethod
+    def _write(state: np.ndarray, records: np.ndarray, index) -> None:
+        """Write the state after every record to state[index], the last record wins"""
+        state["mode"][index] = records["new_mode"]
+        state["gear"][index] = records["new_gear"]
+        state["parking_pawl_engaged"][index] = records["new_mode"] == Mode.PARK.value
+        state["rpm"][index] = records["rpm"]
+        state["running"][index] = records["running"]
+
+    def seek(self, timestamp: int) -> int:
+        """
+        :param: timestamp : any point in time
+        :return: position of the first record after timestamp
+        """
+        point = max(int(np.searchsorted(self.index, timestamp, side="right")) - 1, 0)
+        start = point * self.stride
+        block = self.records["timestamp"][start : start + self.stride + 1]
+        return start + int(np.searchsorted(block, timestamp, side="right"))
+
+    def state_at(self, timestamp: int) -> np.ndarray:
+        """
+        State of every vehicle after all the records up to and including timestamp
+
+        Starts from the nearest snapshot so at most one stride of records is replayed
+
+        :param: timestamp : any point in time
+        :return: array of SNAPSHOT_DTYPE indexed by vehicle id
+        """
+        position = self.seek(timestamp)
+        if not len(self):
+            return self._initial_state(0)
+        point = min(position // self.stride, len(self.index) - 1)
+        state = self._snapshot(point).copy()
+        self._apply(state, point * self.stride, position)
+        return state
+
+    def restore(self, vehicle_id: int, timestamp: int, engine, gearbox) -> None:
+        """
+        Load a vehicle's state at timestamp into an Engine and Gearbox to resume from
+
+        Only the records of the vehicle are looked at, no snapshot is built
+
+        :param: vehicle_id : id the vehicle was recorded with
+        :param: timestamp : any point in time
+        :param: engine : the Engine object, rpm and running are the recorded ones
+        :param: gearbox : the Gearbox object
+        """
+        positions = self._vehicle_positions(vehicle_id)
+        found = int(np.searchsorted(positions, self.seek(timestamp)))
+        state = self._initial_state(1)
+        if found:
+            self._write(state, self.records[positions[found - 1 : found]], [0])
+        state = state[0]
+        gearbox.mode = Mode(int(state["mode"]))
+        gearbox.gear = Gear(int(state["gear"]))
+        gearbox.parking_pawl_engaged = bool(state["parking_pawl_engaged"])
+        engine.rpm = round(float(state["rpm"]))
+        engine.running = bool(state["running"])
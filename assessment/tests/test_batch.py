@@ -0,0 +1,87 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from assessment import Console, Gearbox
+from assessment.batch import replay
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.types import Mode, Gear
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
+    def test_replay(self):
+        script = ["start\n", "drive\n", "manual\n", "up\n", "UP\n"]
+        steps = replay(script, engine=self.engine, gearbox=self.gearbox)
+        self.assertEqual(steps, 5)
+        self.assertTrue(self.engine.running)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+    def test_replay_multi_command_lines(self):
+        trace = io.StringIO()
+        steps = replay(["start; dr", "ma; u*2"], self.engine, self.gearbox, trace)
+        self.assertEqual(steps, 5)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+        self.assertEqual(
+            [_.split("\t")[1] for _ in trace.getvalue().splitlines()],
+            ["start", "drive", "manual", "up", "up"],
+        )
+
+    def test_replay_trace(self):
+        trace = io.StringIO()
+        replay(["start", "", "# comment", "drive"], self.engine, self.gearbox, trace)
+        self.assertEqual(
+            trace.getvalue(),
+            "1\tstart\tengine running: gear [P]\n"
+            "2\tdrive\tengine running: gear [D1]\n",
+        )
+
+    @patch("assessment.console.clear")
+    def test_replay_stops_at_exit(self, mock_clear):
+        with muted():
+            steps = replay(["start", "exit", "drive"], self.engine, self.gearbox)
+        self.assertEqual(steps, 2)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        mock_clear.assert_not_called()
+
+    @patch("assessment.batch.n_print")
+    def test_replay_invalid_input(self, mock_n_print):
+        steps = replay(["someinvalidinput"], self.engine, self.gearbox)
+        self.assertEqual(steps, 1)
+        mock_n_print.assert_called_once_with("invalid input")
+
+    def test_replay_carries_on_after_rejected_lines(self):
+        trace, rejections = io.StringIO(), []
+        with muted():
+            steps = replay(
+                iter(
+                    ["start", "up*\u00b2", "up*20000000", "up*" + "9" * 5000, "drive"]
+                ),
+                self.engine,
+                self.gearbox,
+                trace,
+                rejections,
+            )
+        self.assertEqual(steps, 5)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(
+            rejections,
+            [
+                (2, "up*\u00b2", "invalid input"),
+                (3, "up*20000000", Console.TOO_MANY_REPEATS),
+                (4, "up*" + "9" * 5000, Console.TOO_MANY_REPEATS),
+            ],
+        )
+        self.assertEqual(
+            trace.getvalue().splitlines()[1], "2\tup*\u00b2\trejected: invalid input"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from assessment.bench import REFERENCE, compare, measure, report, run, speedup
+
+
+class TestBench(unittest.TestCase):
+
+    def test_measure(self):
+        calls = []
+        result = measure(lambda: calls.append(1), batch=10, samples=5, ops=2)
+        self.assertEqual(len(calls), 10 + 10 * 5)
+        self.assertEqual(set(result), {"ops_per_sec", "p50_ns", "p99_ns", "peak_bytes"})
+        # a batch mean says nothing about the tail
+        self.assertIsNone(result["p99_ns"])
+        self.assertGreater(result["ops_per_sec"], 0)
+
+    def test_measure_every_call(self):
+        result = measure(lambda: None, batch=1, samples=100)
+        self.assertLessEqual(result["p50_ns"], result["p99_ns"])
+
+    def test_run(self):
+        results = run("gearbox.shift[up]")
+        self.assertEqual(list(results), [REFERENCE, "gearbox.shift[up]"])
+        self.assertIn("gearbox.shift[up]", report(results, baseline=results))
+
+    def test_run_samples_every_dispatch(self):
+        results = run("console.dispatch[up]")
+        self.assertIsNotNone(results["console.dispatch[up]"]["p99_ns"])
+        self.assertIn("console.dispatch[up]", report(results))
+
+    def test_compare(self):
+        baseline = {"a": {"ops_per_sec": 100}, "b": {"ops_per_sec": 100}}
+        results = {
+            "a": {"ops_per_sec": 80},
+            "b": {"ops_per_sec": 70},
+            "c": {"ops_per_sec": 1},
+        }
+        self.assertEqual(compare(results, baseline, tolerance=0.25), ["b"])
+
+    def test_compare_scales_by_reference(self):
+        baseline = {
+            REFERENCE: {"ops_per_sec": 1000},
+            "a": {"ops_per_sec": 100},
+            "b": {"ops_per_sec": 100},
+        }
+        # a machine half as fast, a kept up with it and b got slower
+        results = {
+            REFERENCE: {"ops_per_sec": 500},
+            "a": {"ops_per_sec": 45},
+            "b": {"ops_per_sec": 30},
+        }
+        self.assertEqual(speedup(results, baseline), 0.5)
+        self.assertEqual(compare(results, baseline, tolerance=0.25), ["b"])
+        # twice as fast, a did not follow
+        results[REFERENCE]["ops_per_sec"] = 2000
+        self.assertEqual(compare(results, baseline, tolerance=0.25), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from assessment.checkpoint import (
+    HEADER,
+    load_checkpoint,
+    load_progress,
+    save_checkpoint,
+    save_fleet,
+    save_progress,
+)
+from assessment.fleet import Fleet
+from assessment.state import StateArray, pack
+from assessment.types import Mode, Gear
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.ckpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def driving_fleet(self, size: int) -> Fleet:
+        fleet = Fleet(size)
+        fleet.running[:] = True
+        fleet.mode[:] = Mode.DRIVE.value
+        fleet.gear[:] = Gear.ONE.value
+        fleet.parking_pawl_engaged[:] = False
+        for _ in range(100):
+            fleet.step(np.linspace(0.1, 1.0, size), dt=0.1)
+            fleet.auto_shift(fleet.rpm)
+        return fleet
+
+    def test_round_trip(self):
+        states = StateArray(5)
+        states[3] = pack(True, Mode.MANUAL.value, Gear.FOUR.value, False, 2200)
+        rng = np.random.default_rng(42)
+        rng.random(10)
+        save_checkpoint(self.path, states, tick=1234, rng=rng, speed=np.arange(5.0))
+
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.tick, 1234)
+        self.assertEqual(len(checkpoint), 5)
+        np.testing.assert_array_equal(checkpoint.states.states, states.states)
+        np.testing.assert_array_equal(checkpoint.speed, np.arange(5.0))
+        self.assertIsInstance(checkpoint.states.states, np.memmap)
+        # the restored generator carries on exactly where the saved one was
+        np.testing.assert_array_equal(checkpoint.rng.random(10), rng.random(10))
+
+    def test_bit_generators(self):
+        # MT19937, Philox and SFC64 keep arrays in their state
+        for name in ("PCG64", "PCG64DXSM", "MT19937", "Philox", "SFC64"):
+            with self.subTest(bit_generator=name):
+                rng = np.random.Generator(getattr(np.random, name)(7))
+                rng.random(3)
+                rng.integers(10, dtype=np.uint32)
+                save_checkpoint(self.path, StateArray(2), rng=rng)
+                restored = load_checkpoint(self.path).rng
+                self.assertEqual(type(restored.bit_generator).__name__, name)
+                np.testing.assert_array_equal(restored.random(10), rng.random(10))
+                self.assertEqual(
+                    restored.integers(2**32, size=5).tolist(),
+                    rng.integers(2**32, size=5).tolist(),
+                )
+
+    def test_progress(self):
+        self.assertIsNone(load_progress(self.path))
+        save_progress(self.path, {"done": [0, 4], "seed": 2**70})
+        self.assertEqual(load_progress(self.path), {"done": [0, 4], "seed": 2**70})
+        self.assertFalse(os.path.exists(f"{self.path}.partial"))
+
+    def test_resume_fleet(self):
+        fleet = self.driving_fleet(8)
+        save_fleet(self.path, fleet, tick=100)
+        restored = load_checkpoint(self.path).to_fleet()
+        for name in ("mode", "gear", "parking_pawl_engaged", "running", "speed"):
+            np.testing.assert_array_equal(getattr(restored, name), getattr(fleet, name))
+
+        for resumed in (fleet, restored):
+            resumed.step(0.5, dt=0.1)
+            resumed.auto_shift(resumed.rpm)
+        np.testing.assert_array_equal(restored.gear, fleet.gear)
+        np.testing.assert_array_equal(restored.speed, fleet.speed)
+
+    def test_writable_leaves_file_untouched(self):
+        save_checkpoint(self.path, StateArray(3))
+        with open(self.path, "rb") as f:
+            saved = f.read()
+        checkpoint = load_checkpoint(self.path, writable=True)
+        checkpoint.states[0] = 0
+        checkpoint.speed[:] = 9.0
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), saved)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path).speed[0] = 1.0
+
+    def test_empty(self):
+        save_checkpoint(self.path, StateArray(0), tick=7)
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual((checkpoint.tick, len(checkpoint)), (7, 0))
+        self.assertIsNone(checkpoint.rng)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            save_checkpoint(self.path, StateArray(3), speed=np.zeros(2))
+        self.assertFalse(os.path.exists(self.path))
+        with open(self.path, "wb") as f:
+            f.write(b"\x00" * HEADER.size)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
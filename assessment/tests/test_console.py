@@ -3,19 +3,26 @@ from unittest.mock import patch
 
 from assessment import Console, Gearbox
 from assessment.engine import Engine
+from assessment.physics import VehicleModel
 from assessment.types import Mode, Action, Gear
 
 
 class TestConsole(unittest.TestCase):
 
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
     # exit
     @patch("assessment.console.print_n")
     def test_exit(self, mock_print_n):
         with patch.object(Console, "get_input", return_value="exit"):
-            Engine.running = False
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            exit_command_received = Console.user_input(engine=Engine, gearbox=Gearbox)
+            self.engine.running = False
+            self.gearbox.mode = Mode.PARK
+            self.gearbox.gear = Gear.NEUTRAL
+            exit_command_received = Console.user_input(
+                engine=self.engine, gearbox=self.gearbox
+            )
             self.assertTrue(exit_command_received)
             mock_print_n.assert_called_once_with("exiting vehicle....")
 
@@ -23,10 +30,12 @@ class TestConsole(unittest.TestCase):
     def test_exit_with_engine_running(self, mock_print_n):
         Console.allow_unmanned_idle = True
         with patch.object(Console, "get_input", return_value="exit"):
-            Engine.running = True
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            exit_command_received = Console.user_input(engine=Engine, gearbox=Gearbox)
+            self.engine.running = True
+            self.gearbox.mode = Mode.PARK
+            self.gearbox.gear = Gear.NEUTRAL
+            exit_command_received = Console.user_input(
+                engine=self.engine, gearbox=self.gearbox
+            )
             self.assertTrue(exit_command_received)
             mock_print_n.assert_called_once_with("exiting vehicle....")
 
@@ -34,10 +43,12 @@ class TestConsole(unittest.TestCase):
     def test_exit_with_engine_running_without_allow_unmanned_idle(self, mock_n_print):
         Console.allow_unmanned_idle = False
         with patch.object(Console, "get_input", return_value="exit"):
-            Engine.running = True
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            exit_command_received = Console.user_input(engine=Engine, gearbox=Gearbox)
+            self.engine.running = True
+            self.gearbox.mode = Mode.PARK
+            self.gearbox.gear = Gear.NEUTRAL
+            exit_command_received = Console.user_input(
+                engine=self.engine, gearbox=self.gearbox
+            )
             self.assertTrue(not exit_command_received)
             mock_n_print.assert_called_once_with(
                 "please Park and Stop the engine before exiting!"
@@ -49,39 +60,41 @@ class TestConsole(unittest.TestCase):
     ):
         Console.allow_unmanned_idle = True
         with patch.object(Console, "get_input", return_value="exit"):
-            Engine.running = True
-            Gearbox.mode = Mode.DRIVE
-            Gearbox.gear = Gear.ONE
-            exit_command_received = Console.user_input(engine=Engine, gearbox=Gearbox)
+            self.engine.running = True
+            self.gearbox.mode = Mode.DRIVE
+            self.gearbox.gear = Gear.ONE
+            exit_command_received = Console.user_input(
+                engine=self.engine, gearbox=self.gearbox
+            )
             self.assertTrue(not exit_command_received)
             mock_n_print.assert_called_once_with("please Park the car before exiting!")
 
     # start
     def test_start(self):
         with patch.object(Console, "get_input", return_value="start"):
-            Engine.running = False
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            Console.user_input(engine=Engine, gearbox=Gearbox)
-            self.assertTrue(Engine.running)
+            self.engine.running = False
+            self.gearbox.mode = Mode.PARK
+            self.gearbox.gear = Gear.NEUTRAL
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+            self.assertTrue(self.engine.running)
 
     # stop
     def test_stop(self):
         with patch.object(Console, "get_input", return_value="stop"):
-            Engine.running = True
-            Gearbox.mode = Mode.PARK
-            Gearbox.gear = Gear.NEUTRAL
-            Console.user_input(engine=Engine, gearbox=Gearbox)
-            self.assertTrue(not Engine.running)
+            self.engine.running = True
+            self.gearbox.mode = Mode.PARK
+            self.gearbox.gear = Gear.NEUTRAL
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+            self.assertTrue(not self.engine.running)
 
     @patch("assessment.console.n_print")
     def test_stop_from_improper_state(self, mock_n_print):
         with patch.object(Console, "get_input", return_value="stop"):
-            Engine.running = True
-            Gearbox.mode = Mode.DRIVE
-            Gearbox.gear = Gear.ONE
-            Console.user_input(engine=Engine, gearbox=Gearbox)
-            self.assertTrue(Engine.running)
+            self.engine.running = True
+            self.gearbox.mode = Mode.DRIVE
+            self.gearbox.gear = Gear.ONE
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+            self.assertTrue(self.engine.running)
             mock_n_print.assert_called_once_with(
                 "please put the car into park before shutting down the engine!"
             )
@@ -90,8 +103,8 @@ class TestConsole(unittest.TestCase):
     def test_up(self):
         with patch.object(Console, "get_input", return_value="up"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(action=Action.UP, engine_running=True)
 
@@ -99,8 +112,8 @@ class TestConsole(unittest.TestCase):
     def test_down(self):
         with patch.object(Console, "get_input", return_value="down"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(action=Action.DOWN, engine_running=True)
 
@@ -108,8 +121,8 @@ class TestConsole(unittest.TestCase):
     def test_drive(self):
         with patch.object(Console, "get_input", return_value="drive"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(action=Action.DRIVE, engine_running=True)
 
@@ -117,8 +130,8 @@ class TestConsole(unittest.TestCase):
     def test_manual(self):
         with patch.object(Console, "get_input", return_value="manual"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(action=Action.MANUAL, engine_running=True)
 
@@ -126,8 +139,8 @@ class TestConsole(unittest.TestCase):
     def test_park(self):
         with patch.object(Console, "get_input", return_value="park"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(action=Action.PARK, engine_running=True)
 
@@ -135,8 +148,8 @@ class TestConsole(unittest.TestCase):
     def test_neutral(self):
         with patch.object(Console, "get_input", return_value="neutral"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(
                     action=Action.NEUTRAL, engine_running=True
@@ -146,8 +159,8 @@ class TestConsole(unittest.TestCase):
     def test_reverse(self):
         with patch.object(Console, "get_input", return_value="reverse"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_called_once()
                 mock_shift.assert_called_with(
                     action=Action.REVERSE, engine_running=True
@@ -158,11 +171,125 @@ class TestConsole(unittest.TestCase):
     def test_invalid_input(self, mock_n_print):
         with patch.object(Console, "get_input", return_value="someinvalidinput"):
             with patch.object(Gearbox, "shift") as mock_shift:
-                Engine.running = True
-                Console.user_input(engine=Engine, gearbox=Gearbox)
+                self.engine.running = True
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
                 mock_shift.assert_not_called()
                 mock_n_print.assert_called_once_with("invalid input")
 
+    # multi-command lines
+    def test_multi_command_line(self):
+        with patch.object(
+            Console, "get_input", return_value="start; drive; manual; up; up"
+        ):
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+        self.assertTrue(self.engine.running)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+    def test_run_line_tick(self):
+        modes = []
+        with patch.object(Engine, "tick") as engine_tick:
+            Console.run_line(
+                "start; drive; manual",
+                engine=self.engine,
+                gearbox=self.gearbox,
+                tick=lambda: modes.append(self.gearbox.mode),
+            )
+        self.assertEqual(modes, [Mode.PARK, Mode.DRIVE])
+        engine_tick.assert_not_called()
+
+    def test_line_matches_one_command_per_line(self):
+        def drive(lines):
+            engine, gearbox, model = Engine(), Gearbox(), VehicleModel()
+
+            def advance():
+                model.step(engine, gearbox, 1.0, 0.5)
+                engine.tick(gearbox, 1.0, model.speed)
+
+            for line in lines:
+                Console.run_line(line, engine=engine, gearbox=gearbox, tick=advance)
+                advance()
+            return gearbox.mode, gearbox.gear, engine.rpm, model.speed
+
+        commands = ["start", "drive"] + ["manual", "up", "drive"] * 3
+        self.assertEqual(drive(["; ".join(commands)]), drive(commands))
+        self.assertGreater(drive(commands)[3], 0.0)
+
+    def test_prefixes_and_repeats(self):
+        with patch.object(Console, "get_input", return_value="sta;dr;ma;u*3 ; do"):
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+    @patch("assessment.console.clear")
+    @patch("assessment.console.print_n")
+    def test_multi_command_line_stops_at_exit(self, mock_print_n, mock_clear):
+        with patch.object(Console, "get_input", return_value="exit; start"):
+            self.assertTrue(
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
+            )
+        self.assertFalse(self.engine.running)
+
+    def test_parse(self):
+        self.assertEqual(Console.parse("up"), ["up"])
+        self.assertEqual(Console.parse("u*2;do ;"), ["up", "up", "down"])
+        self.assertEqual(Console.parse("st"), None)  # start or stop
+        self.assertEqual(Console.parse("sto"), ["stop"])
+        self.assertEqual(Console.parse("d"), None)  # drive or down
+        for line in ["", ";", "up*", "up*0", "up*x", "*2", "up; fly", "up*\u00b2"]:
+            self.assertIsNone(Console.parse(line), line)
+        self.assertEqual(len(Console.parse(f"up*{Console.MAX_REPEAT}")), 100)
+        self.assertIsNone(Console.parse(f"up*{Console.MAX_REPEAT + 1}"))
+
+    def test_check_line(self):
+        self.assertEqual(Console.check_line("up*2"), (["up", "up"], None))
+        self.assertEqual(Console.check_line("up*\u00b2"), (None, "invalid input"))
+        self.assertEqual(
+            Console.check_line("up*20000000"), (None, Console.TOO_MANY_REPEATS)
+        )
+        self.assertEqual(Console.check_line("up*007"), (["up"] * 7, None))
+        self.assertEqual(Console.check_line("up*000"), (None, "invalid input"))
+        # longer than int accepts, refused before it is converted
+        self.assertEqual(
+            Console.check_line("up*" + "1" * 4301), (None, Console.TOO_MANY_REPEATS)
+        )
+        self.assertEqual(
+            Console.check_line("up*" + "0" * 5000 + "100"), (["up"] * 100, None)
+        )
+
+    @patch("assessment.console.n_print")
+    def test_run_line_with_huge_count(self, mock_n_print):
+        self.assertFalse(
+            Console.run_line(
+                "up*" + "1" * 4301, engine=self.engine, gearbox=self.gearbox
+            )
+        )
+        mock_n_print.assert_called_once_with(Console.TOO_MANY_REPEATS)
+
+    @patch("assessment.console.n_print")
+    def test_too_many_repeats_runs_nothing(self, mock_n_print):
+        with patch.object(Console, "get_input", return_value="start; up*20000000"):
+            self.assertFalse(
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
+            )
+        self.assertFalse(self.engine.running)
+        mock_n_print.assert_called_once_with(Console.TOO_MANY_REPEATS)
+
+    @patch("assessment.console.n_print")
+    def test_invalid_line_runs_nothing(self, mock_n_print):
+        with patch.object(Console, "get_input", return_value="start; fly"):
+            Console.user_input(engine=self.engine, gearbox=self.gearbox)
+        self.assertFalse(self.engine.running)
+        mock_n_print.assert_called_once_with("invalid input")
+
+    def test_dispatch_prefix(self):
+        self.engine.running = True
+        with patch.object(Gearbox, "shift") as mock_shift:
+            Console.dispatch("rev", engine=self.engine, gearbox=self.gearbox)
+            mock_shift.assert_called_once_with(
+                action=Action.REVERSE, engine_running=True
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
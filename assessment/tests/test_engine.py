@@ -5,19 +5,22 @@ from assessment.engine import Engine
 
 class TestEngine(unittest.TestCase):
 
+    def setUp(self):
+        self.engine = Engine()
+
     def test_start(self):
-        Engine.running = False
-        Engine.rpm = 0
-        Engine.start()
-        self.assertTrue(Engine.running)
-        self.assertEqual(Engine.rpm, 1500)
+        self.engine.running = False
+        self.engine.rpm = 0
+        self.engine.start()
+        self.assertTrue(self.engine.running)
+        self.assertEqual(self.engine.rpm, 1500)
 
     def test_stop(self):
-        Engine.running = True
-        Engine.rpm = 1500
-        Engine.stop()
-        self.assertTrue(not Engine.running)
-        self.assertEqual(Engine.rpm, 0)
+        self.engine.running = True
+        self.engine.rpm = 1500
+        self.engine.stop()
+        self.assertTrue(not self.engine.running)
+        self.assertEqual(self.engine.rpm, 0)
 
 
 if __name__ == "__main__":
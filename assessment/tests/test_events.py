@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import Mock
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.types import Mode, Gear, Action, Event
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
+    def test_no_listeners_by_default(self):
+        self.assertIsNone(self.gearbox.listeners)
+        self.assertIsNone(self.engine.listeners)
+
+    def test_subscribe_unsubscribe(self):
+        listener = Mock()
+        self.assertIs(self.gearbox.subscribe(Event.MODE_CHANGED, listener), listener)
+        self.gearbox.subscribe(Event.GEAR_CHANGED, listener)
+        self.gearbox.unsubscribe(Event.MODE_CHANGED, listener)
+        self.assertEqual(self.gearbox.listeners, {Event.GEAR_CHANGED: (listener,)})
+        self.gearbox.unsubscribe(Event.GEAR_CHANGED, listener)
+        # back to the unobserved fast path
+        self.assertIsNone(self.gearbox.listeners)
+        with self.assertRaises(ValueError):
+            self.gearbox.unsubscribe(Event.GEAR_CHANGED, listener)
+
+    def test_mode_and_gear_changed(self):
+        calls = []
+        for event in (Event.MODE_CHANGED, Event.GEAR_CHANGED):
+            self.gearbox.subscribe(
+                event,
+                lambda gearbox, *args, event=event: calls.append(
+                    (event, gearbox.mode, gearbox.gear) + args
+                ),
+            )
+        self.gearbox.shift(engine_running=True, action=Action.DRIVE)
+        # listeners run after the change
+        self.assertEqual(
+            calls,
+            [
+                (Event.MODE_CHANGED, Mode.DRIVE, Gear.ONE, Mode.PARK, Mode.DRIVE),
+                (Event.GEAR_CHANGED, Mode.DRIVE, Gear.ONE, Gear.NEUTRAL, Gear.ONE),
+            ],
+        )
+
+        calls.clear()
+        self.gearbox.shift(engine_running=True, action=Action.MANUAL)
+        self.gearbox.shift(engine_running=True, action=Action.MANUAL)
+        self.gearbox.shift(engine_running=True, action=Action.UP)
+        self.assertEqual(
+            calls,
+            [
+                (Event.MODE_CHANGED, Mode.MANUAL, Gear.ONE, Mode.DRIVE, Mode.MANUAL),
+                (Event.GEAR_CHANGED, Mode.MANUAL, Gear.TWO, Gear.ONE, Gear.TWO),
+            ],
+        )
+
+    def test_auto_shift(self):
+        listener = self.gearbox.subscribe(Event.GEAR_CHANGED, Mock())
+        self.gearbox.mode, self.gearbox.gear = Mode.DRIVE, Gear.TWO
+        self.gearbox.auto_shift(rpm=1500)
+        listener.assert_not_called()
+        self.gearbox.auto_shift(rpm=4000)
+        listener.assert_called_once_with(self.gearbox, Gear.TWO, Gear.THREE)
+        self.assertIs(self.gearbox.gear, Gear.THREE)
+
+    def test_shift_rejected(self):
+        rejected = self.gearbox.subscribe(Event.SHIFT_REJECTED, Mock())
+        changed = self.gearbox.subscribe(Event.MODE_CHANGED, Mock())
+        with muted():
+            self.gearbox.shift(engine_running=False, action=Action.DRIVE)
+        rejected.assert_called_once_with(
+            self.gearbox, Action.DRIVE, "please start the car first!"
+        )
+        changed.assert_not_called()
+
+    def test_shift_refused_without_message(self):
+        rejected = self.gearbox.subscribe(Event.SHIFT_REJECTED, Mock())
+        changed = self.gearbox.subscribe(Event.MODE_CHANGED, Mock())
+        self.gearbox.mode, self.gearbox.gear = Mode.DRIVE, Gear.THREE
+        self.gearbox.shift(engine_running=True, action=Action.REVERSE)
+        rejected.assert_called_once_with(self.gearbox, Action.REVERSE, None)
+        changed.assert_not_called()
+        self.assertIs(self.gearbox.gear, Gear.THREE)
+        rejected.reset_mock()
+        self.gearbox.shift(engine_running=True, action=Action.DRIVE)
+        rejected.assert_not_called()
+
+    def test_engine_started_stopped(self):
+        started = self.engine.subscribe(Event.ENGINE_STARTED, Mock())
+        stopped = self.engine.subscribe(Event.ENGINE_STOPPED, Mock())
+        self.engine.stop()
+        stopped.assert_not_called()
+        self.engine.start()
+        self.engine.start()
+        started.assert_called_once_with(self.engine)
+        self.engine.stop()
+        stopped.assert_called_once_with(self.engine)
+
+    def test_unsubscribe_while_emitting(self):
+        calls = []
+
+        def once(engine):
+            calls.append("once")
+            engine.unsubscribe(Event.ENGINE_STARTED, once)
+
+        self.engine.subscribe(Event.ENGINE_STARTED, once)
+        self.engine.subscribe(Event.ENGINE_STARTED, lambda _: calls.append("always"))
+        self.engine.start()
+        self.engine.stop()
+        self.engine.start()
+        self.assertEqual(calls, ["once", "always", "always"])
+
+
+if __name__ == "__main__":
+    unittest.main()
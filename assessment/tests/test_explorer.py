@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch
+
+from assessment import Console
+from assessment.explorer import StateSpace, explore
+from assessment.transitions import compile_transitions, transition_index
+from assessment.types import Mode, Action, Gear
+
+
+class TestExplorer(unittest.TestCase):
+
+    def test_encode_decode(self):
+        space = StateSpace(max_gear=7)
+        states = set()
+        for state in range(space.size):
+            decoded = space.decode(state)
+            self.assertEqual(space.encode(*decoded), state)
+            states.add(decoded)
+        self.assertEqual(len(states), space.size)
+
+    def test_explore(self):
+        result = explore()
+        space = result.space
+        self.assertTrue(result.ok)
+        self.assertEqual(result.reachable_count, 16)
+        self.assertEqual(result.reachable_count + len(result.unreachable), space.size)
+        self.assertTrue(
+            result.reachable(
+                space.encode(True, Mode.DRIVE.value, Gear.FIVE.value, False)
+            )
+        )
+        self.assertTrue(
+            result.reachable(
+                space.encode(False, Mode.PARK.value, Gear.NEUTRAL.value, True)
+            )
+        )
+        self.assertFalse(
+            result.reachable(
+                space.encode(True, Mode.REVERSE.value, Gear.THREE.value, False)
+            )
+        )
+
+    def test_explore_beyond_gear_enum(self):
+        result = explore(max_gear=40)
+        space = result.space
+        self.assertTrue(result.ok)
+        self.assertTrue(
+            result.reachable(space.encode(True, Mode.MANUAL.value, 40, False))
+        )
+        self.assertIn("max gear 40", result.report())
+
+    def test_invariant_violation(self):
+        table = compile_transitions(Gear.FIVE.value)
+        # a Neutral shift out of Park which forgets to release the pawl
+        index = transition_index(
+            True, Mode.PARK.value, Gear.NEUTRAL.value, Action.NEUTRAL.value, False
+        )
+        table[index] = (Mode.NEUTRAL.value, Gear.NEUTRAL.value, True, 0)
+        result = explore(table=table)
+        self.assertFalse(result.ok)
+        self.assertEqual(
+            [
+                result.space.describe(_)
+                for _ in result.violations["pawl engaged outside Park"]
+            ],
+            ["engine running, NEUTRAL, gear NEUTRAL, pawl engaged"],
+        )
+
+    def test_dead_end(self):
+        table = compile_transitions(Gear.FIVE.value)
+        # Reverse can no longer be left by any command
+        for action in Action:
+            for auto_shift in (False, True):
+                index = transition_index(
+                    True,
+                    Mode.REVERSE.value,
+                    Gear.REVERSE.value,
+                    action.value,
+                    auto_shift,
+                )
+                table[index] = (Mode.REVERSE.value, Gear.REVERSE.value, -1, 0)
+        result = explore(table=table)
+        self.assertEqual(
+            [result.space.describe(_) for _ in result.dead_ends],
+            ["engine running, REVERSE, gear REVERSE, pawl released"],
+        )
+
+    def test_follows_console_handlers(self):
+        # a stop which no longer checks for Park
+        with patch.dict(Console.COMMANDS, {"stop": lambda engine, **_: engine.stop()}):
+            result = explore()
+        self.assertFalse(result.ok)
+        self.assertIn(
+            "engine off, DRIVE, gear ONE, pawl released",
+            [
+                result.space.describe(_)
+                for _ in result.violations["engine stopped outside Park"]
+            ],
+        )
+
+    def test_exit_rule(self):
+        space = StateSpace(allow_unmanned_idle=False)
+        self.assertFalse(
+            space.can_exit(
+                space.encode(True, Mode.PARK.value, Gear.NEUTRAL.value, True)
+            )
+        )
+        self.assertTrue(
+            space.can_exit(
+                space.encode(False, Mode.PARK.value, Gear.NEUTRAL.value, True)
+            )
+        )
+        self.assertTrue(explore(allow_unmanned_idle=False).ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
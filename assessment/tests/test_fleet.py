@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.physics import VehicleModel
+from assessment.types import Mode, Gear
+
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet = Fleet(5)
+        self.fleet.running[:] = True
+        self.fleet.mode[:] = Mode.DRIVE.value
+        self.fleet.gear[:] = [1, 2, 3, 5, 1]
+
+    def test_initial_state(self):
+        fleet = Fleet(3)
+        self.assertEqual(len(fleet), 3)
+        self.assertTrue((fleet.mode == Mode.PARK.value).all())
+        self.assertTrue((fleet.gear == Gear.NEUTRAL.value).all())
+        self.assertFalse(fleet.running.any())
+
+    def test_auto_shift(self):
+        rpm = np.array([3000, 1500, 1200, 3000, 1200])
+        shifted = self.fleet.auto_shift(rpm)
+        self.assertEqual(self.fleet.gear.tolist(), [2, 2, 2, 5, 1])
+        self.assertEqual(shifted.tolist(), [True, False, True, False, False])
+
+    def test_auto_shift_only_in_drive(self):
+        self.fleet.mode[1] = Mode.MANUAL.value
+        self.fleet.running[2] = False
+        self.fleet.auto_shift(np.array([1500, 3000, 1200, 1500, 1500]))
+        self.assertEqual(self.fleet.gear.tolist(), [1, 2, 3, 5, 1])
+
+    def test_auto_shift_matches_gearbox(self):
+        rng = np.random.default_rng(0)
+        gears = rng.integers(-1, 6, size=1000)
+        rpm = rng.integers(100, 7000, size=1000)
+        gearboxes = [Gearbox(mode=Mode.DRIVE, gear=Gear(int(_))) for _ in gears]
+        engines = [Engine(running=True) for _ in gears]
+        fleet = Fleet.from_vehicles(engines, gearboxes)
+
+        fleet.auto_shift(rpm)
+        for gearbox, r in zip(gearboxes, rpm):
+            gearbox.auto_shift(rpm=int(r))
+        self.assertEqual(fleet.gear.tolist(), [_.gear.value for _ in gearboxes])
+
+    def test_vehicle(self):
+        engine, gearbox = self.fleet.vehicle(3)
+        self.assertTrue(engine.running)
+        self.assertEqual(gearbox.mode, Mode.DRIVE)
+        self.assertEqual(gearbox.gear, Gear.FIVE)
+
+    def test_step_matches_vehicle_model(self):
+        self.fleet.mode[4] = Mode.PARK.value
+        self.fleet.gear[4] = Gear.NEUTRAL.value
+        self.fleet.running[3] = False
+        self.fleet.speed[:] = [0.0, 5.0, 12.0, 30.0, 0.0]
+        vehicles = [self.fleet.vehicle(_) for _ in range(len(self.fleet))]
+        models = [VehicleModel(speed=_) for _ in self.fleet.speed]
+        throttle = np.array([1.0, 0.5, 0.2, 0.7, 0.4])
+
+        for _ in range(200):
+            self.fleet.step(throttle, dt=0.01)
+            self.fleet.auto_shift(self.fleet.rpm)
+            for (engine, gearbox), model, t in zip(vehicles, models, throttle):
+                model.step(engine, gearbox, throttle=float(t), dt=0.01)
+                engine.tick(gearbox)
+
+        self.assertEqual(self.fleet.rpm.tolist(), [_.rpm for _, __ in vehicles])
+        self.assertEqual(self.fleet.gear.tolist(), [_.gear.value for __, _ in vehicles])
+        np.testing.assert_allclose(self.fleet.speed, [_.speed for _ in models])
+
+
+if __name__ == "__main__":
+    unittest.main()
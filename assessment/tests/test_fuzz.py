@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from assessment import Console, Gearbox
+from assessment.fuzz import (
+    SNAPSHOT_FIELDS,
+    ReferenceVehicle,
+    first_divergence,
+    fuzz,
+    random_sequence,
+    shrink,
+)
+from assessment.profile import TransmissionProfile
+from assessment.types import Mode, Gear
+
+
+class TestFuzz(unittest.TestCase):
+
+    def setUp(self):
+        # profiles compiled by the tests are cached here rather than in the user's cache
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        environ = patch.dict(os.environ, {"ASSESSMENT_CACHE": self.directory.name})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def test_random_sequence_is_per_case(self):
+        first = random_sequence(seed=1, case=3, length=200)
+        self.assertEqual(first, random_sequence(seed=1, case=3, length=200))
+        self.assertNotEqual(first, random_sequence(seed=1, case=4, length=200))
+        self.assertEqual(len(first), 200)
+        commands = [_ for _ in first if isinstance(_, str)]
+        self.assertTrue(set(commands) <= set(Console.AVAILABLE_COMMANDS))
+        self.assertTrue(all(0 <= _ <= 7000 for _ in first if isinstance(_, int)))
+        self.assertTrue(0 < len(commands) < 200)
+
+    def test_reference_vehicle(self):
+        reference = ReferenceVehicle(TransmissionProfile.default(), True)
+        for step in ("drive", "start", "drive", 5000, "start"):
+            reference.step(step)
+        snapshot = dict(zip(SNAPSHOT_FIELDS, reference.snapshot()))
+        self.assertEqual(snapshot["mode"], Mode.DRIVE.value)
+        # 5000 rpm in first jumps max_skip gears up on the next tick
+        self.assertEqual(snapshot["gear"], Gear.THREE.value)
+        self.assertEqual(snapshot["messages"], ("please start the car first!",))
+        self.assertEqual(reference.snapshot()[SNAPSHOT_FIELDS.index("messages")], ())
+
+    def test_no_divergence(self):
+        for profile in (None, TransmissionProfile.named("ten-speed")):
+            for allow_unmanned_idle in (True, False):
+                with self.subTest(profile=profile, idle=allow_unmanned_idle):
+                    result = fuzz(
+                        300,
+                        length=48,
+                        seed=7,
+                        workers=1,
+                        profile=profile,
+                        allow_unmanned_idle=allow_unmanned_idle,
+                    )
+                    self.assertTrue(result.ok, result.report())
+                    self.assertEqual(result.cases, 300)
+                    self.assertEqual(result.steps, 300 * 48)
+
+    def test_exit_ends_sequence(self):
+        self.assertIsNone(first_divergence(["exit", "bogus"], allow_unmanned_idle=True))
+
+    @patch.object(Gearbox, "max_skip", 1)
+    def test_divergence_is_shrunk(self):
+        result = fuzz(200, seed=0, workers=1, max_divergences=1)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.divergences), 1)
+        divergence = result.divergences[0]
+        self.assertLess(len(divergence.shrunk), len(divergence.sequence))
+        self.assertEqual(divergence.shrunk[0], "start")
+        self.assertIsNotNone(first_divergence(divergence.shrunk))
+        # no single step can be dropped
+        for position in range(len(divergence.shrunk)):
+            shorter = divergence.shrunk[:position] + divergence.shrunk[position + 1 :]
+            self.assertIsNone(first_divergence(shorter))
+        self.assertIn("!= gear", divergence.report())
+
+    def test_shrink(self):
+        def fails(sequence):
+            return (
+                "b" in sequence
+                and "d" in sequence
+                and sequence.index("b") < sequence.index("d")
+            )
+
+        self.assertEqual(shrink(list("abcdefgh"), fails), ["b", "d"])
+
+    @patch.object(Gearbox, "max_skip", 1)
+    def test_workers(self):
+        single = fuzz(100, seed=3, workers=1, shard_size=10)
+        pooled = fuzz(100, seed=3, workers=2, shard_size=10)
+        self.assertFalse(single.ok)
+        self.assertEqual(
+            [(_.case, _.shrunk) for _ in pooled.divergences],
+            [(_.case, _.shrunk) for _ in single.divergences],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
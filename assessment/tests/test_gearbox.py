@@ -1,302 +1,361 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from assessment import Gearbox
 from assessment.engine import Engine
+from assessment.helper import intern_message
 from assessment.types import Mode, Gear, Action
 
 
 class TestGearbox(unittest.TestCase):
 
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
     def test_auto_shift_not_needed(self):
-        Engine.running = True
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.THREE
-        Gearbox.auto_shift(rpm=1500)
-        self.assertEqual(Gearbox.gear.value, 3)
+        self.engine.running = True
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.THREE
+        self.gearbox.auto_shift(rpm=1500)
+        self.assertEqual(self.gearbox.gear.value, 3)
 
     def test_auto_shift_up(self):
-        Engine.running = True
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.auto_shift(rpm=3000)
-        self.assertEqual(Gearbox.gear.value, 3)
+        self.engine.running = True
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.auto_shift(rpm=3000)
+        self.assertEqual(self.gearbox.gear.value, 3)
 
     def test_auto_shift_up_at_max_gear(self):
-        Engine.running = True
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.FIVE
-        Gearbox.auto_shift(rpm=3000)
-        self.assertEqual(Gearbox.gear.value, 5)
+        self.engine.running = True
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.FIVE
+        self.gearbox.auto_shift(rpm=3000)
+        self.assertEqual(self.gearbox.gear.value, 5)
 
     def test_auto_shift_down(self):
-        Engine.running = True
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.THREE
-        Gearbox.auto_shift(rpm=1200)
-        self.assertEqual(Gearbox.gear.value, 2)
+        self.engine.running = True
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.THREE
+        self.gearbox.auto_shift(rpm=1200)
+        self.assertEqual(self.gearbox.gear.value, 2)
 
     def test_auto_shift_down_at_min_gear(self):
-        Engine.running = True
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        Gearbox.auto_shift(rpm=1200)
-        self.assertEqual(Gearbox.gear.value, 1)
+        self.engine.running = True
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.auto_shift(rpm=1200)
+        self.assertEqual(self.gearbox.gear.value, 1)
+
+    def test_auto_shift_skips_gears(self):
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.auto_shift(rpm=6000)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+    def test_auto_shift_max_skip(self):
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.FIVE
+        self.gearbox.auto_shift(rpm=300)
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+        self.gearbox.gear = Gear.FIVE
+        with patch.object(Gearbox, "max_skip", 4):
+            self.gearbox.auto_shift(rpm=300)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
+
+        self.gearbox.gear = Gear.ONE
+        with patch.object(Gearbox, "max_skip", 1):
+            self.gearbox.auto_shift(rpm=6000)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
+
+    def test_auto_shift_is_a_single_transition(self):
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.FIVE
+        self.gearbox.telemetry = Mock()
+        self.gearbox.auto_shift(rpm=300)
+        self.gearbox.telemetry.assert_called_once_with(
+            self.gearbox, Action.DOWN, Mode.DRIVE, Gear.THREE, True
+        )
+
+    def test_instances_are_independent(self):
+        other = Gearbox()
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(other.mode, Mode.PARK)
+        self.assertEqual(other.gear, Gear.NEUTRAL)
 
     def test_friendly_mode(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        self.assertEqual(Gearbox.friendly_mode(), "D1")
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.assertEqual(self.gearbox.friendly_mode(), "D1")
 
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.TWO
-        self.assertEqual(Gearbox.friendly_mode(), "M2")
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.TWO
+        self.assertEqual(self.gearbox.friendly_mode(), "M2")
 
-        Gearbox.mode = Mode.NEUTRAL
-        Gearbox.gear = Gear.NEUTRAL
-        self.assertEqual(Gearbox.friendly_mode(), "N")
+        self.gearbox.mode = Mode.NEUTRAL
+        self.gearbox.gear = Gear.NEUTRAL
+        self.assertEqual(self.gearbox.friendly_mode(), "N")
 
-        Gearbox.mode = Mode.REVERSE
-        Gearbox.gear = Gear.REVERSE
-        self.assertEqual(Gearbox.friendly_mode(), "R")
+        self.gearbox.mode = Mode.REVERSE
+        self.gearbox.gear = Gear.REVERSE
+        self.assertEqual(self.gearbox.friendly_mode(), "R")
 
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        self.assertEqual(Gearbox.friendly_mode(), "P")
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.assertEqual(self.gearbox.friendly_mode(), "P")
 
 
 class TestGearboxShifting(unittest.TestCase):
 
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
     # misc
-    @patch("assessment.gearbox.n_print")
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_without_engine_running(self, mock_n_print):
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = True
-        Gearbox.shift(action=Action.REVERSE, engine_running=False)
-        self.assertEqual(Gearbox.mode, Mode.PARK)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, True)
-        mock_n_print.assert_called_once_with("please start the car first!")
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = True
+        self.gearbox.shift(action=Action.REVERSE, engine_running=False)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, True)
+        mock_n_print.assert_called_once_with(
+            intern_message("please start the car first!")
+        )
 
     # reverse
     def test_shift_into_reverse_from_drive(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        Gearbox.shift(action=Action.REVERSE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.REVERSE)
-        self.assertEqual(Gearbox.gear, Gear.REVERSE)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.shift(action=Action.REVERSE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.REVERSE)
+        self.assertEqual(self.gearbox.gear, Gear.REVERSE)
 
     def test_shift_into_reverse_from_neutral(self):
-        Gearbox.mode = Mode.NEUTRAL
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.shift(action=Action.REVERSE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.REVERSE)
-        self.assertEqual(Gearbox.gear, Gear.REVERSE)
+        self.gearbox.mode = Mode.NEUTRAL
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.shift(action=Action.REVERSE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.REVERSE)
+        self.assertEqual(self.gearbox.gear, Gear.REVERSE)
 
     def test_shift_into_reverse_from_park(self):
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = True
-        Gearbox.shift(action=Action.REVERSE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.REVERSE)
-        self.assertEqual(Gearbox.gear, Gear.REVERSE)
-        self.assertEqual(Gearbox.parking_pawl_engaged, False)
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = True
+        self.gearbox.shift(action=Action.REVERSE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.REVERSE)
+        self.assertEqual(self.gearbox.gear, Gear.REVERSE)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, False)
 
     def test_shift_into_reverse_from_improper_state(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.REVERSE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.REVERSE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
 
     # neutral
     def test_shift_into_neutral_from_drive(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        Gearbox.shift(action=Action.NEUTRAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.NEUTRAL)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.shift(action=Action.NEUTRAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.NEUTRAL)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
 
     def test_shift_into_neutral_from_reverse(self):
-        Gearbox.mode = Mode.REVERSE
-        Gearbox.gear = Gear.REVERSE
-        Gearbox.shift(action=Action.NEUTRAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.NEUTRAL)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
+        self.gearbox.mode = Mode.REVERSE
+        self.gearbox.gear = Gear.REVERSE
+        self.gearbox.shift(action=Action.NEUTRAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.NEUTRAL)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
 
     def test_shift_into_neutral_from_park(self):
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = True
-        Gearbox.shift(action=Action.NEUTRAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.NEUTRAL)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, False)
-
-    @patch("assessment.gearbox.n_print")
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = True
+        self.gearbox.shift(action=Action.NEUTRAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.NEUTRAL)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, False)
+
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_into_neutral_from_improper_state(self, mock_n_print):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.NEUTRAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.NEUTRAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
         mock_n_print.assert_called_once_with(
-            "please put the car into first gear or reverse before switching to neutral!"
+            intern_message(
+                "please put the car into first gear or reverse before switching to neutral!"
+            )
         )
 
     # park
     def test_shift_into_park_from_park(self):
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = True
-        Gearbox.shift(action=Action.PARK, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.PARK)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, True)
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = True
+        self.gearbox.shift(action=Action.PARK, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, True)
 
     def test_shift_into_park_from_drive(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        Gearbox.parking_pawl_engaged = False
-        Gearbox.shift(action=Action.PARK, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.PARK)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, True)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.parking_pawl_engaged = False
+        self.gearbox.shift(action=Action.PARK, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, True)
 
     def test_shift_into_park_from_neutral(self):
-        Gearbox.mode = Mode.NEUTRAL
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = False
-        Gearbox.shift(action=Action.PARK, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.PARK)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, True)
+        self.gearbox.mode = Mode.NEUTRAL
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = False
+        self.gearbox.shift(action=Action.PARK, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, True)
 
     def test_shift_into_park_from_reverse(self):
-        Gearbox.mode = Mode.REVERSE
-        Gearbox.gear = Gear.REVERSE
-        Gearbox.parking_pawl_engaged = False
-        Gearbox.shift(action=Action.PARK, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.PARK)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        self.assertEqual(Gearbox.parking_pawl_engaged, True)
-
-    @patch("assessment.gearbox.n_print")
+        self.gearbox.mode = Mode.REVERSE
+        self.gearbox.gear = Gear.REVERSE
+        self.gearbox.parking_pawl_engaged = False
+        self.gearbox.shift(action=Action.PARK, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.PARK)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, True)
+
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_into_park_from_improper_state(self, mock_n_print):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.parking_pawl_engaged = False
-        Gearbox.shift(action=Action.PARK, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
-        self.assertEqual(Gearbox.parking_pawl_engaged, False)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.parking_pawl_engaged = False
+        self.gearbox.shift(action=Action.PARK, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, False)
         mock_n_print.assert_called_once_with(
-            "please put the car into neutral, first gear or reverse before parking!"
+            intern_message(
+                "please put the car into neutral, first gear or reverse before parking!"
+            )
         )
 
     # drive
     def test_shift_into_drive_from_drive(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.DRIVE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
 
     def test_shift_into_drive_from_neutral(self):
-        Gearbox.mode = Mode.NEUTRAL
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.shift(action=Action.DRIVE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
+        self.gearbox.mode = Mode.NEUTRAL
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
 
     def test_shift_into_drive_from_reverse(self):
-        Gearbox.mode = Mode.REVERSE
-        Gearbox.gear = Gear.REVERSE
-        Gearbox.shift(action=Action.DRIVE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
+        self.gearbox.mode = Mode.REVERSE
+        self.gearbox.gear = Gear.REVERSE
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
 
     def test_shift_into_drive_from_park(self):
-        Gearbox.mode = Mode.PARK
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.parking_pawl_engaged = True
-        Gearbox.shift(action=Action.DRIVE, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
-        self.assertEqual(Gearbox.parking_pawl_engaged, False)
+        self.gearbox.mode = Mode.PARK
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.parking_pawl_engaged = True
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
+        self.assertEqual(self.gearbox.parking_pawl_engaged, False)
 
     # manual
     def test_shift_into_manual_from_manual(self):
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.MANUAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.MANUAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
 
     def test_shift_into_manual_from_drive(self):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.ONE
-        Gearbox.shift(action=Action.MANUAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.shift(action=Action.MANUAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
 
-    @patch("assessment.gearbox.n_print")
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_into_manual_from_improper_state(self, mock_n_print):
-        Gearbox.mode = Mode.NEUTRAL
-        Gearbox.gear = Gear.NEUTRAL
-        Gearbox.shift(action=Action.MANUAL, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.NEUTRAL)
-        self.assertEqual(Gearbox.gear, Gear.NEUTRAL)
-        mock_n_print.assert_called_once_with("please put the car into drive first!")
+        self.gearbox.mode = Mode.NEUTRAL
+        self.gearbox.gear = Gear.NEUTRAL
+        self.gearbox.shift(action=Action.MANUAL, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.NEUTRAL)
+        self.assertEqual(self.gearbox.gear, Gear.NEUTRAL)
+        mock_n_print.assert_called_once_with(
+            intern_message("please put the car into drive first!")
+        )
 
     # up
     def test_shift_up(self):
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.ONE
-        Gearbox.shift(action=Action.UP, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.shift(action=Action.UP, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
 
     def test_shift_up_at_max_gear(self):
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.FIVE
-        Gearbox.shift(action=Action.UP, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.FIVE)
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.FIVE
+        self.gearbox.shift(action=Action.UP, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.FIVE)
 
-    @patch("assessment.gearbox.n_print")
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_up_outside_manual_mode(self, mock_n_print):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.UP, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
-        mock_n_print.assert_called_once_with("please put the car into manual first!")
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.UP, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
+        mock_n_print.assert_called_once_with(
+            intern_message("please put the car into manual first!")
+        )
 
     # down
     def test_shift_down(self):
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.DOWN, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.DOWN, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
 
     def test_shift_down_at_min_gear(self):
-        Gearbox.mode = Mode.MANUAL
-        Gearbox.gear = Gear.ONE
-        Gearbox.shift(action=Action.DOWN, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.MANUAL)
-        self.assertEqual(Gearbox.gear, Gear.ONE)
+        self.gearbox.mode = Mode.MANUAL
+        self.gearbox.gear = Gear.ONE
+        self.gearbox.shift(action=Action.DOWN, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.MANUAL)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
 
-    @patch("assessment.gearbox.n_print")
+    @patch("assessment.gearbox.n_print_code")
     def test_shift_down_outside_manual_mode(self, mock_n_print):
-        Gearbox.mode = Mode.DRIVE
-        Gearbox.gear = Gear.TWO
-        Gearbox.shift(action=Action.DOWN, engine_running=True)
-        self.assertEqual(Gearbox.mode, Mode.DRIVE)
-        self.assertEqual(Gearbox.gear, Gear.TWO)
-        mock_n_print.assert_called_once_with("please put the car into manual first!")
+        self.gearbox.mode = Mode.DRIVE
+        self.gearbox.gear = Gear.TWO
+        self.gearbox.shift(action=Action.DOWN, engine_running=True)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+        self.assertEqual(self.gearbox.gear, Gear.TWO)
+        mock_n_print.assert_called_once_with(
+            intern_message("please put the car into manual first!")
+        )
 
 
 if __name__ == "__main__":
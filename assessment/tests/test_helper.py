@@ -0,0 +1,95 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from assessment import Gearbox
+from assessment.helper import (
+    BufferedSink,
+    NullSink,
+    RingSink,
+    StdoutSink,
+    intern_message,
+    muted,
+    n_print,
+    n_print_code,
+    output_to,
+    print_n,
+    set_sink,
+)
+from assessment.types import Action
+
+
+class TestSinks(unittest.TestCase):
+
+    def test_intern_message(self):
+        code = intern_message("please start the car first!")
+        self.assertEqual(intern_message("please start the car first!"), code)
+        self.assertNotEqual(intern_message("another message"), code)
+
+    def test_stdout_sink_matches_print(self):
+        with redirect_stdout(io.StringIO()) as expected:
+            print("\n" + "first")
+            print("second" + "\n")
+        with redirect_stdout(io.StringIO()) as output:
+            n_print("first")
+            print_n("second")
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_null_sink(self):
+        with redirect_stdout(io.StringIO()) as output:
+            with muted():
+                n_print("dropped")
+            with output_to(NullSink()):
+                print_n("dropped")
+        self.assertEqual(output.getvalue(), "")
+
+    def test_buffered_sink(self):
+        stream = io.StringIO()
+        sink = BufferedSink(stream, capacity=3)
+        with output_to(sink):
+            n_print("one")
+            print_n("two")
+            self.assertEqual(stream.getvalue(), "")
+            n_print("three")
+            self.assertEqual(stream.getvalue(), "\none\ntwo\n\n\nthree\n")
+            n_print("four")
+        # flushed when the context ends
+        self.assertEqual(stream.getvalue(), "\none\ntwo\n\n\nthree\n\nfour\n")
+
+    def test_ring_sink(self):
+        with output_to(RingSink(capacity=2)) as sink:
+            for text in ["one", "two", "three"]:
+                n_print(text)
+        self.assertEqual(sink.messages(), ["two", "three"])
+        self.assertEqual((len(sink), sink.dropped), (2, 1))
+        sink.clear()
+        self.assertEqual(sink.messages(), [])
+
+    def test_gearbox_messages(self):
+        with output_to(RingSink()) as sink:
+            Gearbox().shift(engine_running=False, action=Action.DRIVE)
+        self.assertEqual(sink.messages(), ["please start the car first!"])
+
+    def test_n_print_code(self):
+        code = intern_message("by code")
+        with output_to(RingSink()) as sink, redirect_stdout(io.StringIO()) as output:
+            n_print_code(code)
+            n_print("by code")
+            with output_to(StdoutSink()):
+                n_print_code(code)
+        self.assertEqual(sink.messages(), ["by code", "by code"])
+        self.assertEqual(output.getvalue(), "\nby code\n")
+
+    def test_set_sink(self):
+        sink = RingSink()
+        previous = set_sink(sink)
+        try:
+            n_print("captured")
+        finally:
+            self.assertIs(set_sink(previous), sink)
+        self.assertIsInstance(previous, StdoutSink)
+        self.assertEqual(sink.messages(), ["captured"])
+
+
+if __name__ == "__main__":
+    unittest.main()
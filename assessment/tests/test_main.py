@@ -0,0 +1,127 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+import assessment
+from assessment.__main__ import SUBCOMMANDS, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# cumulative time python -X importtime may report for the CLI entry point, in us
+IMPORT_BUDGET_US = 100_000
+
+# never needed to parse the command line or to drive, replay, bench or explore
+HEAVY_MODULES = (
+    "numpy",
+    "asyncio",
+    "assessment.fleet",
+    "assessment.telemetry",
+    "assessment.profile",
+    "assessment.simulation",
+)
+
+
+def fresh_python(code: str, *options) -> subprocess.CompletedProcess:
+    """Run code in a new interpreter, so that no module is imported yet"""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def imported_modules(code: str) -> set:
+    """
+    :return: name of every module imported once code ran in a new interpreter
+    """
+    result = fresh_python(f"{code}\nimport sys\nprint('\\n'.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+class TestMain(unittest.TestCase):
+
+    def test_lazy_package(self):
+        modules = imported_modules("import assessment")
+        self.assertNotIn("assessment.console", modules)
+        self.assertNotIn("assessment.gearbox", modules)
+
+        from assessment.console import Console
+        from assessment.gearbox import Gearbox
+
+        self.assertIs(assessment.Console, Console)
+        self.assertIs(assessment.Gearbox, Gearbox)
+        self.assertIn("Gearbox", dir(assessment))
+        with self.assertRaises(AttributeError):
+            assessment.Transmission
+
+    def test_no_heavy_imports(self):
+        for code in (
+            "import assessment.__main__",
+            "import assessment.engine",
+            "import assessment.batch, assessment.bench, assessment.explorer",
+        ):
+            with self.subTest(code=code):
+                modules = imported_modules(code)
+                self.assertEqual(
+                    [_ for _ in HEAVY_MODULES if _ in modules], [], "imported eagerly"
+                )
+
+    def test_import_budget(self):
+        report = fresh_python("import assessment.__main__", "-X", "importtime").stderr
+        # import time: self [us] | cumulative | imported package, nested by indent
+        cumulative = [
+            int(line.split("|")[1])
+            for line in report.splitlines()
+            if line.startswith("import time:")
+            and line.split("|")[2].startswith(" assessment")
+        ]
+        self.assertTrue(cumulative)
+        self.assertLess(sum(cumulative), IMPORT_BUDGET_US)
+
+    def test_subcommands(self):
+        for name, (module, _) in SUBCOMMANDS.items():
+            if module is not None:
+                with self.subTest(name=name):
+                    self.assertTrue(
+                        callable(__import__(module, fromlist=["main"]).main)
+                    )
+
+    @patch("assessment.explorer.main", return_value=1)
+    def test_dispatch(self, explorer):
+        self.assertEqual(main(["explore", "--max-gear", "7", "--unreachable"]), 1)
+        explorer.assert_called_once_with(
+            ["--max-gear", "7", "--unreachable"], prog="python -m assessment explore"
+        )
+
+    @patch("assessment.batch.main", return_value=None)
+    def test_dispatch_status(self, batch):
+        self.assertEqual(main(["replay", "--quiet", "session.txt"]), 0)
+        batch.assert_called_once_with(
+            ["--quiet", "session.txt"], prog="python -m assessment replay"
+        )
+
+    def test_subcommand_prog(self):
+        with redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit):
+            main(["replay", "--help"])
+        self.assertIn("usage: python -m assessment replay", output.getvalue())
+
+    def test_unknown_subcommand(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit:
+            main(["fly"])
+        self.assertEqual(exit.exception.code, 2)
+
+    def test_help(self):
+        with redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit):
+            main(["--help"])
+        for name in SUBCOMMANDS:
+            self.assertIn(name, output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+from itertools import count
+from unittest.mock import patch
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.metrics import Metrics
+from assessment.types import Action, Gear
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+        self.metrics = Metrics(clock=count().__next__)
+
+    def tearDown(self):
+        self.metrics.detach_console()
+
+    def test_detached_by_default(self):
+        self.assertIsNone(self.gearbox.metrics)
+        self.assertIsNone(Console.metrics)
+
+    def test_actions_and_rejections(self):
+        self.metrics.attach(self.gearbox)
+        with muted():
+            self.gearbox.shift(action=Action.UP, engine_running=True)
+            self.gearbox.shift(action=Action.UP, engine_running=False)
+            self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+            self.gearbox.shift(action=Action.UP, engine_running=True)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["actions"], {"UP": 3, "DRIVE": 1})
+        self.assertEqual(
+            snapshot["rejections"],
+            {
+                "please put the car into manual first!": 2,
+                "please start the car first!": 1,
+            },
+        )
+
+    def test_time_in_gear(self):
+        self.metrics.attach(self.gearbox)  # clock 0
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)  # clock 1
+        self.gearbox.shift(action=Action.MANUAL, engine_running=True)
+        self.gearbox.shift(action=Action.UP, engine_running=True)  # clock 2
+        self.metrics.detach(self.gearbox)  # clock 3
+        self.gearbox.shift(action=Action.UP, engine_running=True)
+
+        self.assertEqual(
+            self.metrics.snapshot()["time_in_gear"],
+            {"NEUTRAL": 1, "ONE": 1, "TWO": 1},
+        )
+        self.assertEqual(self.gearbox.gear, Gear.THREE)
+
+    def test_command_latency(self):
+        self.metrics.attach_console()
+        for command in ["start", "drive", "drive", "bogus"]:
+            with patch.object(Console, "get_input", return_value=command), muted():
+                Console.user_input(engine=self.engine, gearbox=self.gearbox)
+
+        latency = self.metrics.snapshot()["command_latency_ns"]
+        self.assertEqual(sorted(latency), ["drive", "start"])
+        self.assertEqual(latency["drive"]["count"], 2)
+        self.assertLessEqual(latency["drive"]["p50"], latency["drive"]["p99"])
+        self.assertEqual(sum(latency["drive"]["histogram"].values()), 2)
+
+    def test_latency_percentile(self):
+        self.metrics.command("up", 100)
+        self.metrics.command("up", 100)
+        self.metrics.command("up", 5000)
+        self.assertEqual(self.metrics.latency_percentile("up", 50), 128)
+        self.assertEqual(self.metrics.latency_percentile("up", 99), 8192)
+        self.assertEqual(self.metrics.latency_percentile("down", 50), 0)
+
+    def test_dump(self):
+        self.metrics.command("up", 100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            self.metrics.dump(path)
+            with open(path) as f:
+                self.assertEqual(
+                    json.load(f)["command_latency_ns"]["up"]["histogram"],
+                    {"128": 1},
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
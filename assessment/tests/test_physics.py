@@ -0,0 +1,71 @@
+import unittest
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.physics import IDLE_RPM, REDLINE_RPM, VehicleModel, engine_rpm
+from assessment.types import Mode, Gear, Action
+
+
+class TestVehicleModel(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+        self.model = VehicleModel()
+
+    def drive(self, seconds: float, throttle: float, brake: float = 0.0, dt=0.01):
+        for _ in range(round(seconds / dt)):
+            self.model.step(self.engine, self.gearbox, throttle, dt=dt, brake=brake)
+            self.engine.tick(self.gearbox)
+
+    def test_parked(self):
+        self.engine.start()
+        self.drive(seconds=1, throttle=1.0)
+        self.assertEqual(self.model.speed, 0.0)
+        self.assertEqual(self.engine.rpm, REDLINE_RPM)
+
+    def test_engine_stopped(self):
+        self.gearbox.mode, self.gearbox.gear = Mode.DRIVE, Gear.ONE
+        self.drive(seconds=1, throttle=1.0)
+        self.assertEqual(self.model.speed, 0.0)
+        self.assertEqual(self.engine.rpm, 0)
+
+    def test_idle_in_drive(self):
+        self.engine.start()
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.drive(seconds=1, throttle=0.0)
+        self.assertEqual(self.engine.rpm, IDLE_RPM)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
+
+    def test_auto_shift_up_and_down(self):
+        self.engine.start()
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.drive(seconds=30, throttle=0.6)
+        self.assertEqual(self.gearbox.gear, Gear.FIVE)
+        self.assertGreater(self.model.speed, 30)
+
+        self.drive(seconds=30, throttle=0.0, brake=0.2)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
+        self.assertEqual(self.model.speed, 0.0)
+
+    def test_reverse(self):
+        self.engine.start()
+        self.gearbox.shift(action=Action.REVERSE, engine_running=True)
+        self.drive(seconds=1, throttle=0.3)
+        self.assertLess(self.model.speed, 0.0)
+
+    def test_rev_limiter(self):
+        self.engine.start()
+        self.gearbox.mode, self.gearbox.gear = Mode.MANUAL, Gear.ONE
+        self.drive(seconds=30, throttle=1.0)
+        self.assertLessEqual(self.engine.rpm, REDLINE_RPM)
+        self.assertEqual(self.gearbox.gear, Gear.ONE)
+
+    def test_engine_rpm(self):
+        self.assertEqual(engine_rpm(0.0, 3.5, 0.0, coupled=True), IDLE_RPM)
+        self.assertEqual(engine_rpm(100.0, 3.5, 0.0, coupled=True), REDLINE_RPM)
+        self.assertEqual(engine_rpm(100.0, 0.0, 1.0, coupled=False), REDLINE_RPM)
+
+
+if __name__ == "__main__":
+    unittest.main()
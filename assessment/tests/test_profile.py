@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.explorer import explore
+from assessment.helper import muted
+from assessment.physics import VehicleModel
+from assessment.profile import CACHE_DIRECTORY, TransmissionProfile, cache_directory
+from assessment.types import Mode, Action, Gear
+
+
+class TestTransmissionProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.directory.name, "cache")
+        environ = patch.dict(os.environ, {"ASSESSMENT_CACHE": self.cache})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_default_matches_gearbox(self):
+        profile = TransmissionProfile.default()
+        gearbox_class = profile.gearbox_class(cache=self.cache)
+        self.assertTrue(issubclass(gearbox_class, Gearbox))
+        self.assertIs(gearbox_class.profile, profile)
+        self.assertEqual(gearbox_class.max_gear, Gearbox.max_gear)
+        self.assertEqual(gearbox_class.transitions, Gearbox.transitions)
+        self.assertEqual(gearbox_class.upshift_bands, Gearbox.upshift_bands)
+        self.assertEqual(gearbox_class.downshift_bands, Gearbox.downshift_bands)
+        self.assertEqual(gearbox_class.gear_ratios, Gearbox.gear_ratios)
+
+    def test_shipped_profiles(self):
+        for name, gears in [("four-speed", 4), ("six-speed", 6), ("ten-speed", 10)]:
+            profile = TransmissionProfile.named(name)
+            self.assertEqual((profile.name, profile.gears), (name, gears))
+            self.assertTrue(
+                explore(profile.gears, table=profile.compile(None)["transitions"]).ok
+            )
+
+    def test_upshift_ceiling(self):
+        profile = TransmissionProfile.named("six-speed")
+        gearbox = profile.gearbox(mode=Mode.MANUAL, gear=Gear.FIVE)
+        gearbox.shift(engine_running=True, action=Action.UP)
+        self.assertEqual(gearbox.gear, Gear.SIX)
+        gearbox.shift(engine_running=True, action=Action.UP)
+        self.assertEqual(gearbox.gear, Gear.SIX)
+
+        gearbox = profile.gearbox(mode=Mode.DRIVE, gear=Gear.FIVE)
+        gearbox.auto_shift(rpm=5000)
+        self.assertEqual(gearbox.gear, Gear.SIX)
+        self.assertFalse(hasattr(gearbox, "__dict__"))
+
+    def test_selector_rules(self):
+        profile = TransmissionProfile(
+            [3.0, 2.0, 1.0], park_from=[0], neutral_from=[-1, 1, 2]
+        )
+        gearbox = profile.gearbox(mode=Mode.MANUAL, gear=Gear.TWO)
+        with muted():
+            gearbox.shift(engine_running=True, action=Action.NEUTRAL)
+            self.assertEqual(gearbox.mode, Mode.NEUTRAL)
+            gearbox.shift(engine_running=True, action=Action.REVERSE)
+            gearbox.shift(engine_running=True, action=Action.PARK)
+        # Park only from Neutral
+        self.assertEqual(gearbox.mode, Mode.REVERSE)
+
+    def test_vehicle_model_uses_profile_ratios(self):
+        profile = TransmissionProfile.named("ten-speed")
+        engine = Engine()
+        engine.start()
+        gearbox = profile.gearbox(mode=Mode.DRIVE, gear=Gear.ONE)
+        model = VehicleModel()
+        for _ in range(600):
+            engine.tick(gearbox)
+            model.step(engine, gearbox, throttle=1.0, dt=0.1)
+        self.assertGreater(gearbox.gear.value, Gear.FIVE.value)
+
+    def test_cache(self):
+        profile = TransmissionProfile.named("ten-speed")
+        tables = profile.compile(self.cache)
+        path = os.path.join(self.cache, f"{profile.digest}.npz")
+        self.assertTrue(os.path.exists(path))
+        with patch("assessment.profile.compile_transitions") as mock_compile:
+            self.assertEqual(profile.compile(self.cache), tables)
+            mock_compile.assert_not_called()
+        self.assertEqual(profile.compile(None), tables)
+
+        # a corrupt entry is compiled again
+        with open(path, "wb") as f:
+            f.write(b"corrupt")
+        self.assertEqual(profile.compile(self.cache), tables)
+
+    def test_digest(self):
+        profile = TransmissionProfile([3.0, 2.0, 1.0], name="a")
+        self.assertEqual(
+            profile.digest, TransmissionProfile([3, 2, 1], name="b").digest
+        )
+        self.assertNotEqual(
+            profile.digest, TransmissionProfile([3.0, 2.0, 1.0], max_skip=1).digest
+        )
+        self.assertNotEqual(
+            profile.digest, TransmissionProfile([3.0, 2.0, 1.0], park_from=[0]).digest
+        )
+
+    def test_cache_directory_from_environment(self):
+        profile = TransmissionProfile([3.0, 2.0, 1.0], max_skip=1)
+        profile.compile()
+        self.assertTrue(
+            os.path.exists(os.path.join(self.cache, f"{profile.digest}.npz"))
+        )
+        other = os.path.join(self.directory.name, "other")
+        with patch.dict(os.environ, {"ASSESSMENT_CACHE": other}):
+            self.assertEqual(cache_directory(), other)
+            profile.compile()
+        self.assertTrue(os.path.exists(os.path.join(other, f"{profile.digest}.npz")))
+        with patch.dict(os.environ, {"ASSESSMENT_CACHE": ""}):
+            self.assertEqual(cache_directory(), CACHE_DIRECTORY)
+
+        # a relative directory literally named like the variable is no default
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.directory.name)
+        profile.compile("$ASSESSMENT_CACHE")
+        self.assertTrue(
+            os.path.exists(os.path.join("$ASSESSMENT_CACHE", f"{profile.digest}.npz"))
+        )
+
+    def test_load(self):
+        path = os.path.join(self.directory.name, "custom.json")
+        with open(path, "w") as f:
+            json.dump({"ratios": [3.0, 1.5, 1.0], "upshift_rpm": 2500}, f)
+        profile = TransmissionProfile.named(path)
+        self.assertEqual(profile.name, "custom")
+        self.assertEqual(profile.upshift_rpm, 2500)
+        self.assertEqual(
+            TransmissionProfile.from_dict(profile.to_dict()).digest, profile.digest
+        )
+
+    def test_invalid(self):
+        for data in [
+            {"ratios": []},
+            {"ratios": [1.0] * 11},
+            {"ratios": [2.0, 3.0]},
+            {"ratios": [2.0, 1.0], "reverse_ratio": 1.0},
+            {"ratios": [2.0, 1.0], "upshift_rpm": 1000},
+            {"ratios": [2.0, 1.0], "park_from": [3]},
+            {"ratios": [2.0, 1.0], "max_skip": 0},
+            {"ratios": [2.0, 1.0], "gears": 2},
+        ]:
+            with self.assertRaises(ValueError, msg=data):
+                TransmissionProfile.from_dict(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
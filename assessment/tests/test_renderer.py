@@ -0,0 +1,75 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.helper import CLEAR_SCREEN
+from assessment.renderer import Renderer
+from assessment.types import Action
+
+
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+        self.stream = io.StringIO()
+        self.renderer = Renderer(stream=self.stream)
+
+    def test_render(self):
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        self.assertEqual(self.stream.getvalue(), f"{CLEAR_SCREEN}\nengine at rest\n\n")
+
+    def test_render_only_when_dirty(self):
+        self.renderer.render(self.engine, self.gearbox)
+        self.assertFalse(self.renderer.render(self.engine, self.gearbox))
+
+        self.engine.start()
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        self.assertTrue(
+            self.stream.getvalue().endswith("engine running: gear [D1]\n\n")
+        )
+
+        self.renderer.invalidate()
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+
+    def test_render_caches_status_line(self):
+        self.renderer.render(self.engine, self.gearbox)
+        self.engine.start()
+        self.renderer.render(self.engine, self.gearbox)
+        self.engine.stop()
+        self.renderer.render(self.engine, self.gearbox)
+        with patch.object(Gearbox, "friendly_mode") as mock_friendly_mode:
+            self.engine.start()
+            self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+            mock_friendly_mode.assert_not_called()
+
+    def test_watch(self):
+        self.renderer.watch(self.engine, self.gearbox)
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        with patch.object(Engine, "status") as mock_status:
+            # nothing fired, the state is not even looked at
+            self.engine.rpm = 2000
+            self.assertFalse(self.renderer.render(self.engine, self.gearbox))
+            mock_status.assert_not_called()
+
+        self.engine.start()
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+        self.assertTrue(
+            self.stream.getvalue().endswith("engine running: gear [D1]\n\n")
+        )
+
+        self.renderer.unwatch(self.engine, self.gearbox)
+        self.assertIsNone(self.engine.listeners)
+        self.assertIsNone(self.gearbox.listeners)
+        self.engine.running = False
+        self.assertTrue(self.renderer.render(self.engine, self.gearbox))
+
+
+if __name__ == "__main__":
+    unittest.main()
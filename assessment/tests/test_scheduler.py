@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted
+from assessment.physics import VehicleModel
+from assessment.scheduler import TickScheduler, run_async
+from assessment.types import Mode, Gear, Action
+
+
+class TestTickScheduler(unittest.TestCase):
+
+    def test_run(self):
+        scheduler = TickScheduler(rate=1000)
+        calls = []
+        asyncio.run(scheduler.run(lambda: calls.append(1), ticks=20))
+        self.assertEqual(len(calls), 20)
+        jitter = scheduler.jitter()
+        self.assertEqual(jitter["ticks"], 20)
+        self.assertGreaterEqual(jitter["max"], jitter["mean"])
+        self.assertGreaterEqual(jitter["mean"], 0.0)
+
+    def test_jitter_without_ticks(self):
+        self.assertEqual(
+            TickScheduler(rate=10).jitter(), {"ticks": 0, "mean": 0.0, "max": 0.0}
+        )
+
+
+class TestRunAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
+    async def drive(self, commands, delay=0.0, model=None):
+        queue = asyncio.Queue()
+        for command in commands:
+            await queue.put(command)
+        task = asyncio.create_task(
+            run_async(self.engine, self.gearbox, queue, rate=1000, model=model)
+        )
+        await asyncio.sleep(delay)
+        await queue.put(None)
+        return await task
+
+    def test_commands(self):
+        asyncio.run(self.drive(["start\n", "drive\n"]))
+        self.assertTrue(self.engine.running)
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+
+    def test_ticks_run_without_input(self):
+        self.engine.start()
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        self.engine.rpm = 3000
+        scheduler = asyncio.run(self.drive([], delay=0.05))
+        self.assertGreater(scheduler.ticks, 0)
+        self.assertEqual(self.gearbox.gear, Gear.FIVE)
+
+    def test_model_sets_rpm(self):
+        self.engine.start()
+        self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+        model = VehicleModel(speed=30.0)
+        scheduler = asyncio.run(self.drive([], delay=0.05, model=model))
+        self.assertGreater(scheduler.ticks, 0)
+        # far too fast for first gear, the model rpm makes it shift up
+        self.assertGreater(self.gearbox.gear.value, Gear.TWO.value)
+        self.assertNotEqual(self.engine.rpm, 1500)
+        self.assertGreater(model.speed, 0.0)
+
+    def test_exit_stops_loop(self):
+        with muted():
+            asyncio.run(self.drive(["exit\n", "start\n"]))
+        self.assertFalse(self.engine.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.loadgen import load_test, percentile
+from assessment.server import GOODBYE, MAX_LINE, GearboxServer, execute
+from assessment.types import Mode
+
+
+class TestExecute(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
+    def test_status(self):
+        exited, response = execute("start; drive\n", self.engine, self.gearbox)
+        self.assertFalse(exited)
+        self.assertEqual(response, ["= engine running: gear [D1]"])
+        self.assertEqual(self.gearbox.mode, Mode.DRIVE)
+
+    def test_messages(self):
+        self.assertEqual(
+            execute("up", self.engine, self.gearbox)[1],
+            ["! please start the car first!", "= engine at rest"],
+        )
+        self.assertEqual(
+            execute("fly", self.engine, self.gearbox)[1],
+            ["! invalid input", "= engine at rest"],
+        )
+
+    def test_rejected_lines(self):
+        self.assertEqual(
+            execute("up*\u00b2", self.engine, self.gearbox)[1],
+            ["! invalid input", "= engine at rest"],
+        )
+        self.assertEqual(
+            execute("up*20000000", self.engine, self.gearbox)[1],
+            ["! " + Console.TOO_MANY_REPEATS, "= engine at rest"],
+        )
+
+    def test_every_message_is_sent(self):
+        response = execute(";".join(["up*100"] * 12), self.engine, self.gearbox)[1]
+        self.assertEqual(len(response), 1201)
+
+    @patch.object(Console, "run_line", side_effect=RuntimeError("boom"))
+    def test_error(self, mock_run_line):
+        self.assertEqual(
+            execute("start", self.engine, self.gearbox),
+            (False, ["! error: RuntimeError", "= engine at rest"]),
+        )
+
+    def test_exit(self):
+        self.assertEqual(
+            execute("exit", self.engine, self.gearbox),
+            (True, ["! exiting vehicle....", GOODBYE, "= engine at rest"]),
+        )
+
+
+class TestGearboxServer(unittest.TestCase):
+
+    async def converse(self, server, lines):
+        host, port = server.address[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        for line in lines:
+            writer.write(
+                line + b"\n" if isinstance(line, bytes) else f"{line}\n".encode()
+            )
+        # hanging up ends the session even when it never exits the vehicle
+        writer.write_eof()
+        responses = (await reader.read()).decode().splitlines()
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    @patch.object(Console, "allow_unmanned_idle", True)
+    def test_sessions_are_independent(self):
+        async def scenario():
+            async with await GearboxServer().start() as server:
+                first, second = await asyncio.gather(
+                    self.converse(server, ["start; dr; ma; up*2", "down", "exit"]),
+                    self.converse(server, ["start", "exit"]),
+                )
+                return server, first, second
+
+        server, first, second = asyncio.run(scenario())
+        self.assertEqual(
+            first,
+            [
+                "= engine running: gear [M3]",
+                "= engine running: gear [M2]",
+                "! please Park the car before exiting!",
+                "= engine running: gear [M2]",
+            ],
+        )
+        self.assertEqual(
+            second,
+            [
+                "= engine running: gear [P]",
+                "! exiting vehicle....",
+                GOODBYE,
+                "= engine running: gear [P]",
+            ],
+        )
+        self.assertEqual(server.commands, 5)
+        self.assertEqual(server.sessions, 0)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+    def test_bad_input_keeps_the_server_up(self):
+        async def scenario():
+            async with await GearboxServer().start() as server:
+                garbled = await self.converse(server, [b"st\xffart", "start"])
+                too_long = await self.converse(
+                    server, ["start", "u" * (MAX_LINE + 1), "up"]
+                )
+                after = await self.converse(server, ["start"])
+                return garbled, too_long, after
+
+        garbled, too_long, after = asyncio.run(scenario())
+        self.assertEqual(
+            garbled,
+            ["! invalid input", "= engine at rest", "= engine running: gear [P]"],
+        )
+        self.assertEqual(
+            too_long,
+            [
+                "= engine running: gear [P]",
+                f"! error: line longer than {MAX_LINE} bytes",
+                "= engine running: gear [P]",
+            ],
+        )
+        self.assertEqual(after, ["= engine running: gear [P]"])
+
+    def test_unix_socket_load(self):
+        async def scenario(path):
+            async with await GearboxServer().start(path=path) as server:
+                return await load_test(sessions=4, rounds=2, path=server.address)
+
+        with tempfile.TemporaryDirectory() as directory:
+            result = asyncio.run(scenario(os.path.join(directory, "gearbox.sock")))
+        self.assertEqual(result["sessions"], 4)
+        self.assertEqual(result["commands"], 4 * (2 * 12 + 1))
+        self.assertLessEqual(result["p50_ns"], result["p99_ns"])
+        self.assertLessEqual(result["p99_ns"], result["max_ns"])
+
+    def test_load_test_in_process_server(self):
+        result = asyncio.run(load_test(sessions=3, rounds=1, script=["start", "stop"]))
+        self.assertEqual(result["commands"], 9)
+        self.assertGreater(result["commands_per_sec"], 0)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile(list(range(100)), 50), 50)
+        self.assertEqual(percentile(list(range(100)), 100), 99)
+
+
+if __name__ == "__main__":
+    unittest.main()
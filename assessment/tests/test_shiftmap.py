@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.physics import FINAL_DRIVE, GEAR_RATIOS, RPM_PER_SPEED
+from assessment.shiftmap import ShiftMap
+from assessment.types import Mode, Gear
+
+
+def speed_at(rpm: float, gear: Gear) -> float:
+    return rpm / (GEAR_RATIOS[gear] * FINAL_DRIVE * RPM_PER_SPEED)
+
+
+class TestShiftMap(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.shift_map = ShiftMap.from_rpm()
+
+    def test_grids(self):
+        self.assertEqual(self.shift_map.max_gear, Gearbox.max_gear.value)
+        self.assertEqual(self.shift_map.min_gear.shape, (101, 801))
+        self.assertTrue((self.shift_map.min_gear <= self.shift_map.top_gear).all())
+        self.assertEqual(self.shift_map.min_gear.min(), 1)
+        self.assertEqual(self.shift_map.top_gear.max(), 5)
+
+    def test_target_gear(self):
+        # half throttle matches the Gearbox rpm thresholds
+        upshift = speed_at(Gearbox.upshift_rpm_threshold, Gear.TWO)
+        downshift = speed_at(Gearbox.downshift_rpm_threshold, Gear.TWO)
+        self.assertEqual(self.shift_map.target_gear(2, 0.5, upshift + 0.2), 3)
+        self.assertEqual(self.shift_map.target_gear(2, 0.5, upshift - 0.2), 2)
+        self.assertEqual(self.shift_map.target_gear(2, 0.5, downshift + 0.2), 2)
+        self.assertEqual(self.shift_map.target_gear(2, 0.5, downshift - 0.2), 1)
+
+    def test_target_gear_depends_on_throttle(self):
+        speed = speed_at(4000, Gear.TWO)
+        self.assertEqual(self.shift_map.target_gear(2, 1.0, speed), 2)
+        self.assertGreater(self.shift_map.target_gear(2, 0.0, speed), 2)
+
+    def test_target_gear_clamps_speed(self):
+        self.assertEqual(self.shift_map.target_gear(1, 0.5, 1000.0), 5)
+        self.assertEqual(self.shift_map.target_gear(5, 0.5, -0.5), 1)
+
+    def test_target_gear_clips_throttle(self):
+        speed = speed_at(4000, Gear.TWO)
+        for throttle, clipped in ((-0.5, 0.0), (-1e-9, 0.0), (1.5, 1.0), (1e9, 1.0)):
+            with self.subTest(throttle=throttle):
+                expected = self.shift_map.target_gear(2, clipped, speed)
+                self.assertEqual(
+                    self.shift_map.target_gear(2, throttle, speed), expected
+                )
+                self.assertEqual(
+                    self.shift_map.target_gears(
+                        np.array([2], dtype=np.int8), throttle, np.array([speed])
+                    ).tolist(),
+                    [expected],
+                )
+
+    def test_target_gears_matches_target_gear(self):
+        rng = np.random.default_rng(0)
+        gear = rng.integers(1, 6, size=2000).astype(np.int8)
+        throttle = rng.random(2000)
+        speed = rng.random(2000) * 90
+        expected = [
+            self.shift_map.target_gear(int(g), float(t), float(s))
+            for g, t, s in zip(gear, throttle, speed)
+        ]
+        self.assertEqual(
+            self.shift_map.target_gears(gear, throttle, speed).tolist(), expected
+        )
+
+    def test_overlapping_schedules(self):
+        with self.assertRaises(ValueError):
+            ShiftMap(upshift=[[(0, 10), (1, 20)]], downshift=[[(0, 5), (1, 25)]])
+        with self.assertRaises(ValueError):
+            ShiftMap(upshift=[[(0, 10)]], downshift=[])
+
+    def test_gearbox_auto_shift(self):
+        gearbox = Gearbox(mode=Mode.DRIVE, gear=Gear.TWO, shift_map=self.shift_map)
+        speed = speed_at(Gearbox.upshift_rpm_threshold, Gear.TWO) + 0.2
+        gearbox.auto_shift(rpm=0, throttle=0.5, speed=speed)
+        self.assertEqual(gearbox.gear, Gear.THREE)
+        gearbox.auto_shift(rpm=0, throttle=0.5, speed=speed)
+        self.assertEqual(gearbox.gear, Gear.THREE)
+
+        # without throttle and speed the rpm thresholds still apply
+        gearbox.auto_shift(rpm=Gearbox.downshift_rpm_threshold)
+        self.assertEqual(gearbox.gear, Gear.TWO)
+
+    def test_gearbox_auto_shift_without_throttle(self):
+        # speed alone is not enough for the map, like Fleet the rpm thresholds apply
+        gearbox = Gearbox(mode=Mode.DRIVE, gear=Gear.TWO, shift_map=self.shift_map)
+        speed = speed_at(Gearbox.upshift_rpm_threshold, Gear.TWO) + 0.2
+        gearbox.auto_shift(rpm=2000, speed=speed)
+        self.assertEqual(gearbox.gear, Gear.TWO)
+        gearbox.auto_shift(rpm=Gearbox.downshift_rpm_threshold, speed=speed)
+        self.assertEqual(gearbox.gear, Gear.ONE)
+
+    def test_fleet_auto_shift(self):
+        rng = np.random.default_rng(1)
+        size = 500
+        gearboxes = [
+            Gearbox(mode=Mode.DRIVE, gear=Gear(int(_)), shift_map=self.shift_map)
+            for _ in rng.integers(1, 6, size=size)
+        ]
+        engines = [Engine(running=True) for _ in range(size)]
+        fleet = Fleet.from_vehicles(engines, gearboxes)
+        fleet.shift_map = self.shift_map
+        fleet.speed[:] = rng.random(size) * 60
+        throttle = rng.random(size)
+
+        fleet.auto_shift(fleet.rpm, throttle=throttle)
+        for gearbox, engine, t, s in zip(gearboxes, engines, throttle, fleet.speed):
+            engine.tick(gearbox, throttle=float(t), speed=float(s))
+        self.assertEqual(fleet.gear.tolist(), [_.gear.value for _ in gearboxes])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from assessment import simulation
+from assessment.simulation import (
+    DRIVER_COMMANDS,
+    NO_COMMAND,
+    SimulationStats,
+    driver_profile,
+    simulate_fleet,
+    simulate_vehicle,
+)
+from assessment import Console, Gearbox
+from assessment.engine import Engine
+from assessment.helper import muted, n_print, output_to, print_n
+from assessment.types import Mode, Action, Gear
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_driver_profile_is_per_vehicle(self):
+        first = driver_profile(seed=1, vehicle_id=3, steps=500)
+        self.assertEqual(first, driver_profile(seed=1, vehicle_id=3, steps=500))
+        self.assertNotEqual(first, driver_profile(seed=1, vehicle_id=4, steps=500))
+        self.assertNotEqual(first, driver_profile(seed=2, vehicle_id=3, steps=500))
+
+        commands, throttle, brake = first
+        self.assertEqual(len(commands), 500)
+        self.assertTrue(all(NO_COMMAND <= _ < len(DRIVER_COMMANDS) for _ in commands))
+        self.assertTrue(all(0 <= _ <= 1 for _ in throttle))
+        self.assertTrue(all(_ in (0.0, 0.5) for _ in brake))
+
+    def test_simulate_vehicle(self):
+        with muted():
+            stats = simulate_vehicle(seed=0, vehicle_id=0, steps=2000)
+        self.assertEqual(stats.vehicles, 1)
+        self.assertEqual(stats.ticks, 2000)
+        self.assertEqual(sum(stats.state_ticks.values()), 2000)
+        self.assertAlmostEqual(sum(stats.time_in_gear().values()), 200.0)
+        self.assertAlmostEqual(sum(stats.time_in_mode().values()), 200.0)
+        self.assertGreater(sum(stats.shifts.values()), 0)
+        self.assertGreater(sum(stats.rejections.values()), 0)
+
+    def test_stats_shift_hook(self):
+        class FakeGearbox:
+            mode, gear = Mode.MANUAL, Gear.ONE
+
+        stats = SimulationStats()
+        stats.shift(FakeGearbox, Action.UP, Mode.MANUAL, Gear.TWO, None)
+        stats.shift(FakeGearbox, Action.DOWN, Mode.MANUAL, Gear.ONE, None)
+        stats.shift(FakeGearbox, Action.PARK, Mode.MANUAL, Gear.ONE, "rejected")
+        self.assertEqual(stats.shifts, {Action.UP: 1})
+        # counted once the message is printed, see test_stats_sink
+        self.assertEqual(stats.rejections, {})
+
+    def test_stats_sink(self):
+        stats = SimulationStats()
+        with output_to(stats):
+            n_print("rejected")
+            n_print("rejected")
+            print_n("exiting vehicle....")
+        self.assertEqual(stats.rejections, {"rejected": 2})
+
+    def test_console_refusals_are_counted(self):
+        engine, gearbox = Engine(), Gearbox()
+        with output_to(SimulationStats()) as stats:
+            engine.start()
+            gearbox.metrics = stats
+            Console.dispatch("drive", engine=engine, gearbox=gearbox)
+            Console.dispatch("stop", engine=engine, gearbox=gearbox)
+            Console.dispatch("park", engine=engine, gearbox=gearbox)
+            Console.dispatch("park", engine=engine, gearbox=gearbox)
+            Console.dispatch("bogus", engine=engine, gearbox=gearbox)
+        self.assertEqual(
+            stats.rejections,
+            {
+                "please put the car into park before shutting down the engine!": 1,
+                Console.INVALID_INPUT: 1,
+            },
+        )
+        self.assertEqual(stats.shifts, {Action.DRIVE: 1, Action.PARK: 1})
+
+        stats = simulate_vehicle(seed=0, vehicle_id=0, steps=2000)
+        self.assertIn(
+            "please put the car into park before shutting down the engine!",
+            stats.rejections,
+        )
+
+    def test_merge(self):
+        stats = SimulationStats(dt=0.5)
+        stats.state_ticks[Mode.PARK, Gear.NEUTRAL] = 4
+        other = SimulationStats(dt=0.5)
+        other.vehicles = 1
+        other.state_ticks[Mode.PARK, Gear.NEUTRAL] = 2
+        other.state_ticks[Mode.DRIVE, Gear.ONE] = 1
+        stats.merge(other)
+        self.assertEqual(stats.vehicles, 1)
+        self.assertEqual(stats.time_in_mode(), {Mode.PARK: 3.0, Mode.DRIVE: 0.5})
+        self.assertEqual(stats.time_in_gear(), {Gear.NEUTRAL: 3.0, Gear.ONE: 0.5})
+
+    def test_simulate_fleet_independent_of_sharding(self):
+        expected = SimulationStats()
+        with muted():
+            for vehicle_id in range(6):
+                simulate_vehicle(7, vehicle_id, 300, stats=expected)
+
+        in_process = simulate_fleet(6, steps=300, seed=7, workers=1, shard_size=4)
+        pooled = simulate_fleet(6, steps=300, seed=7, workers=2, shard_size=1)
+        self.assertEqual(in_process.to_dict(), expected.to_dict())
+        self.assertEqual(pooled.to_dict(), expected.to_dict())
+        self.assertEqual(pooled.vehicles, 6)
+        self.assertNotEqual(
+            simulate_fleet(6, steps=300, seed=8, workers=1).to_dict(),
+            expected.to_dict(),
+        )
+
+    def test_stats_state_round_trip(self):
+        with muted():
+            stats = simulate_vehicle(seed=0, vehicle_id=0, steps=2000, dt=0.5)
+        restored = SimulationStats.from_state(stats.to_state())
+        self.assertEqual(restored.dt, 0.5)
+        for name in ("vehicles", "ticks", "commands", "shifts", "rejections"):
+            self.assertEqual(getattr(restored, name), getattr(stats, name))
+        self.assertEqual(restored.state_ticks, stats.state_ticks)
+
+    def test_simulate_fleet_resumes_from_checkpoint(self):
+        expected = simulate_fleet(7, steps=200, seed=3, workers=1).to_dict()
+        shard = simulation._simulate_shard
+        calls = []
+
+        def interrupted(*args):
+            calls.append(args[1])
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return shard(*args)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fleet.json")
+            with patch.object(simulation, "_simulate_shard", interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    simulate_fleet(7, 200, 3, workers=1, shard_size=2, checkpoint=path)
+            self.assertEqual(calls, [0, 2, 4])
+
+            # the shard size is taken from the checkpoint, the two done are skipped
+            calls.clear()
+            with patch.object(simulation, "_simulate_shard", interrupted):
+                resumed = simulate_fleet(7, 200, 3, workers=1, checkpoint=path)
+            self.assertEqual(calls, [4, 6])
+            self.assertEqual(resumed.to_dict(), expected)
+
+            pooled = simulate_fleet(7, 200, 3, workers=2, checkpoint=path)
+            self.assertEqual(pooled.to_dict(), expected)
+            with self.assertRaises(ValueError):
+                simulate_fleet(7, 200, 4, workers=1, checkpoint=path)
+
+    def test_simulate_fleet_checkpoint_in_pool(self):
+        expected = simulate_fleet(5, steps=100, seed=1, workers=1).to_dict()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fleet.json")
+            pooled = simulate_fleet(5, 100, 1, workers=2, shard_size=2, checkpoint=path)
+            self.assertEqual(pooled.to_dict(), expected)
+            resumed = simulate_fleet(5, 100, 1, workers=1, checkpoint=path)
+            self.assertEqual(resumed.to_dict(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import random
+import unittest
+
+import numpy as np
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.state import (
+    PARKED,
+    StateArray,
+    pack,
+    pack_vehicle,
+    unpack,
+    unpack_vehicle,
+)
+from assessment.types import Mode, Gear
+
+
+def random_vehicle(rng: random.Random) -> tuple:
+    engine = Engine(running=rng.random() < 0.5, rpm=rng.randrange(7000))
+    gearbox = Gearbox(
+        mode=rng.choice(list(Mode)),
+        gear=rng.choice(list(Gear)),
+        parking_pawl_engaged=rng.random() < 0.5,
+    )
+    return engine, gearbox
+
+
+def vehicle_state(engine: Engine, gearbox: Gearbox) -> tuple:
+    return (
+        engine.running,
+        engine.rpm,
+        gearbox.mode,
+        gearbox.gear,
+        gearbox.parking_pawl_engaged,
+    )
+
+
+class TestState(unittest.TestCase):
+
+    def test_pack_unpack(self):
+        for fields in [
+            (False, Mode.PARK.value, Gear.NEUTRAL.value, False, 0),
+            (True, Mode.REVERSE.value, Gear.REVERSE.value, False, 800),
+            (True, Mode.MANUAL.value, 254, True, 65535),
+        ]:
+            state = pack(*fields)
+            self.assertLess(state, 2**32)
+            self.assertEqual(unpack(state), fields)
+        self.assertEqual(unpack(pack(True, 2, 3, False, 70000))[-1], 65535)
+        self.assertEqual(unpack(pack(True, 2, 3, False, -5))[-1], 0)
+
+    def test_pack_vehicle(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            engine, gearbox = random_vehicle(rng)
+            state = pack_vehicle(engine, gearbox)
+            self.assertEqual(
+                vehicle_state(*unpack_vehicle(state)), vehicle_state(engine, gearbox)
+            )
+        self.assertEqual(
+            vehicle_state(*unpack_vehicle(PARKED)),
+            vehicle_state(Engine(), Gearbox()),
+        )
+
+    def test_unpack_vehicle_in_place(self):
+        engine, gearbox = Engine(), Gearbox()
+        state = pack(True, Mode.DRIVE.value, Gear.THREE.value, False, 2500)
+        self.assertEqual(unpack_vehicle(state, engine, gearbox), (engine, gearbox))
+        self.assertEqual(gearbox.gear, Gear.THREE)
+        self.assertEqual(engine.rpm, 2500)
+
+    def test_state_array(self):
+        rng = random.Random(1)
+        vehicles = [random_vehicle(rng) for _ in range(100)]
+        states = StateArray.from_vehicles(*zip(*vehicles))
+        self.assertEqual(len(states), 100)
+        self.assertEqual(states.nbytes, 400)
+        for index, vehicle in enumerate(vehicles):
+            self.assertEqual(states[index], pack_vehicle(*vehicle))
+            self.assertEqual(
+                vehicle_state(*states.vehicle(index)), vehicle_state(*vehicle)
+            )
+        self.assertEqual(
+            states.gear.tolist(), [_.gear.value for _ in list(zip(*vehicles))[1]]
+        )
+
+        engine, gearbox = Engine(), Gearbox()
+        states.store(5, engine, gearbox)
+        self.assertEqual(states[5], PARKED)
+        self.assertTrue((StateArray(3).states == PARKED).all())
+
+    def test_fleet_round_trip(self):
+        rng = random.Random(2)
+        fleet = Fleet.from_vehicles(*zip(*[random_vehicle(rng) for _ in range(50)]))
+        states = StateArray.from_fleet(fleet)
+        restored = states.to_fleet()
+        for name in ("mode", "gear", "parking_pawl_engaged", "running", "rpm"):
+            np.testing.assert_array_equal(getattr(restored, name), getattr(fleet, name))
+        np.testing.assert_array_equal(
+            StateArray.from_fleet(restored).states, states.states
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
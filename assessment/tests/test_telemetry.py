@@ -0,0 +1,253 @@
+import os
+import random
+import tempfile
+import unittest
+from itertools import count
+
+import numpy as np
+
+from assessment import Gearbox
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.helper import muted
+from assessment.telemetry import (
+    ENGINE_ACTION,
+    RECORD_DTYPE,
+    RECORD_FORMAT,
+    TelemetryReader,
+    TelemetryRecorder,
+    read_records,
+)
+from assessment.types import Mode, Gear, Action
+
+
+class TestTelemetryRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shifts.bin")
+        self.engine = Engine()
+        self.gearbox = Gearbox()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_layout(self):
+        self.assertEqual(RECORD_FORMAT.size, RECORD_DTYPE.itemsize)
+
+    def test_attach(self):
+        with TelemetryRecorder(self.path, clock=count().__next__) as recorder, muted():
+            recorder.attach(7, self.engine, self.gearbox)
+            self.engine.start()
+            self.engine.start()
+            self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+            self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+            self.gearbox.shift(action=Action.UP, engine_running=True)
+            self.gearbox.shift(action=Action.MANUAL, engine_running=True)
+            self.gearbox.auto_shift(rpm=3000)
+            self.assertEqual(recorder.count, 4)
+
+        records = read_records(self.path)
+        self.assertEqual(records["timestamp"].tolist(), [0, 1, 2, 3])
+        self.assertEqual(records["vehicle_id"].tolist(), [7, 7, 7, 7])
+        self.assertEqual(
+            records["action"].tolist(),
+            [ENGINE_ACTION, Action.DRIVE.value, Action.MANUAL.value, Action.UP.value],
+        )
+        self.assertEqual(
+            records["old_mode"].tolist(),
+            [Mode.PARK.value, Mode.PARK.value, Mode.DRIVE.value, Mode.MANUAL.value],
+        )
+        self.assertEqual(
+            records["new_mode"].tolist(),
+            [Mode.PARK.value, Mode.DRIVE.value, Mode.MANUAL.value, Mode.MANUAL.value],
+        )
+        self.assertEqual(records["old_gear"].tolist(), [0, 0, 1, 1])
+        self.assertEqual(records["new_gear"].tolist(), [0, 1, 1, 2])
+        self.assertEqual(records["rpm"].tolist(), [1500, 1500, 1500, 1500])
+        self.assertEqual(records["auto_shift"].tolist(), [0, 0, 0, 1])
+        self.assertEqual(records["running"].tolist(), [True] * 4)
+
+    def test_attach_engine(self):
+        with TelemetryRecorder(self.path, clock=count().__next__) as recorder:
+            recorder.attach(7, self.engine, self.gearbox)
+            self.engine.start()
+            self.gearbox.shift(action=Action.DRIVE, engine_running=True)
+            self.gearbox.shift(action=Action.PARK, engine_running=True)
+            self.engine.stop()
+            self.engine.stop()
+
+        records = read_records(self.path)
+        self.assertEqual(
+            records["action"].tolist(),
+            [ENGINE_ACTION, Action.DRIVE.value, Action.PARK.value, ENGINE_ACTION],
+        )
+        self.assertEqual(records["running"].tolist(), [True, True, True, False])
+        self.assertEqual(records["rpm"].tolist(), [1500, 1500, 1500, 0])
+
+    def test_flush_when_full(self):
+        recorder = TelemetryRecorder(self.path, capacity=2, clock=lambda: 0)
+        for _ in range(5):
+            recorder.record(
+                1, Action.UP, Mode.DRIVE, Mode.DRIVE, Gear.ONE, Gear.TWO, 3000, True
+            )
+        self.assertEqual((recorder.written, recorder.count), (4, 1))
+        recorder.close()
+        self.assertEqual(len(read_records(self.path)), 5)
+
+    def test_record_many(self):
+        fleet = Fleet(10)
+        fleet.running[:] = True
+        fleet.mode[:] = Mode.DRIVE.value
+        fleet.gear[:] = 3
+        rpm = np.array([3000, 1500] * 5)
+        old_gear = fleet.gear.copy()
+        shifted = fleet.auto_shift(rpm)
+        vehicle_id = np.flatnonzero(shifted)
+
+        with TelemetryRecorder(self.path, capacity=3) as recorder:
+            recorder.record_many(
+                vehicle_id,
+                Action.UP.value,
+                fleet.mode[vehicle_id],
+                fleet.mode[vehicle_id],
+                old_gear[vehicle_id],
+                fleet.gear[vehicle_id],
+                rpm[vehicle_id],
+                True,
+                timestamp=42,
+            )
+
+        records = read_records(self.path)
+        self.assertEqual(records["vehicle_id"].tolist(), [0, 2, 4, 6, 8])
+        self.assertEqual(records["new_gear"].tolist(), [4] * 5)
+        self.assertEqual(records["timestamp"].tolist(), [42] * 5)
+
+
+class TestTelemetryReader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shifts.bin")
+
+        rng = random.Random(0)
+        clock = count(0, 10)
+        vehicles = [(Engine(), Gearbox()) for _ in range(4)]
+        with TelemetryRecorder(self.path, clock=clock.__next__) as recorder, muted():
+            for vehicle_id, (engine, gearbox) in enumerate(vehicles):
+                recorder.attach(vehicle_id, engine, gearbox)
+                engine.start()
+            for _ in range(400):
+                engine, gearbox = rng.choice(vehicles)
+                gearbox.shift(action=rng.choice(list(Action)), engine_running=True)
+        self.records = read_records(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected_state(self, timestamp):
+        state = {}
+        for record in self.records[self.records["timestamp"] <= timestamp]:
+            state[int(record["vehicle_id"])] = (
+                int(record["new_mode"]),
+                int(record["new_gear"]),
+            )
+        return [state.get(_, (Mode.PARK.value, Gear.NEUTRAL.value)) for _ in range(4)]
+
+    def test_records_are_memory_mapped(self):
+        reader = TelemetryReader(self.path, stride=4)
+        self.assertIsInstance(reader.records, np.memmap)
+        self.assertEqual(len(reader), len(self.records))
+        np.testing.assert_array_equal(reader.records, self.records)
+
+    def test_seek(self):
+        reader = TelemetryReader(self.path, stride=4)
+        timestamps = self.records["timestamp"]
+        for timestamp in range(-5, int(timestamps[-1]) + 15, 5):
+            self.assertEqual(
+                reader.seek(timestamp), int((timestamps <= timestamp).sum())
+            )
+
+    def test_state_at(self):
+        for stride in (1, 3, 4, 1000):
+            reader = TelemetryReader(self.path, stride=stride)
+            for timestamp in range(-10, int(self.records["timestamp"][-1]) + 20, 10):
+                state = reader.state_at(timestamp)
+                self.assertEqual(
+                    list(zip(state["mode"].tolist(), state["gear"].tolist())),
+                    self.expected_state(timestamp),
+                )
+
+    def test_restore(self):
+        reader = TelemetryReader(self.path, stride=16)
+        timestamp = int(self.records["timestamp"][len(self.records) // 2])
+        for vehicle_id, (mode, gear) in enumerate(self.expected_state(timestamp)):
+            engine, gearbox = Engine(), Gearbox()
+            reader.restore(vehicle_id, timestamp, engine, gearbox)
+            self.assertEqual(gearbox.mode, Mode(mode))
+            self.assertEqual(gearbox.gear, Gear(gear))
+            self.assertEqual(gearbox.parking_pawl_engaged, mode == Mode.PARK.value)
+            self.assertEqual(engine.rpm, 1500)
+            self.assertTrue(engine.running)
+
+    def test_restore_engine_state(self):
+        engine, gearbox = Engine(), Gearbox()
+        with TelemetryRecorder(self.path, clock=count(10_000).__next__) as recorder:
+            recorder.attach(9, engine, gearbox)
+            engine.start()  # 10000
+            gearbox.shift(action=Action.DRIVE, engine_running=True)
+            gearbox.shift(action=Action.PARK, engine_running=True)
+            engine.stop()  # 10003
+
+        reader = TelemetryReader(self.path, stride=16)
+        for timestamp, mode, rpm, running in (
+            (9_999, Mode.PARK, 0, False),
+            (10_000, Mode.PARK, 1500, True),
+            (10_001, Mode.DRIVE, 1500, True),
+            (10_003, Mode.PARK, 0, False),
+        ):
+            with self.subTest(timestamp=timestamp):
+                engine, gearbox = Engine(), Gearbox()
+                reader.restore(9, timestamp, engine, gearbox)
+                self.assertEqual(gearbox.mode, mode)
+                self.assertEqual((engine.rpm, engine.running), (rpm, running))
+                self.assertEqual(
+                    bool(reader.state_at(timestamp)["running"][9]), running
+                )
+
+    def test_unrecorded_vehicle_is_fresh(self):
+        fresh = Gearbox()
+        reader = TelemetryReader(self.path, stride=4)
+        last = int(self.records["timestamp"][-1])
+        first = int(self.records["timestamp"][0])
+        for vehicle_id, timestamp in ((0, first - 1), (3, first - 1), (99, last)):
+            with self.subTest(vehicle_id=vehicle_id, timestamp=timestamp):
+                engine = Engine(running=True, rpm=2000)
+                gearbox = Gearbox(Mode.DRIVE, Gear.TWO, parking_pawl_engaged=True)
+                reader.restore(vehicle_id, timestamp, engine, gearbox)
+                self.assertEqual(
+                    (gearbox.mode, gearbox.gear, gearbox.parking_pawl_engaged),
+                    (fresh.mode, fresh.gear, fresh.parking_pawl_engaged),
+                )
+                self.assertEqual((engine.rpm, engine.running), (0, False))
+        state = reader.state_at(first - 1)
+        self.assertEqual(
+            state["parking_pawl_engaged"].tolist(), [fresh.parking_pawl_engaged] * 4
+        )
+
+    def test_snapshots_are_lazy(self):
+        reader = TelemetryReader(self.path, stride=4)
+        reader.restore(0, int(self.records["timestamp"][-1]), Engine(), Gearbox())
+        self.assertEqual(reader._snapshots, [])
+        reader.state_at(int(self.records["timestamp"][20]))
+        self.assertEqual(len(reader._snapshots), 6)
+
+    def test_empty_log(self):
+        open(self.path, "wb").close()
+        reader = TelemetryReader(self.path)
+        self.assertEqual(reader.seek(0), 0)
+        self.assertEqual(len(reader.state_at(0)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from assessment.engine import Engine
+from assessment.fleet import Fleet
+from assessment.gearbox import Gearbox
+from assessment.simulation import simulate_fleet
+from assessment.trace import (
+    COLUMNS,
+    ROW_FORMAT,
+    TRACE_DTYPE,
+    TRACE_FORMATS,
+    TraceWriter,
+    iter_chunks,
+    read_column,
+    trace_files,
+)
+from assessment.types import Mode, Gear
+
+
+class TestTraceWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_row_layout(self):
+        self.assertEqual(ROW_FORMAT.size, TRACE_DTYPE.itemsize)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            TraceWriter(self.path, format="parquet")
+
+    def test_chunks(self):
+        for format in TRACE_FORMATS:
+            with self.subTest(format=format):
+                path = os.path.join(self.path, format)
+                with TraceWriter(path, chunk_size=4, format=format) as writer:
+                    for tick in range(10):
+                        writer.record(
+                            tick, 7, Mode.DRIVE, Gear.TWO, 1500.25 + tick, tick % 2
+                        )
+                        # memory stays bounded by the chunk
+                        self.assertLessEqual(writer.count, 4)
+                self.assertEqual((writer.written, writer.chunks), (10, 3))
+                self.assertEqual(read_column(path, "tick").tolist(), list(range(10)))
+                self.assertEqual(read_column(path, "vehicle_id").tolist(), [7] * 10)
+                self.assertEqual(read_column(path, "mode").tolist(), [2] * 10)
+                self.assertEqual(read_column(path, "gear").dtype, np.int8)
+                np.testing.assert_array_equal(
+                    read_column(path, "rpm"), np.arange(10, dtype="<f4") + 1500.25
+                )
+                self.assertEqual(read_column(path, "pawl").tolist(), [False, True] * 5)
+                self.assertEqual(
+                    [len(_["rpm"]) for _ in iter_chunks(path, ["rpm"], chunk_size=4)],
+                    [4, 4, 2],
+                )
+
+    def test_npz_chunks_are_columnar(self):
+        with TraceWriter(self.path, chunk_size=3, part=5) as writer:
+            writer.record_vehicle(0, 1, Engine(), Gearbox())
+        (name,) = trace_files(self.path)
+        self.assertEqual(os.path.basename(name), "00000005-000000.npz")
+        with np.load(name) as chunk:
+            self.assertEqual(sorted(chunk.files), sorted(COLUMNS))
+            self.assertEqual(chunk["mode"].tolist(), [Mode.PARK.value])
+
+    def test_record_many(self):
+        with TraceWriter(self.path, chunk_size=4) as writer:
+            writer.record(0, 9, Mode.PARK, Gear.NEUTRAL, 0, True)
+            writer.record_many(
+                1, np.arange(6), Mode.DRIVE.value, np.arange(6) % 3, 900.0, False
+            )
+            fleet = Fleet(3)
+            fleet.rpm[:] = 1200.0
+            writer.record_fleet(2, fleet, first_id=10)
+        self.assertEqual(writer.written, 10)
+        self.assertEqual(
+            read_column(self.path, "vehicle_id").tolist(),
+            [9, 0, 1, 2, 3, 4, 5, 10, 11, 12],
+        )
+        self.assertEqual(
+            read_column(self.path, "gear").tolist(), [0, 0, 1, 2, 0, 1, 2, 0, 0, 0]
+        )
+        self.assertEqual(read_column(self.path, "tick").tolist()[-3:], [2, 2, 2])
+
+    def test_columns(self):
+        os.makedirs(self.path)
+        self.assertEqual(len(read_column(self.path, "rpm")), 0)
+        with self.assertRaises(ValueError):
+            read_column(self.path, "speed")
+
+    def test_simulate_fleet(self):
+        traces = []
+        for format, shard_size in (("npz", 3), ("csv", 2)):
+            path = os.path.join(self.path, format)
+            simulate_fleet(
+                5,
+                steps=50,
+                seed=4,
+                workers=1,
+                shard_size=shard_size,
+                trace=path,
+                trace_format=format,
+            )
+            self.assertEqual(len(read_column(path, "tick")), 250)
+            traces.append({_: read_column(path, _) for _ in COLUMNS})
+        # the same rows whatever the sharding and the format
+        for column in COLUMNS:
+            np.testing.assert_array_equal(traces[0][column], traces[1][column])
+        self.assertEqual(traces[0]["vehicle_id"].tolist(), sorted(list(range(5)) * 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
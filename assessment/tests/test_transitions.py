@@ -0,0 +1,102 @@
+import unittest
+
+from assessment.helper import intern_message
+from assessment.transitions import (
+    GEAR_STRIDE,
+    MESSAGES,
+    NOT_IN_MANUAL,
+    PAWL_UNCHANGED,
+    REFUSED,
+    compile_transitions,
+    resolve_transitions,
+    transition_index,
+)
+from assessment.types import Mode, Gear, Action
+
+
+class TestTransitions(unittest.TestCase):
+
+    def test_index_is_dense(self):
+        table = compile_transitions(max_gear=Gear.FIVE.value)
+        self.assertEqual(len(table), 7 * GEAR_STRIDE)
+        self.assertNotIn(None, table)
+        self.assertEqual(
+            transition_index(False, Mode.REVERSE.value, -1, Action.REVERSE.value, 0), 0
+        )
+        self.assertEqual(
+            transition_index(True, Mode.MANUAL.value, 5, Action.DOWN.value, 1),
+            len(table) - 1,
+        )
+
+    def test_upshift_ceiling_follows_max_gear(self):
+        table = compile_transitions(max_gear=7)
+        index = transition_index(
+            True, Mode.MANUAL.value, 6, Action.UP.value, auto_shift=False
+        )
+        self.assertEqual(table[index], (Mode.MANUAL.value, 7, PAWL_UNCHANGED, 0))
+        index = transition_index(
+            True, Mode.MANUAL.value, 7, Action.UP.value, auto_shift=False
+        )
+        self.assertEqual(table[index], (Mode.MANUAL.value, 7, PAWL_UNCHANGED, REFUSED))
+
+    def test_rejection_message(self):
+        table = compile_transitions(max_gear=Gear.FIVE.value)
+        index = transition_index(
+            True, Mode.DRIVE.value, Gear.TWO.value, Action.UP.value, auto_shift=False
+        )
+        self.assertEqual(table[index][3], NOT_IN_MANUAL)
+
+    def test_down_from_reverse_is_ignored(self):
+        table = compile_transitions(max_gear=Gear.FIVE.value)
+        index = transition_index(
+            True, Mode.REVERSE.value, Gear.REVERSE.value, Action.DOWN.value, True
+        )
+        self.assertEqual(
+            table[index], (Mode.REVERSE.value, Gear.REVERSE.value, PAWL_UNCHANGED, 0)
+        )
+
+    def test_resolve_transitions(self):
+        table = resolve_transitions(compile_transitions(max_gear=Gear.FIVE.value))
+        index = transition_index(
+            True, Mode.PARK.value, Gear.NEUTRAL.value, Action.DRIVE.value, False
+        )
+        self.assertEqual(table[index], (Mode.DRIVE, Gear.ONE, False, None, None, False))
+        index = transition_index(
+            False, Mode.PARK.value, Gear.NEUTRAL.value, Action.DRIVE.value, False
+        )
+        self.assertEqual(
+            table[index],
+            (
+                Mode.PARK,
+                Gear.NEUTRAL,
+                None,
+                MESSAGES[1],
+                intern_message(MESSAGES[1]),
+                False,
+            ),
+        )
+
+    def test_refused_without_message(self):
+        table = compile_transitions(max_gear=Gear.FIVE.value)
+        for mode, gear, action, code in (
+            (Mode.DRIVE, Gear.THREE, Action.REVERSE, REFUSED),
+            (Mode.MANUAL, Gear.ONE, Action.DOWN, REFUSED),
+            # already where the driver asked to be
+            (Mode.REVERSE, Gear.REVERSE, Action.REVERSE, 0),
+            (Mode.DRIVE, Gear.THREE, Action.DRIVE, 0),
+        ):
+            with self.subTest(mode=mode, action=action):
+                index = transition_index(
+                    True, mode.value, gear.value, action.value, False
+                )
+                self.assertEqual(
+                    table[index], (mode.value, gear.value, PAWL_UNCHANGED, code)
+                )
+        index = transition_index(
+            True, Mode.DRIVE.value, Gear.FIVE.value, Action.UP.value, True
+        )
+        self.assertEqual(table[index][3], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+"""
+Per-tick vehicle state traces written as columnar chunks
+
+A trace is a directory. Every writer owns a part of it, e.g. one per simulation shard,
+and streams fixed-size chunks into it so memory use stays flat however long it runs:
+
+    npz : <part>-<chunk>.npz holding one contiguous array per column, a column is read
+          from every chunk without touching the others
+    csv : <part>.csv with a header line, appended to chunk by chunk
+
+Every file found is read back, so write each trace to a fresh directory.
+
+python -m assessment simulate --vehicles 100 --trace runs/trace
+"""
+
+import itertools
+import os
+import struct
+from typing import Iterator, Optional
+
+import numpy as np
+
+from assessment.types import Gear, Mode
+
+# one packed little-endian row per vehicle and tick, kept in sync with ROW_FORMAT
+TRACE_DTYPE = np.dtype(
+    [
+        ("tick", "<u4"),
+        ("vehicle_id", "<u4"),
+        ("mode", "i1"),
+        ("gear", "i1"),
+        ("rpm", "<f4"),
+        ("pawl", "?"),
+    ]
+)
+ROW_FORMAT = struct.Struct("<IIbbf?")
+COLUMNS = TRACE_DTYPE.names
+TRACE_FORMATS = ("npz", "csv")
+# %.9g round trips every float32 exactly
+CSV_FORMATS = {"mode": "%d", "gear": "%d", "rpm": "%.9g", "pawl": "%d"}
+
+
+class TraceWriter:
+    """Buffers rows in a preallocated chunk which is written out as columns once full"""
+
+    def __init__(
+        self, path: str, chunk_size: int = 65536, format: str = "npz", part: int = 0
+    ):
+        """
+        :param: path : trace directory, created if missing
+        :param: chunk_size : number of rows buffered between flushes
+        :param: format : one of TRACE_FORMATS
+        :param: part : number of this writer within the trace, parts are read in order
+        """
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"unknown trace format {format!r}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.format = format
+        self.part = part
+        self.count = 0  # rows currently buffered
+        self.written = 0  # rows flushed to disk
+        self.chunks = 0  # chunks flushed to disk
+        self._buffer = bytearray(chunk_size * TRACE_DTYPE.itemsize)
+        self._rows = np.frombuffer(self._buffer, dtype=TRACE_DTYPE)
+        self._file = None
+        if format == "csv":
+            self._file = open(os.path.join(path, f"{part:08d}.csv"), "w")
+            self._file.write(",".join(COLUMNS) + "\n")
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(
+        self,
+        tick: int,
+        vehicle_id: int,
+        mode: Mode,
+        gear: Gear,
+        rpm: float,
+        pawl: bool,
+    ) -> None:
+        """Buffer the state of a single vehicle at a tick"""
+        if self.count == self.chunk_size:
+            self.flush()
+        ROW_FORMAT.pack_into(
+            self._buffer,
+            self.count * ROW_FORMAT.size,
+            tick,
+            vehicle_id,
+            mode._value_,
+            gear._value_,
+            rpm,
+            pawl,
+        )
+        self.count += 1
+
+    def record_vehicle(self, tick: int, vehicle_id: int, engine, gearbox) -> None:
+        """Buffer the state of an Engine and Gearbox at a tick"""
+        self.record(
+            tick,
+            vehicle_id,
+            gearbox.mode,
+            gearbox.gear,
+            engine.rpm,
+            gearbox.parking_pawl_engaged,
+        )
+
+    def record_many(self, tick, vehicle_id: np.ndarray, mode, gear, rpm, pawl) -> None:
+        """
+        Buffer a batch of rows, e.g. every vehicle of a Fleet at one tick
+
+        Every field takes one plain value per row or a single value for all of them
+
+        :param: vehicle_id : ids of the vehicles, one per row
+        """
+        size = len(vehicle_id)
+        start = 0
+        while start < size:
+            if self.count == self.chunk_size:
+                self.flush()
+            stop = min(size, start + self.chunk_size - self.count)
+            chunk = self._rows[self.count : self.count + stop - start]
+            for name, value in zip(COLUMNS, (tick, vehicle_id, mode, gear, rpm, pawl)):
+                chunk[name] = value[start:stop] if np.ndim(value) else value
+            self.count += stop - start
+            start = stop
+
+    def record_fleet(self, tick: int, fleet, first_id: int = 0) -> None:
+        """
+        Buffer every vehicle of a Fleet at a tick
+
+        :param: first_id : vehicle id of the first vehicle of the fleet
+        """
+        self.record_many(
+            tick,
+            np.arange(first_id, first_id + len(fleet)),
+            fleet.mode,
+            fleet.gear,
+            fleet.rpm,
+            fleet.parking_pawl_engaged,
+        )
+
+    def flush(self) -> None:
+        """Write every buffered row to disk as one chunk"""
+        if self.count:
+            rows = self._rows[: self.count]
+            if self.format == "npz":
+                # np.savez appends .npz to names without it, a partial file would not be
+                # picked up by trace_files while it is being written
+                name = os.path.join(self.path, f"{self.part:08d}-{self.chunks:06d}")
+                with open(f"{name}.partial", "wb") as f:
+                    np.savez(f, **{_: rows[_] for _ in COLUMNS})
+                os.replace(f"{name}.partial", f"{name}.npz")
+            else:
+                np.savetxt(
+                    self._file,
+                    rows,
+                    fmt=[CSV_FORMATS.get(_, "%d") for _ in COLUMNS],
+                    delimiter=",",
+                )
+            self.written += self.count
+            self.chunks += 1
+            self.count = 0
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is None or not self._file.closed:
+            self.flush()
+        if self._file is not None:
+            self._file.close()
+
+
+def trace_files(path: str) -> list:
+    """
+    :param: path : trace directory
+    :return: paths of every chunk or part file of the trace, in row order
+    """
+    return [
+        os.path.join(path, _)
+        for _ in sorted(os.listdir(path))
+        if _.endswith(".npz") or _.endswith(".csv")
+    ]
+
+
+def iter_chunks(
+    path: str, columns: Optional[list] = None, chunk_size: int = 65536
+) -> Iterator[dict]:
+    """
+    Stream a trace chunk by chunk, only the requested columns are loaded
+
+    :param: path : trace directory
+    :param: columns : names from COLUMNS, every column by default
+    :param: chunk_size : rows per chunk read from a csv part, npz chunks are read whole
+
+    :return: column name -> array of every chunk
+    """
+    columns = list(columns or COLUMNS)
+    unknown = set(columns) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown trace columns: {', '.join(sorted(unknown))}")
+    for name in trace_files(path):
+        if name.endswith(".npz"):
+            with np.load(name) as chunk:
+                yield {_: chunk[_] for _ in columns}
+            continue
+        usecols = [COLUMNS.index(_) for _ in columns]
+        with open(name) as f:
+            next(f)  # header
+            while lines := list(itertools.islice(f, chunk_size)):
+                values = np.loadtxt(
+                    lines, delimiter=",", usecols=usecols, ndmin=2, dtype=np.float64
+                )
+                yield {
+                    _: values[:, position].astype(TRACE_DTYPE[_])
+                    for position, _ in enumerate(columns)
+                }
+
+
+def read_column(path: str, column: str) -> np.ndarray:
+    """
+    :param: path : trace directory
+    :param: column : name from COLUMNS
+    :return: the whole column in row order, typed as in TRACE_DTYPE
+    """
+    chunks = [_[column] for _ in iter_chunks(path, [column])]
+    if not chunks:
+        return np.empty(0, dtype=TRACE_DTYPE[column])
+    return np.concatenate(chunks)
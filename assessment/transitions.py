@@ -0,0 +1,205 @@
+"""Precomputed Gearbox state-transition table
+
+Every (engine_running, mode, gear, action, auto_shift) combination is resolved once
+into a flat list so that shifting is a single integer-indexed lookup.
+
+The table is laid out with gear as the outermost dimension so the strides of every
+other dimension stay fixed no matter how many forward gears a transmission has.
+"""
+
+from assessment.helper import intern_message
+from assessment.types import Mode, Action, Gear
+
+MESSAGES = (
+    None,
+    "please start the car first!",
+    "please put the car into first gear or reverse before switching to neutral!",
+    "please put the car into neutral, first gear or reverse before parking!",
+    "please put the car into drive first!",
+    "please put the car into manual first!",
+    None,  # REFUSED, turned down without a message
+)
+NO_MESSAGE = 0
+ENGINE_NOT_RUNNING = 1
+NEUTRAL_REJECTED = 2
+PARK_REJECTED = 3
+MANUAL_REJECTED = 4
+NOT_IN_MANUAL = 5
+# a request the gearbox cannot follow but has nothing to tell the driver about, e.g.
+# Reverse from third gear, the automated shifter's own requests are never refused
+REFUSED = 6
+
+PAWL_UNCHANGED = -1
+
+# gears a request for Reverse, Neutral or Park is accepted from
+REVERSE_FROM = (Gear.NEUTRAL.value, Gear.ONE.value)
+NEUTRAL_FROM = (Gear.REVERSE.value, Gear.ONE.value)
+PARK_FROM = (Gear.REVERSE.value, Gear.NEUTRAL.value, Gear.ONE.value)
+
+MODE_VALUES = sorted(_.value for _ in Mode)
+ACTION_VALUES = sorted(_.value for _ in Action)
+
+AUTO_SHIFT_STRIDE = 1
+ACTION_STRIDE = AUTO_SHIFT_STRIDE * 2
+MODE_STRIDE = ACTION_STRIDE * len(ACTION_VALUES)
+RUNNING_STRIDE = MODE_STRIDE * len(MODE_VALUES)
+GEAR_STRIDE = RUNNING_STRIDE * 2
+
+# enum values start at -1, shift every index so the smallest value lands on 0
+INDEX_OFFSET = -(
+    Gear.REVERSE.value * GEAR_STRIDE
+    + MODE_VALUES[0] * MODE_STRIDE
+    + ACTION_VALUES[0] * ACTION_STRIDE
+)
+
+
+def transition_index(
+    engine_running: bool, mode: int, gear: int, action: int, auto_shift: bool
+) -> int:
+    """
+    Flat table index of a shift request, all arguments are plain enum values
+
+    :return: position of the transition within a compiled table
+    """
+    return (
+        gear * GEAR_STRIDE
+        + engine_running * RUNNING_STRIDE
+        + mode * MODE_STRIDE
+        + action * ACTION_STRIDE
+        + auto_shift
+        + INDEX_OFFSET
+    )
+
+
+def _transition(
+    engine_running: bool,
+    mode: int,
+    gear: int,
+    action: int,
+    auto_shift: bool,
+    max_gear: int,
+    reverse_from: tuple = REVERSE_FROM,
+    neutral_from: tuple = NEUTRAL_FROM,
+    park_from: tuple = PARK_FROM,
+) -> tuple:
+    """
+    Resolve a single shift request
+
+    :return: (new mode, new gear, pawl, message code) as plain ints
+    """
+    unchanged = (mode, gear, PAWL_UNCHANGED, NO_MESSAGE)
+    refused = unchanged if auto_shift else (mode, gear, PAWL_UNCHANGED, REFUSED)
+
+    if not engine_running:
+        return mode, gear, PAWL_UNCHANGED, ENGINE_NOT_RUNNING
+
+    if action == Action.REVERSE.value:
+        if mode == Mode.REVERSE.value:
+            return unchanged
+        if gear not in reverse_from:
+            return refused
+        return Mode.REVERSE.value, Gear.REVERSE.value, False, NO_MESSAGE
+
+    if action == Action.NEUTRAL.value:
+        if mode != Mode.PARK.value and gear not in neutral_from:
+            return mode, gear, PAWL_UNCHANGED, NEUTRAL_REJECTED
+        return Mode.NEUTRAL.value, Gear.NEUTRAL.value, False, NO_MESSAGE
+
+    if action == Action.PARK.value:
+        if mode == Mode.PARK.value:
+            return unchanged
+        if gear not in park_from:
+            return mode, gear, PAWL_UNCHANGED, PARK_REJECTED
+        return Mode.PARK.value, Gear.NEUTRAL.value, True, NO_MESSAGE
+
+    if action == Action.DRIVE.value:
+        if mode == Mode.DRIVE.value:
+            return unchanged
+        if mode != Mode.MANUAL.value:
+            gear = Gear.ONE.value
+        return Mode.DRIVE.value, gear, False, NO_MESSAGE
+
+    if action == Action.MANUAL.value:
+        if mode == Mode.MANUAL.value:
+            return unchanged
+        if mode != Mode.DRIVE.value:
+            return mode, gear, PAWL_UNCHANGED, MANUAL_REJECTED
+        return Mode.MANUAL.value, gear, PAWL_UNCHANGED, NO_MESSAGE
+
+    if action == Action.UP.value:
+        if not auto_shift and mode != Mode.MANUAL.value:
+            return mode, gear, PAWL_UNCHANGED, NOT_IN_MANUAL
+        if gear >= max_gear:
+            return refused
+        return mode, gear + 1, PAWL_UNCHANGED, NO_MESSAGE
+
+    if action == Action.DOWN.value:
+        if not auto_shift and mode != Mode.MANUAL.value:
+            return mode, gear, PAWL_UNCHANGED, NOT_IN_MANUAL
+        # there is nothing below reverse to shift into
+        if gear == Gear.ONE.value or gear == Gear.REVERSE.value:
+            return refused
+        return mode, gear - 1, PAWL_UNCHANGED, NO_MESSAGE
+
+    return unchanged
+
+
+def compile_transitions(
+    max_gear: int,
+    reverse_from: tuple = REVERSE_FROM,
+    neutral_from: tuple = NEUTRAL_FROM,
+    park_from: tuple = PARK_FROM,
+) -> list:
+    """
+    Compile every shift request for a transmission into a flat table
+
+    :param: max_gear : value of the highest forward gear
+    :param: reverse_from : gear values Reverse may be selected from
+    :param: neutral_from : gear values Neutral may be selected from outside Park
+    :param: park_from : gear values Park may be selected from
+    :return: list of (new mode, new gear, pawl, message code) int tuples indexed by transition_index
+    """
+    table = [None] * ((max_gear - Gear.REVERSE.value + 1) * GEAR_STRIDE)
+    for gear in range(Gear.REVERSE.value, max_gear + 1):
+        for engine_running in (False, True):
+            for mode in MODE_VALUES:
+                for action in ACTION_VALUES:
+                    for auto_shift in (False, True):
+                        table[
+                            transition_index(
+                                engine_running, mode, gear, action, auto_shift
+                            )
+                        ] = _transition(
+                            engine_running,
+                            mode,
+                            gear,
+                            action,
+                            auto_shift,
+                            max_gear,
+                            reverse_from,
+                            neutral_from,
+                            park_from,
+                        )
+    return table
+
+
+def resolve_transitions(table: list) -> list:
+    """
+    Convert a compiled table to the enum view used by Gearbox.shift
+
+    :param: table : output of compile_transitions
+    :return: list of (Mode, Gear, pawl or None, message or None, interned message code
+             or None, refused) tuples, the code goes straight to the output sink
+    """
+    codes = [None if _ is None else intern_message(_) for _ in MESSAGES]
+    return [
+        (
+            Mode(mode),
+            Gear(gear),
+            None if pawl == PAWL_UNCHANGED else bool(pawl),
+            MESSAGES[message],
+            codes[message],
+            message == REFUSED,
+        )
+        for mode, gear, pawl, message in table
+    ]
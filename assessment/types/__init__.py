@@ -1,3 +1,4 @@
 from .mode import Mode
 from .gear import Gear
 from .action import Action
+from .event import Event
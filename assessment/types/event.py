@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class Event(Enum):
+    """
+    State changes listeners can subscribe to, see assessment.events.Observable
+
+    Listeners are called with the source followed by the arguments noted below
+    """
+
+    MODE_CHANGED = 0  # gearbox, previous Mode, new Mode
+    GEAR_CHANGED = 1  # gearbox, previous Gear, new Gear
+    # gearbox, requested Action, message or None when refused without one
+    SHIFT_REJECTED = 2
+    ENGINE_STARTED = 3  # engine
+    ENGINE_STOPPED = 4  # engine
@@ -11,5 +11,8 @@ class Gear(Enum):
     THREE = 3
     FOUR = 4
     FIVE = 5
-    # SIX = 6
-    # SEVEN = 7
+    SIX = 6
+    SEVEN = 7
+    EIGHT = 8
+    NINE = 9
+    TEN = 10
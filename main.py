@@ -1,5 +1,6 @@
 """
 python main.py
+python -m assessment drive
 python -m unittest discover -s assessment -t .
 coverage run -m unittest discover -s assessment -t . && coverage report
 
@@ -13,12 +14,13 @@ This should include Unit Testing for the basic scenarios.
 Assessee: Gregory Michael Genovese
 Date of Assessment: 2-19-2024
 """
-from assessment.engine import Engine
+
+from assessment.__main__ import drive
 
 
 def main():
-    Engine.run()
-        
+    drive([])
+
 
 if __name__ == "__main__":
     main()